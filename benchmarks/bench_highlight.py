@@ -0,0 +1,96 @@
+"""Сравнение посимвольной подсветки с подсветкой сериями
+
+Запуск: python benchmarks/bench_highlight.py [размер_в_символах]
+Без дисплея измеряется только поиск и расчет индексов, вызовы Tk пропускаются.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_cleaner import CATEGORIES, classify, find_runs, index_ranges
+from text_cleaner.homoglyphs import homoglyph_runs
+
+def make_corpus(size, seed=42):
+    """Детерминированный текст со строками, NBSP, невидимыми символами и сериями"""
+    rng = random.Random(seed)
+    parts = ["lorem ", "ipsum ", "текст ", "\n", " ", "​", "   ", "é"]
+    weights = [30, 30, 20, 5, 8, 3, 2, 2]
+    text = ''.join(rng.choices(parts, weights, k=size // 4))
+    return text[:size]
+
+def legacy_highlight(widget, text):
+    """Прежний highlight_all: tag_add на каждый символ с индексом от начала текста"""
+    count = 0
+    for i, char, category in classify(text):
+        line_col = f"1.0+{i}c"
+        end_pos = f"1.0+{i+1}c"
+        if widget is not None:
+            widget.tag_add(category, line_col, end_pos)
+        count += 1
+    return count
+
+def run_highlight(widget, text):
+    """Новый highlight_all: серии, индексы строка.столбец и один tag_add на тег"""
+    runs = list(find_runs(text))
+    for category, indexes in index_ranges(text, runs).items():
+        if indexes and widget is not None:
+            widget.tag_add(category, *indexes)
+    return sum(end - start for _, start, end in runs)
+
+def make_widget(text):
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None
+    root.withdraw()
+    widget = tk.Text(root)
+    widget.insert("1.0", text)
+    return widget
+
+def tag_snapshot(widget):
+    return {category: [str(index) for index in widget.tag_ranges(category)] for category in CATEGORIES}
+
+def clear(widget):
+    if widget is not None:
+        for category in CATEGORIES:
+            widget.tag_remove(category, "1.0", "end")
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    text = make_corpus(size)
+    widget = make_widget(text)
+    if widget is None:
+        print("Дисплей недоступен: вызовы Tk не измеряются")
+    
+    start = time.perf_counter()
+    legacy_count = legacy_highlight(widget, text)
+    legacy_time = time.perf_counter() - start
+    legacy_tags = tag_snapshot(widget) if widget is not None else None
+    
+    clear(widget)
+    start = time.perf_counter()
+    run_count = run_highlight(widget, text)
+    run_time = time.perf_counter() - start
+    
+    print(f"Размер текста:        {len(text):,} символов")
+    print(f"Посимвольно:          {legacy_time:.3f} с")
+    print(f"Сериями:              {run_time:.3f} с (x{legacy_time / run_time:.1f})")
+    print(f"Нестандартных:        {legacy_count} / {run_count}")
+    
+    start = time.perf_counter()
+    homoglyphs = sum(end - begin for _, begin, end in homoglyph_runs(text))
+    print(f"Омоглифы в словах:    {time.perf_counter() - start:.3f} с ({homoglyphs})")
+    
+    same = legacy_count == run_count
+    if widget is not None:
+        same = same and legacy_tags == tag_snapshot(widget)
+        print(f"Теги совпадают:       {same}")
+    if not same:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
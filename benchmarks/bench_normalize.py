@@ -0,0 +1,57 @@
+"""Нормализация Unicode: только серии нестандартных символов против unicodedata.normalize всего текста
+
+Запуск: python benchmarks/bench_normalize.py [размер_в_МБ]
+Сравниваются отдельная стадия (normalize_runs и normalize всего текста) и вся очистка
+профилем с полем normalize против нормализации всего текста перед очисткой без него.
+"""
+import os
+import random
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import DENSITIES, WORDS
+from text_cleaner.core import clean, normalize_runs
+
+# Что исправляет нормализация: разложенные буквы, полноширинные формы, лигатуры, цифры в кружках
+SPECIALS = ["é", "й", "ё", "ｆｕｌｌ", "ﬁle", "①", "ｶﾞ"]
+
+TABLES = ["similar", "spaces", "invisible", "other"]
+
+def make_corpus(size, density, seed=42):
+    """Слова корпуса suite, доля density из них заменена вставками SPECIALS"""
+    rng = random.Random(f"{seed}:{density}")
+    parts = []
+    length = 0
+    while length < size:
+        word = rng.choice(SPECIALS) if rng.random() < DENSITIES[density] else rng.choice(WORDS)
+        parts.append(word + ("\n" if rng.random() < 0.08 else " "))
+        length += len(parts[-1])
+    return ''.join(parts)
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'форма':<5} {'плотность':<9} {'весь текст, с':>14} {'серии, с':>9} {'очистка: весь, с':>17} "
+          f"{'серии, с':>9}  совпадает")
+    for form in ("NFC", "NFKC"):
+        for density in DENSITIES:
+            text = make_corpus(int(size_mb * 1024 * 1024), density)
+            whole, whole_time = timed(unicodedata.normalize, form, text)
+            (fused, _), fused_time = timed(normalize_runs, text, form)
+            (clean_whole, _), clean_whole_time = timed(
+                lambda: clean(unicodedata.normalize(form, text), {"tables": TABLES}))
+            (clean_fused, _), clean_fused_time = timed(clean, text, {"tables": TABLES, "normalize": form})
+            # NFKC всего текста меняет и стандартные символы (№ → No), стадия по сериям их не трогает
+            same = "да" if whole == fused and clean_whole == clean_fused else "нет"
+            print(f"{form:<5} {density:<9} {whole_time:>14.3f} {fused_time:>9.3f} {clean_whole_time:>17.3f} "
+                  f"{clean_fused_time:>9.3f}  {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Сравнение однопроходного движка замен с прежними цепочками str.replace
+
+Запуск: python benchmarks/bench_replace.py [размер_в_МБ]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_cleaner import ReplacementEngine, get_profile
+from text_cleaner.tables import SIMILAR_REPLACEMENTS, SPACE_CHARS, INVISIBLE_CHARS, OTHER_PROBLEMATIC
+
+# Прежний код заменял кириллические омоглифы везде, а не только в словах латиницей
+SUSPICIOUS_ENGINE = get_profile({
+    "tables": ["similar", "spaces", "invisible", "other"], "context_homoglyphs": False,
+})["engine"]
+
+def legacy_replace(text):
+    """Прежний алгоритм replace_all_suspicious: по одному str.replace на ключ"""
+    replacements_count = 0
+    
+    for suspicious, normal in SIMILAR_REPLACEMENTS.items():
+        if suspicious in text:
+            count = text.count(suspicious)
+            text = text.replace(suspicious, normal)
+            replacements_count += count
+    
+    for space_char in SPACE_CHARS:
+        if space_char in text:
+            count = text.count(space_char)
+            text = text.replace(space_char, ' ')
+            replacements_count += count
+    
+    for invisible_char in INVISIBLE_CHARS:
+        if invisible_char in text:
+            count = text.count(invisible_char)
+            text = text.replace(invisible_char, '')
+            replacements_count += count
+    
+    for problematic, replacement in OTHER_PROBLEMATIC.items():
+        if problematic in text:
+            count = text.count(problematic)
+            text = text.replace(problematic, replacement)
+            replacements_count += count
+    
+    return text, replacements_count
+
+def make_corpus(size, seed=42):
+    """Детерминированный текст: ASCII вперемешку со всеми ключами таблиц"""
+    rng = random.Random(seed)
+    keys = (list(SIMILAR_REPLACEMENTS) + SPACE_CHARS + INVISIBLE_CHARS
+            + list(OTHER_PROBLEMATIC) + ['\n', '\t', 'ё', 'ж', '  '])
+    words = ["lorem", "ipsum", "dolor", "текст", "пример", "value", 'key: "x"']
+    parts = []
+    length = 0
+    while length < size:
+        if rng.random() < 0.3:
+            part = rng.choice(keys)
+        else:
+            part = rng.choice(words) + ' '
+        parts.append(part)
+        length += len(part)
+    return ''.join(parts)
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    text = make_corpus(int(size_mb * 1024 * 1024))
+    
+    # Ключи-тождества (символ заменяется сам на себя) прежний код тоже считал заменами
+    identity = sum(text.count(k) for k, v in SIMILAR_REPLACEMENTS.items() if k == v)
+    
+    (legacy_text, legacy_count), legacy_time = timed(legacy_replace, text)
+    _, build_time = timed(ReplacementEngine, [SIMILAR_REPLACEMENTS])
+    (engine_text, counts), engine_time = timed(SUSPICIOUS_ENGINE.apply, text)
+    
+    identical = legacy_text.encode('utf-8') == engine_text.encode('utf-8')
+    print(f"Размер текста:      {len(text):,} символов")
+    print(f"Цепочка replace:    {legacy_time:.3f} с")
+    print(f"Движок замен:       {engine_time:.3f} с (x{legacy_time / engine_time:.1f})")
+    print(f"Сборка движка:      {build_time * 1000:.2f} мс")
+    print(f"Побайтово совпадает: {identical}")
+    print(f"Замен: цепочка {legacy_count}, движок {sum(counts.values())} (+{identity} тождественных)")
+    
+    if not identical or legacy_count != sum(counts.values()) + identity:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Пропускная способность анализа: декодирование всего текста и быстрый путь по байтам UTF-8
+
+Запуск: python benchmarks/bench_scan.py [размер_в_МБ]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_cleaner.core import analyze, analyze_bytes, count_nonstandard, count_nonstandard_bytes
+
+def make_corpus(size, density, seed=42):
+    """Детерминированный ASCII-текст, в котором доля density строк содержит нестандартный символ"""
+    rng = random.Random(seed)
+    lines = []
+    total = 0
+    while total < size:
+        line = ' '.join(rng.choice(["lorem", "ipsum", "dolor", "sit", "amet"]) for _ in range(12))
+        if rng.random() < density:
+            pos = rng.randrange(len(line))
+            line = line[:pos] + rng.choice([" ", "​", "é", "—"]) + line[pos:]
+        lines.append(line)
+        total += len(line) + 1
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+def measure(func, data):
+    start = time.perf_counter()
+    result = func(data)
+    return result, time.perf_counter() - start
+
+def gbps(size, seconds):
+    return size / seconds / 1e9
+
+def main():
+    size = int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 64 * 1024 * 1024
+    print(f"{'плотность':>10} {'analyze':>10} {'по байтам':>10} {'count':>10} {'по байтам':>10}  ГБ/с")
+    same = True
+    for density in (0.0, 0.0001, 0.01, 1.0):
+        data = make_corpus(size, density)
+        report, text_time = measure(lambda d: analyze(d.decode('utf-8')), data)
+        byte_report, byte_time = measure(analyze_bytes, data)
+        count, count_time = measure(lambda d: count_nonstandard(d.decode('utf-8')), data)
+        byte_count, byte_count_time = measure(count_nonstandard_bytes, data)
+        same = same and report == byte_report and count == byte_count
+        print(f"{density:>10} {gbps(len(data), text_time):>10.2f} {gbps(len(data), byte_time):>10.2f} "
+              f"{gbps(len(data), count_time):>10.2f} {gbps(len(data), byte_count_time):>10.2f}")
+    print(f"Результаты совпадают: {same}")
+    if not same:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Нагрузка на локальный сервис очистки: небольшие запросы с пакетами и без
+
+Запуск: python benchmarks/bench_server.py [число_запросов] [одновременных_клиентов]
+Сервис запускается в отдельном процессе на свободном порту и останавливается после замера.
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_cleaner.server import percentile
+
+BODY = "Съешь же ещё этих мягких французских булок, да выпей чаю. hеllo wоrld​\n".encode('utf-8')
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def client(port, count, latencies):
+    """Клиент с постоянным соединением: count запросов подряд"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = (f"POST /clean HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(BODY)}\r\n\r\n").encode() + BODY
+    for _ in range(count):
+        start = time.perf_counter()
+        writer.write(request)
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+async def load(port, requests, clients):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, requests // clients, latencies) for _ in range(clients)))
+    return time.perf_counter() - start, latencies
+
+def run(batch_size, requests, clients):
+    port = free_port()
+    server = subprocess.Popen([sys.executable, "-m", "text_cleaner", "serve", "--port", str(port),
+                               "--batch-size", str(batch_size)],
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        elapsed, latencies = asyncio.run(load(port, requests, clients))
+    finally:
+        server.terminate()
+        server.wait()
+    return elapsed, latencies
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    print(f"Запросов: {requests}, клиентов: {clients}, тело: {len(BODY)} байт")
+    for title, batch_size in (("Без пакетов", 1), ("Пакеты до 64", 64)):
+        elapsed, latencies = run(batch_size, requests, clients)
+        print(f"{title:<14} {len(latencies) / elapsed:>8.0f} запр./с  "
+              f"p50 {percentile(latencies, 0.5) * 1000:.2f} мс  p99 {percentile(latencies, 0.99) * 1000:.2f} мс")
+
+if __name__ == "__main__":
+    main()
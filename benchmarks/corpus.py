@@ -0,0 +1,87 @@
+"""Детерминированные синтетические корпуса для бенчмарков
+
+Корпус собирается из заранее сгенерированных блоков, порядок которых задает seed:
+так даже корпус в 1 ГБ создается за секунды, а доля "плохих" символов выдерживается.
+"""
+import os
+import random
+import tempfile
+
+# Обычные слова: латиница, кириллица и знаки препинания
+WORDS = [
+    "lorem", "ipsum", "dolor", "sit", "amet", "the", "quick", "brown", "fox",
+    "текст", "привет", "мир", "строка", "данные", "проверка", ",", ".", "-",
+]
+
+# Виды нестандартных вставок: NBSP, невидимые, омоглифы в словах, многосимвольные замены
+SPECIALS = {
+    "nbsp": ["\u00a0", "\u202f", "\u2009"],
+    "zero_width": ["\u200b", "\u200c", "\u200d", "\ufeff"],
+    "homoglyph": ["h\u0435llo", "w\u043erld", "\u041fp\u0438\u0432e\u0442", "c\u0430t"],
+    "multi_char": ["\u2026", "\u00bd", "\u2192", "\u2122", "\u2264"],
+}
+
+# Доля слов, замененных нестандартной вставкой
+DENSITIES = {"clean": 0.0, "low": 0.001, "medium": 0.01, "high": 0.1}
+
+BLOCK_SIZE = 64 * 1024
+POOL_SIZE = 64
+
+def make_block(rng, density):
+    """Блок текста около BLOCK_SIZE символов"""
+    kinds = list(SPECIALS)
+    parts = []
+    length = 0
+    while length < BLOCK_SIZE:
+        if rng.random() < density:
+            word = rng.choice(SPECIALS[rng.choice(kinds)])
+        else:
+            word = rng.choice(WORDS)
+        separator = "\n" if rng.random() < 0.08 else " "
+        parts.append(word + separator)
+        length += len(word) + 1
+    return ''.join(parts)
+
+def iter_corpus(size, density="medium", seed=42):
+    """Перебираем части корпуса, в сумме не меньше size байт UTF-8"""
+    rng = random.Random(f"{seed}:{density}")
+    pool = [make_block(rng, DENSITIES[density]) for _ in range(POOL_SIZE)]
+    pool_bytes = [len(block.encode('utf-8')) for block in pool]
+    total = 0
+    while total < size:
+        index = rng.randrange(POOL_SIZE)
+        total += pool_bytes[index]
+        yield pool[index]
+
+def make_corpus(size, density="medium", seed=42):
+    """Корпус размером около size байт UTF-8 в памяти"""
+    text = ''.join(iter_corpus(size, density, seed))
+    # Обрезаем по символам: для смеси ASCII и кириллицы это близко к size байт
+    return text[:size]
+
+def corpus_file(size, density="medium", seed=42):
+    """Путь к файлу корпуса; файл создается один раз и переиспользуется"""
+    directory = os.path.join(tempfile.gettempdir(), "text_cleaner-corpora")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"corpus-{size}-{density}-{seed}.txt")
+    if not os.path.exists(path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as file:
+            for block in iter_corpus(size, density, seed):
+                file.write(block)
+        os.replace(tmp_path, path)
+    return path
+
+def parse_size(value):
+    """Размер вида 1K, 10M, 1G (в байтах)"""
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    value = value.strip().upper().rstrip("B")
+    if value[-1:] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+def format_size(size):
+    for unit, factor in (("G", 1024 ** 3), ("M", 1024 ** 2), ("K", 1024)):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return str(size)
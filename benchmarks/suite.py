@@ -0,0 +1,284 @@
+"""Набор бенчмарков горячих путей на синтетических корпусах
+
+Запуск:
+    python benchmarks/suite.py                                 # 1K, 1M и 16M, плотность medium
+    python benchmarks/suite.py --sizes 1M,1G --densities low,high
+    python benchmarks/suite.py --save baseline.json            # сохранить результаты как базовые
+    python benchmarks/suite.py --compare baseline.json         # отчет о регрессиях относительно базовых
+
+Каждый замер выполняется в отдельном процессе, чтобы пиковая память (RSS) относилась к одному случаю.
+Модули импортируются, а корпус строится до замеров; время - лучшее и медиана не меньше чем
+MIN_REPEAT запусков, память - прирост пика RSS над памятью процесса с готовым корпусом.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+
+from corpus import DENSITIES, corpus_file, format_size, make_corpus, parse_size
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Наименьшее число запусков одного случая: один запуск большого корпуса - случайный холодный замер
+MIN_REPEAT = 3
+
+# Модули, которые случаи импортируют внутри функций: первый импорт не должен попадать в замер
+CASE_MODULES = (
+    "text_cleaner", "text_cleaner.core", "text_cleaner.charclass", "text_cleaner.profiles",
+    "text_cleaner.stream", "text_cleaner.vectorized",
+)
+
+def case_classify(text):
+    from text_cleaner import find_runs
+    return sum(1 for _ in find_runs(text))
+
+def case_highlight(text):
+    from text_cleaner.core import highlight_runs, index_ranges
+    return index_ranges(text, highlight_runs(text))
+
+def case_count(text):
+    from text_cleaner.core import count_nonstandard
+    return count_nonstandard(text)
+
+def case_analyze(text):
+    from text_cleaner import analyze
+    return analyze(text)
+
+def case_vector_classify(text):
+    from text_cleaner.vectorized import find_runs
+    return len(find_runs(text))
+
+def case_vector_analyze(text):
+    from text_cleaner.vectorized import analyze
+    return analyze(text)
+
+def case_analyze_bytes(data):
+    from text_cleaner.core import analyze_bytes
+    return analyze_bytes(data)
+
+def case_clean(text):
+    from text_cleaner import clean
+    return clean(text, "all")
+
+def case_fix_text(text):
+    from text_cleaner import clean
+    return clean(text, "basic")
+
+def case_clean_file(path):
+    from text_cleaner.stream import clean_file
+    fd, output = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        return clean_file(path, output)
+    finally:
+        os.unlink(output)
+
+def case_scan_file(path):
+    from text_cleaner.stream import analyze_byte_stream, iter_byte_chunks
+    with open(path, 'rb') as file:
+        return analyze_byte_stream(iter_byte_chunks(file))
+
+def case_import(_):
+    subprocess.run([sys.executable, "-c", "import text_cleaner"], check=True, cwd=os.path.dirname(BENCHMARKS_DIR))
+
+def case_build_table(_):
+    from text_cleaner.charclass import build_table
+    return build_table()
+
+def case_compile_profiles(_):
+    from text_cleaner.profiles import COMPILED, PROFILES, get_profile
+    COMPILED.clear()
+    for name in PROFILES:
+        get_profile(name)
+
+# Случаи: вид входа ("text", "bytes" - корпус в памяти, "file" - файл корпуса, "startup" - без корпуса) и функция
+CASES = {
+    "classify": ("text", case_classify),
+    "highlight": ("text", case_highlight),
+    "count": ("text", case_count),
+    "analyze": ("text", case_analyze),
+    # С NumPy - векторная классификация, без него совпадают с classify и analyze
+    "vector_classify": ("text", case_vector_classify),
+    "vector_analyze": ("text", case_vector_analyze),
+    "analyze_bytes": ("bytes", case_analyze_bytes),
+    "clean": ("text", case_clean),
+    "fix_text": ("text", case_fix_text),
+    "clean_file": ("file", case_clean_file),
+    "scan_file": ("file", case_scan_file),
+    "import": ("startup", case_import),
+    "build_table": ("startup", case_build_table),
+    "compile_profiles": ("startup", case_compile_profiles),
+}
+
+def reset_peak_rss():
+    """Сбрасываем пик RSS процесса до текущей памяти (только Linux); False, если сбросить нельзя"""
+    try:
+        with open("/proc/self/clear_refs", 'w') as file:
+            file.write("5")
+    except OSError:
+        return False
+    return True
+
+def peak_rss_mb():
+    """Пиковая память процесса в МБ (None, если узнать ее нельзя)"""
+    try:
+        with open("/proc/self/status", 'r') as file:
+            for line in file:
+                # Пик, который сбрасывает reset_peak_rss
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux сообщает килобайты, macOS - байты
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+def run_worker(case, size, density, repeat):
+    """Замер одного случая в текущем процессе: лучшее и медианное время из repeat запусков"""
+    kind, func = CASES[case]
+    for name in CASE_MODULES:
+        importlib.import_module(name)
+    if kind == "text":
+        data = make_corpus(size, density)
+        length = len(data.encode('utf-8'))
+    elif kind == "bytes":
+        data = make_corpus(size, density).encode('utf-8')
+        length = len(data)
+    elif kind == "file":
+        data = corpus_file(size, density)
+        length = os.path.getsize(data)
+    else:
+        data, length = None, 0
+    
+    # Память считается от процесса с импортированными модулями и готовым корпусом; без сброса
+    # пика (не Linux) прирост считается от пика построения корпуса и может быть занижен
+    reset_peak_rss()
+    base_rss = peak_rss_mb()
+    times = []
+    for _ in range(max(repeat, MIN_REPEAT)):
+        start = time.perf_counter()
+        func(data)
+        times.append(time.perf_counter() - start)
+    peak_rss = peak_rss_mb()
+    seconds = min(times)
+    return {
+        "case": case, "size": size, "density": density, "bytes": length,
+        "seconds": seconds,
+        "median_seconds": statistics.median(times),
+        "repeat": len(times),
+        "mb_per_s": length / seconds / 1e6 if length and seconds else None,
+        "base_rss_mb": base_rss,
+        "peak_rss_mb": peak_rss - base_rss if peak_rss is not None else None,
+    }
+
+def run_case(case, size, density, repeat):
+    """Запускаем замер в отдельном процессе"""
+    command = [sys.executable, os.path.abspath(__file__), "--worker", case, str(size), density, str(repeat)]
+    output = subprocess.run(command, check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return json.loads(output)
+
+def result_key(result):
+    return result["case"], result["size"], result["density"]
+
+def print_results(results):
+    print(f"{'случай':<18} {'размер':>7} {'плотность':>9} {'время, с':>10} {'медиана, с':>11} {'МБ/с':>9} "
+          f"{'+RSS, МБ':>8}")
+    for result in results:
+        size = format_size(result["size"]) if result["bytes"] else "-"
+        density = result["density"] if result["bytes"] else "-"
+        speed = f"{result['mb_per_s']:.1f}" if result["mb_per_s"] else "-"
+        rss = f"{result['peak_rss_mb']:.0f}" if result["peak_rss_mb"] is not None else "-"
+        print(f"{result['case']:<18} {size:>7} {density:>9} {result['seconds']:>10.4f} "
+              f"{result['median_seconds']:>11.4f} {speed:>9} {rss:>8}")
+
+def compare(results, baseline, threshold):
+    """Отчет о сравнении с базовыми результатами; возвращаем число регрессий"""
+    old_results = {result_key(result): result for result in baseline["results"]}
+    regressions = 0
+    print(f"\nСравнение с базовыми результатами (порог {threshold:.0%}):")
+    print(f"{'случай':<18} {'размер':>7} {'плотность':>9} {'было, с':>10} {'стало, с':>10} {'изменение':>10}")
+    for result in results:
+        old = old_results.get(result_key(result))
+        if old is None:
+            continue
+        change = result["seconds"] / old["seconds"] - 1 if old["seconds"] else 0.0
+        mark = ""
+        if change > threshold:
+            mark = "  РЕГРЕССИЯ"
+            regressions += 1
+        elif change < -threshold:
+            mark = "  ускорение"
+        size = format_size(result["size"]) if result["bytes"] else "-"
+        density = result["density"] if result["bytes"] else "-"
+        print(f"{result['case']:<18} {size:>7} {density:>9} {old['seconds']:>10.4f} "
+              f"{result['seconds']:>10.4f} {change:>+10.1%}{mark}")
+    return regressions
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Бенчмарки горячих путей text_cleaner")
+    parser.add_argument("--cases", default=",".join(CASES), help="случаи через запятую")
+    parser.add_argument("--sizes", default="1K,1M,16M", help="размеры корпусов через запятую (1K ... 1G)")
+    parser.add_argument("--densities", default="medium", help=f"плотности через запятую: {', '.join(DENSITIES)}")
+    parser.add_argument("--repeat", type=int, default=MIN_REPEAT,
+                        help=f"число повторов (не меньше {MIN_REPEAT}), сообщаются лучшее и медианное время")
+    parser.add_argument("--max-memory-size", default="256M",
+                        help="больший корпус замеряется только потоковыми случаями (файл), без загрузки в память")
+    parser.add_argument("--save", metavar="FILE", help="сохранить результаты в JSON")
+    parser.add_argument("--compare", metavar="FILE", help="сравнить с базовыми результатами из JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="порог регрессии (доля, по умолчанию 0.10)")
+    parser.add_argument("--worker", nargs=4, metavar=("CASE", "SIZE", "DENSITY", "REPEAT"), help=argparse.SUPPRESS)
+    return parser
+
+def main():
+    args = build_parser().parse_args()
+    if args.worker:
+        case, size, density, repeat = args.worker
+        print(json.dumps(run_worker(case, int(size), density, int(repeat))))
+        return 0
+    
+    cases = [case.strip() for case in args.cases.split(",")]
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    densities = [density.strip() for density in args.densities.split(",")]
+    max_memory_size = parse_size(args.max_memory_size)
+    
+    results = []
+    for case in cases:
+        kind, _ = CASES[case]
+        if kind == "startup":
+            results.append(run_case(case, 0, densities[0], args.repeat))
+            continue
+        for size in sizes:
+            if kind != "file" and size > max_memory_size:
+                continue
+            for density in densities:
+                results.append(run_case(case, size, density, args.repeat))
+    print_results(results)
+    
+    if args.save:
+        baseline = {"python": platform.python_version(), "platform": platform.platform(), "results": results}
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump(baseline, file, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        if regressions:
+            print(f"\nРегрессий: {regressions}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
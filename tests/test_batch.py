@@ -0,0 +1,32 @@
+"""Пакетная очистка дерева каталогов"""
+
+import os
+import stat
+
+from text_cleaner.batch import clean_tree
+from text_cleaner.core import clean
+
+def test_clean_tree_in_place(tmp_path):
+    texts = {"a.txt": "один  два​\n", os.path.join("sub", "b.txt"): "Сlean text\n", "skip.md": "x  y"}
+    for name, text in texts.items():
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+        os.chmod(path, 0o644)
+    
+    results = sorted(clean_tree(str(tmp_path), workers=1), key=lambda result: result["file"])
+    assert [result["file"] for result in results] == ["a.txt", os.path.join("sub", "b.txt")]
+    for name, text in texts.items():
+        path = tmp_path / name
+        expected = text if name.endswith(".md") else clean(text)[0]
+        assert path.read_text(encoding='utf-8') == expected
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    # Временные файлы не остаются
+    assert sorted(os.listdir(tmp_path)) == ["a.txt", "skip.md", "sub"]
+
+def test_clean_tree_reports_decode_errors(tmp_path):
+    (tmp_path / "bad.txt").write_bytes(b"\xff\xfe")
+    results = list(clean_tree(str(tmp_path), str(tmp_path / "out"), workers=1))
+    assert results[0]["file"] == "bad.txt" and "error" in results[0]
+    assert not os.path.exists(tmp_path / "out" / "bad.txt")
+    assert os.listdir(tmp_path / "out") == []
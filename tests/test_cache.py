@@ -0,0 +1,66 @@
+"""Кэш результатов: попадания, вытеснение и ошибки базы"""
+
+import sqlite3
+
+from text_cleaner import cache as cache_module
+from text_cleaner.batch import clean_task
+from text_cleaner.cache import MAX_ENTRY_SHARE, ResultCache
+
+def test_hits_and_misses(tmp_path):
+    with ResultCache(str(tmp_path / "cache.sqlite")) as cache:
+        key = cache.key("digest", "rules")
+        assert cache.get(key) is None
+        assert cache.put(key, b"output", False, {"chars": 6})
+        assert cache.get(key) == (b"output", False, {"chars": 6})
+        assert (cache.hits, cache.misses) == (1, 1)
+        stats = cache.stats()
+        assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+    # Общие счетчики хранятся в базе и видны другому экземпляру
+    with ResultCache(str(tmp_path / "cache.sqlite")) as cache:
+        assert cache.stats()["hits"] == 1
+
+def test_key_depends_on_rules():
+    assert ResultCache.key("digest", "a") != ResultCache.key("digest", "b")
+
+def test_lru_eviction(tmp_path, monkeypatch):
+    clock = iter(range(1000))
+    monkeypatch.setattr(cache_module.time, "time", lambda: next(clock))
+    # В кэш помещается ровно MAX_ENTRY_SHARE записей по 10 байт
+    keys = [str(i) for i in range(MAX_ENTRY_SHARE)]
+    with ResultCache(str(tmp_path / "cache.sqlite"), max_size=10 * MAX_ENTRY_SHARE) as cache:
+        for key in keys:
+            assert cache.put(key, b"x" * 10, False, {})
+        # Первая запись использована позже второй: вытесняется вторая
+        assert cache.get(keys[0]) is not None
+        assert cache.put("new", b"x" * 10, False, {})
+        assert cache.get(keys[1]) is None
+        assert all(cache.get(key) is not None for key in keys[:1] + keys[2:] + ["new"])
+        assert cache.stats()["evictions"] == 1
+        # Результат больше 1/MAX_ENTRY_SHARE кэша не сохраняется
+        assert not cache.put("big", b"x" * 11, False, {})
+
+def test_clear(tmp_path):
+    with ResultCache(str(tmp_path / "cache.sqlite")) as cache:
+        cache.put("a", b"x", True, {})
+        cache.clear()
+        assert cache.stats()["entries"] == 0
+
+def test_locked_database_is_a_miss(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, "LOCK_TIMEOUT", 0.05)
+    path = str(tmp_path / "cache.sqlite")
+    source = tmp_path / "a.txt"
+    source.write_text("один  два\n", encoding='utf-8')
+    with ResultCache(path) as cache:
+        cache.put("a", b"x", True, {})
+        # Другой процесс держит блокировку записи
+        other = sqlite3.connect(path)
+        other.execute("BEGIN EXCLUSIVE")
+        try:
+            assert cache.get("a") is None
+            assert not cache.put("b", b"y", True, {})
+            results = clean_task([(str(source), str(tmp_path / "out.txt"), "a.txt")], "all", 1024, path)
+        finally:
+            other.rollback()
+            other.close()
+    assert "error" not in results[0]
+    assert (tmp_path / "out.txt").read_text(encoding='utf-8') == "один два\n"
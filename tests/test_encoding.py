@@ -0,0 +1,77 @@
+"""Определение кодировки и позиции ошибочных байтов при декодировании"""
+
+import codecs
+
+import pytest
+
+from text_cleaner.background import read_job
+from text_cleaner.core import analyze_bytes, count_nonstandard_bytes
+from text_cleaner.encoding import Decoder, decode_text, detect_encoding, universal_newlines
+from text_cleaner.paged import PagedFile
+
+RUSSIAN = "Съешь же ещё этих мягких французских булок, да выпей чаю. " * 20
+
+@pytest.mark.parametrize("encoding", ["utf-8", "cp1251", "koi8-r", "utf-16-le", "utf-16-be"])
+def test_detect_without_bom(encoding):
+    assert detect_encoding(RUSSIAN.encode(encoding)) == (encoding, 0)
+
+@pytest.mark.parametrize("bom, encoding", [
+    (codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF16_LE, "utf-16-le"), (codecs.BOM_UTF16_BE, "utf-16-be"),
+    (codecs.BOM_UTF32_LE, "utf-32-le"), (codecs.BOM_UTF32_BE, "utf-32-be"),
+])
+def test_detect_bom(bom, encoding):
+    assert detect_encoding(bom + "abc".encode(encoding)) == (encoding, len(bom))
+
+def test_detect_ascii_and_mixed_utf8():
+    assert detect_encoding(b"plain text") == ("utf-8", 0)
+    # Выгрузка UTF-8 с отдельными ошибочными байтами остается UTF-8
+    assert detect_encoding(RUSSIAN.encode('utf-8') + b"\xff") == ("utf-8", 0)
+
+# U+FFFD, записанный в файле, - символ текста, а не ошибка декодирования
+DATA = "ok � here\r\n".encode('utf-8') + b"\xff\xfe" + "ё\r\nx".encode('utf-8') + b"\xc3"
+
+def test_decode_text_ignores_existing_replacement_chars():
+    text, runs = decode_text(DATA, 'utf-8')
+    assert text == "ok � here\n��ё\nx�"
+    assert runs == [(10, 12), (15, 16)]
+
+def test_decoder_by_bytes_matches_whole():
+    decoder = Decoder('utf-8')
+    text = ''.join(decoder.decode(DATA[i:i + 1]) for i in range(len(DATA))) + decoder.decode(b'', final=True)
+    assert universal_newlines(text, decoder.runs) == decode_text(DATA, 'utf-8')
+
+@pytest.mark.parametrize("data, encoding, runs", [
+    (b"ab\x98cd\x98\x98", "cp1251", [(2, 3), (5, 7)]),
+    ("a\ud800b".encode('utf-16-le', 'surrogatepass'), "utf-16-le", [(1, 2)]),
+])
+def test_decode_other_encodings(data, encoding, runs):
+    text, found = decode_text(data, encoding)
+    assert found == runs
+    assert all(set(text[start:end]) == {"�"} for start, end in found)
+
+def test_read_job_reports_invalid_bytes(tmp_path):
+    path = tmp_path / "mixed.txt"
+    path.write_bytes(RUSSIAN.encode('utf-8') * 100 + DATA)
+    text, text_format, runs = read_job(str(path), lambda fraction: None, lambda: False)
+    assert text_format[:2] == ('utf-8', b'')
+    offset = len(RUSSIAN) * 100
+    assert runs == [(offset + 10, offset + 12), (offset + 15, offset + 16)]
+
+def test_paged_decode_page(tmp_path):
+    path = tmp_path / "page.txt"
+    path.write_bytes(DATA)
+    paged = PagedFile(str(path))
+    try:
+        paged.indexed.wait()
+        assert paged.decode_page(0) == decode_text(DATA, 'utf-8')
+        paged.store_page(0, "edited �", 1)
+        assert paged.decode_page(0) == ("edited �", [])
+    finally:
+        paged.close()
+
+def test_byte_scanners_share_error_policy():
+    data = "ё ".encode('utf-8') + b"\xff"
+    for scan in (analyze_bytes, count_nonstandard_bytes):
+        with pytest.raises(UnicodeDecodeError):
+            scan(data)
+    assert analyze_bytes(data, errors='replace')["nonstandard"] == count_nonstandard_bytes(data, errors='replace') == 2
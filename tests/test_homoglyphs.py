@@ -0,0 +1,50 @@
+"""Омоглифы: замены только в словах, где смешаны латиница и кириллица"""
+
+import time
+
+from text_cleaner.homoglyphs import WORD_SPLIT_LIMIT, find_homoglyphs, fix_homoglyphs, word_split
+
+def test_cyrillic_in_latin_word():
+    # "Нello": кириллическая Н в латинском слове
+    assert fix_homoglyphs("Нello world") == ("Hello world", {"Н": 1})
+
+def test_latin_in_cyrillic_word():
+    # "пpивет": латинская p в кириллическом слове
+    text, counts = fix_homoglyphs("пpивет")
+    assert text == "привет" and counts == {"p": 1}
+
+def test_single_script_words_untouched():
+    for text in ("Сок и кофе", "Coffee and tea", "A и B", "ОК OK"):
+        assert list(find_homoglyphs(text)) == []
+        assert fix_homoglyphs(text)[0] == text
+
+def test_ambiguous_word_untouched():
+    # "Аcо": кириллические А и о, латинская c - слово только из омоглифов, письменность неясна
+    assert list(find_homoglyphs("Аcо")) == []
+
+def test_word_split_moves_to_word_start():
+    text = "one two three"
+    assert word_split(text, 10) == 8
+    assert word_split(text, 8) == 8
+    assert word_split(text, len(text)) == 8
+
+def test_word_split_keeps_combining_marks():
+    text = "café"
+    assert word_split(text, len(text)) == 0
+
+def test_word_split_limit():
+    text = "x" * (WORD_SPLIT_LIMIT * 4)
+    assert word_split(text, len(text)) == len(text)
+    assert word_split(text, 100) == 0
+    assert word_split(text, WORD_SPLIT_LIMIT) == 0
+    # Слово ровно на пределе удерживается целиком
+    text = " " + "x" * WORD_SPLIT_LIMIT
+    assert word_split(text, len(text)) == 1
+
+def test_word_split_checks_one_char_per_step():
+    # Длинное слово после разреза не просматривается на каждом шаге назад
+    text = "я" * 1000000
+    start = time.perf_counter()
+    for _ in range(10):
+        assert word_split(text, 1000) == 1000
+    assert time.perf_counter() - start < 1
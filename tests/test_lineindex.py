@@ -0,0 +1,65 @@
+"""Индекс нестандартных символов по строкам и деревья Фенвика"""
+
+import random
+
+from text_cleaner import lineindex
+from text_cleaner.charclass import CATEGORIES
+from text_cleaner.core import analyze
+from text_cleaner.lineindex import FenwickTree, LineIndex
+from text_cleaner.vectorized import line_counts
+
+CHARS = ["a", "б", " ", " ", "​", "—", "\x01", "Ａ"]
+
+def random_lines(rng, count):
+    return [''.join(rng.choice(CHARS) for _ in range(rng.randint(0, 5))) for _ in range(count)]
+
+def expected_counts(lines, first, last):
+    report = analyze('\n'.join(lines[first:last]))
+    return {category: sum(report[category].values()) for category in CATEGORIES}
+
+def test_fenwick_tree():
+    rng = random.Random(1)
+    values = [rng.randint(0, 5) for _ in range(50)]
+    tree = FenwickTree(values)
+    for _ in range(200):
+        i = rng.randrange(len(values))
+        delta = rng.randint(-values[i], 5)
+        values[i] += delta
+        tree.add(i, delta)
+        i = rng.randint(0, len(values))
+        assert tree.prefix(i) == sum(values[:i])
+        target = rng.randint(0, sum(values))
+        found = tree.find(target)
+        assert sum(values[:found]) <= target
+        assert found == len(values) or sum(values[:found + 1]) > target
+
+def test_random_edits_match_rescan(monkeypatch):
+    monkeypatch.setattr(lineindex, "BLOCK_LINES", 4)
+    rng = random.Random(2)
+    lines = random_lines(rng, 40)
+    index = LineIndex('\n'.join(lines))
+    for _ in range(300):
+        first = rng.randint(0, len(lines) - 1)
+        last = rng.randint(first, min(len(lines), first + rng.choice([1, 3, 12])))
+        # Как в редакторе: строки first..last-1 заменяются хотя бы одной строкой
+        new = random_lines(rng, rng.choice([1, 2, 5, 20]))
+        index.replace(first, last, line_counts('\n'.join(new)))
+        lines[first:last] = new
+        assert index.lines == len(lines)
+        a, b = sorted(rng.randint(0, len(lines)) for _ in range(2))
+        assert index.counts(a, b) == expected_counts(lines, a, b)
+        assert index.counts() == expected_counts(lines, 0, len(lines))
+        assert list(index.nonzero_lines(a, b)) == [i for i in range(a, b) if analyze(lines[i])["nonstandard"]]
+
+def test_multi_block_edit_keeps_trees(monkeypatch):
+    monkeypatch.setattr(lineindex, "BLOCK_LINES", 4)
+    lines = ["a "] * 40
+    index = LineIndex('\n'.join(lines))
+    rebuilt = []
+    monkeypatch.setattr(index, "rebuild_trees", lambda: rebuilt.append(True))
+    # Правка через границы блоков без изменения числа блоков не перестраивает деревья
+    index.replace(2, 11, line_counts("x\ny​\nz"))
+    lines[2:11] = ["x", "y​", "z"]
+    assert rebuilt == []
+    assert index.counts() == expected_counts(lines, 0, len(lines))
+    assert index.counts(3, 20) == expected_counts(lines, 3, 20)
@@ -0,0 +1,58 @@
+"""Поиск последовательностей по префиксному дереву и однопроходная замена"""
+
+import random
+from collections import Counter
+
+from text_cleaner.engine import ReplacementEngine
+from text_cleaner.matcher import TrieMatcher
+
+REPLACEMENTS = {"ab": "1", "abc": "2", "b": "3", "bcd": "4", "\r\n": "\n", "а́": "а", "c": ""}
+
+def reference_apply(replacements, text):
+    """Замена слева направо, на каждой позиции самый длинный ключ, простым перебором"""
+    keys = sorted(replacements, key=len, reverse=True)
+    result = []
+    counts = Counter()
+    pos = 0
+    while pos < len(text):
+        for key in keys:
+            if text.startswith(key, pos):
+                result.append(replacements[key])
+                counts[key] += 1
+                pos += len(key)
+                break
+        else:
+            result.append(text[pos])
+            pos += 1
+    return ''.join(result), counts
+
+def random_text(rng, length):
+    return ''.join(rng.choice("abcd\r\nа́x") for _ in range(length))
+
+def test_trie_matcher_longest_match():
+    matcher = TrieMatcher(REPLACEMENTS)
+    rng = random.Random(1)
+    for _ in range(500):
+        text = random_text(rng, rng.randint(0, 30))
+        expected, expected_counts = reference_apply(REPLACEMENTS, text)
+        counts = Counter()
+        assert matcher.apply(text, counts) == expected
+        assert counts == expected_counts
+        assert matcher.count(text) == expected_counts
+
+def test_trie_matcher_empty():
+    matcher = TrieMatcher({})
+    assert matcher.apply("abc") == "abc"
+    assert matcher.count("abc") == Counter()
+    assert list(matcher.finditer("abc")) == []
+
+def test_engine_count_matches_apply():
+    engine = ReplacementEngine([{"\r\n": "\n", "а́": "а", "́": "", "\r": "\n", "x": "y"}])
+    rng = random.Random(2)
+    for _ in range(500):
+        text = random_text(rng, rng.randint(0, 30))
+        assert engine.count(text) == engine.apply(text)[1]
+
+def test_engine_first_table_wins():
+    engine = ReplacementEngine([{"a": "1"}, {"a": "2", "b": "b"}])
+    assert engine.apply("ab") == ("1b", Counter({"a": 1}))
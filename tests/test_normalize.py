@@ -0,0 +1,46 @@
+"""Нормализация Unicode только серий нестандартных символов"""
+
+import random
+import time
+import unicodedata
+
+import pytest
+
+from text_cleaner.core import clean, normalize_runs, normalize_split
+from text_cleaner.stream import clean_stream
+
+# Буквы с готовыми и составными знаками, лигатура, полноширинная буква, цифра в круге, индекс
+ALPHABET = ["a", "e", "и", "й", "е", "́", "̆", "̈", "ﬁ", "Ａ", "①", "é", "₂", " ", "x"]
+
+@pytest.mark.parametrize("form", ["NFC", "NFKC"])
+def test_normalize_runs_matches_whole_text(form):
+    rng = random.Random(form)
+    for _ in range(2000):
+        text = ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 15)))
+        assert normalize_runs(text, form)[0] == unicodedata.normalize(form, text)
+
+def test_normalize_runs_joins_previous_char():
+    # и + U+0306 → й: знак соединяется со стандартным символом перед серией
+    assert normalize_runs("ми\u0306", "NFC") == ("м\u0439", {"\u0306": 1})
+
+def test_standard_text_untouched():
+    text = "plain ASCII and кириллица"
+    assert normalize_runs(text, "NFKC") == (text, {})
+
+def test_normalize_split_keeps_last_base():
+    assert normalize_split("abc") == 2
+    assert normalize_split("abe\u0301") == 2
+    assert normalize_split("") == 0
+
+def test_nfkc_profile():
+    text, counts = clean("ﬁle Ａ ①", "nfkc")
+    assert text == "file A 1"
+    assert counts == {"ﬁ": 1, "Ａ": 1, "①": 1}
+
+@pytest.mark.parametrize("profile", ["all", "nfkc"])
+def test_stream_without_spaces_is_linear(profile):
+    # 40 тыс. символов CJK без пробелов: разрез не ищет начало слова по всему тексту
+    text = "漢字" * 20000
+    start = time.perf_counter()
+    assert ''.join(clean_stream((text[i:i + 100] for i in range(0, len(text), 100)), profile)) == text
+    assert time.perf_counter() - start < 5
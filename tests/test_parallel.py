@@ -0,0 +1,49 @@
+"""Параллельный анализ по частям совпадает с анализом всего текста"""
+
+import random
+
+from text_cleaner import background, core
+from text_cleaner.parallel import analyze_file_parallel, chunk_bounds, merge_runs, parallel_find_runs
+from text_cleaner.stream import analyze_byte_stream
+
+# Многобайтовые символы, серии нестандартных символов и CRLF, которые режутся границами частей
+ALPHABET = ["a", "б", " ", "\n", "\r\n", "\r", " ", "​", "\x01", "—", "\U0001f600"]
+
+def random_text(seed, length):
+    rng = random.Random(seed)
+    return ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+def test_chunk_bounds_keep_utf8_chars():
+    data = "абв😀г".encode('utf-8')
+    bounds = chunk_bounds(data, len(data), 3)
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(data)
+    for start, end in bounds:
+        data[start:end].decode('utf-8')
+
+def test_merge_runs_joins_split_run():
+    runs = [("spaces", 0, 2)]
+    merge_runs(runs, [("spaces", 0, 1), ("invisible", 1, 2)], 2)
+    assert runs == [("spaces", 0, 3), ("invisible", 3, 4)]
+
+def test_parallel_find_runs_matches_core():
+    text = random_text(1, 3000)
+    result = parallel_find_runs(text, workers=2, chunk_size=61)
+    assert result == (core.count_nonstandard(text), list(core.find_runs(text)))
+
+def test_analyze_file_parallel_counts_crlf_at_boundaries(tmp_path):
+    text = random_text(2, 3000)
+    path = tmp_path / "big.txt"
+    path.write_bytes(text.encode('utf-8'))
+    expected = analyze_byte_stream([path.read_bytes()])
+    for chunk_size in (2, 17, 64):
+        assert analyze_file_parallel(str(path), workers=2, chunk_size=chunk_size) == expected
+
+def test_use_parallel_compares_utf8_size(monkeypatch):
+    monkeypatch.setattr(background, "PARALLEL_MIN_SIZE", 1000)
+    monkeypatch.setattr(background, "default_workers", lambda: 2)
+    # 600 символов кириллицы - 1200 байт UTF-8
+    assert background.use_parallel("б" * 600)
+    assert not background.use_parallel("b" * 600)
+    assert background.use_parallel("b" * 1000)
+    monkeypatch.setattr(background, "default_workers", lambda: 1)
+    assert not background.use_parallel("b" * 1000)
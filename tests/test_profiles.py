@@ -0,0 +1,62 @@
+"""Профили очистки: проверка описаний, компиляция и загрузка из файла"""
+
+import json
+
+import pytest
+
+from text_cleaner import cli
+from text_cleaner.core import clean
+from text_cleaner.profiles import PROFILES, get_profile, read_profiles, validate_profile
+
+@pytest.mark.parametrize("spec", [
+    [],
+    {"unknown": 1},
+    {"tables": 5},
+    {"tables": "similar"},
+    {"tables": ["nope"]},
+    {"tables": [["similar"]]},
+    {"replacements": []},
+    {"replacements": {"a": 1}},
+    {"replacements": {"": "x"}},
+    {"keep": "abc"},
+    {"keep": ["ab"]},
+    {"keep": [5]},
+    {"ascii_fold": 1},
+    {"context_homoglyphs": "false"},
+    {"collapse_spaces": None},
+    {"strip_lines": []},
+    {"normalize": "nfc"},
+    {"normalize": []},
+])
+def test_invalid_profile(spec):
+    with pytest.raises(ValueError):
+        validate_profile("test", spec)
+
+def test_defaults_filled():
+    spec = validate_profile("test", {"tables": ["spaces"], "keep": ("U+00A0",)})
+    assert spec["replacements"] == {} and spec["collapse_spaces"] is False and spec["normalize"] is None
+
+@pytest.mark.parametrize("name", sorted(PROFILES))
+def test_builtin_profiles_compile(name):
+    assert validate_profile(name, PROFILES[name])
+    assert get_profile(name)["key"]
+
+def test_same_spec_compiled_once():
+    spec = {"tables": ["spaces"], "replacements": {"x": "y"}}
+    assert get_profile(spec) is get_profile(dict(spec))
+
+def test_keep_range_and_replacements():
+    spec = {"tables": ["similar", "spaces"], "keep": ["U+00A0"], "replacements": {"→": "->"}}
+    assert clean("a b → c", spec)[0] == "a b -> c"
+
+def test_read_profiles_rejects_bad_file(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"mine": {"replacements": []}}), encoding='utf-8')
+    with pytest.raises(ValueError):
+        read_profiles(str(path))
+
+def test_cli_reports_bad_profiles_without_traceback(tmp_path, capsys):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"mine": {"tables": 5}}), encoding='utf-8')
+    assert cli.main(["--profiles", str(path), "scan", str(path)]) == 2
+    assert "tables" in capsys.readouterr().err
@@ -0,0 +1,121 @@
+"""Атомарное сохранение и запись больших файлов по страницам"""
+
+import codecs
+import os
+import stat
+
+import pytest
+
+from text_cleaner import paged
+from text_cleaner.paged import PagedFile
+from text_cleaner.background import read_job
+from text_cleaner.saving import UMASK, atomic_write, encode_document, encode_text, file_mode
+
+def temp_files(directory):
+    return [name for name in os.listdir(directory) if name.startswith(".text_cleaner-")]
+
+def test_atomic_write_replaces_and_keeps_mode(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"old")
+    os.chmod(path, 0o640)
+    assert atomic_write(str(path), [b"new ", b"text"]) == 8
+    assert path.read_bytes() == b"new text"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    assert temp_files(tmp_path) == []
+
+def test_new_file_mode_from_umask(tmp_path):
+    path = tmp_path / "new.txt"
+    assert file_mode(str(path)) == 0o666 & ~UMASK
+    atomic_write(str(path), [b"x"])
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~UMASK
+    # Маска процесса не меняется
+    assert os.umask(UMASK) == UMASK
+
+def test_error_keeps_target(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"old")
+    
+    def blocks():
+        yield b"partial"
+        raise RuntimeError("сбой")
+    with pytest.raises(RuntimeError):
+        atomic_write(str(path), blocks())
+    assert path.read_bytes() == b"old"
+    assert temp_files(tmp_path) == []
+
+def test_before_replace_runs_after_write(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"old")
+    seen = []
+    atomic_write(str(path), [b"new"], before_replace=lambda: seen.append((path.read_bytes(), temp_files(tmp_path))))
+    assert seen[0][0] == b"old" and len(seen[0][1]) == 1
+    assert path.read_bytes() == b"new"
+
+def test_encode_text_blocks():
+    text = "абв" * 10
+    blocks = list(encode_text(text, size=7))
+    assert all(len(block) <= 14 for block in blocks)
+    assert b"".join(blocks) == text.encode('utf-8')
+
+@pytest.mark.parametrize("data, newline", [
+    ("раз\r\nдва\r\n".encode('cp1251'), '\r\n'),
+    (codecs.BOM_UTF16_LE + "раз\r\nдва\r\n".encode('utf-16-le'), '\r\n'),
+    (codecs.BOM_UTF8 + "раз\rдва\r".encode('utf-8'), '\r'),
+    ("раз\nдва\n".encode('koi8-r'), '\n'),
+], ids=["cp1251-crlf", "utf16-bom", "utf8-bom-cr", "koi8-r"])
+def test_read_and_save_keep_format(tmp_path, data, newline):
+    path = tmp_path / "a.txt"
+    path.write_bytes(data)
+    text, text_format, _ = read_job(str(path), lambda fraction: None, lambda: False)
+    assert text == "раз\nдва\n"
+    assert text_format[2] == newline
+    atomic_write(str(path), encode_document(text, text_format, size=3))
+    assert path.read_bytes() == data
+
+def test_encode_document_missing_char():
+    with pytest.raises(UnicodeEncodeError):
+        list(encode_document("раз 😀", ('cp1251', b'', '\r\n')))
+
+def open_paged(monkeypatch, path, data, **options):
+    monkeypatch.setattr(paged, "PAGE_LINES", 2)
+    path.write_bytes(data)
+    file = PagedFile(str(path), **options)
+    file.indexed.wait()
+    return file
+
+def test_iter_bytes_copies_unchanged_pages(monkeypatch, tmp_path):
+    # Ошибочный байт неизмененной страницы сохраняется как есть
+    data = b"one\ntwo\nbad \xff\nfour\nfive\nsix\n"
+    file = open_paged(monkeypatch, tmp_path / "a.txt", data)
+    try:
+        assert file.page_count == 3
+        assert b"".join(file.iter_bytes()) == data
+        file.store_page(1, "BAD\nFOUR\n", 0)
+        assert b"".join(file.iter_bytes()) == b"one\ntwo\nBAD\nFOUR\nfive\nsix\n"
+    finally:
+        file.close()
+
+def test_iter_bytes_keeps_crlf_and_encoding(monkeypatch, tmp_path):
+    cp1251 = "раз\r\nдва\r\nтри\r\nчетыре\r\n".encode('cp1251')
+    file = open_paged(monkeypatch, tmp_path / "a.txt", cp1251, encoding='cp1251')
+    try:
+        assert file.text_format == ('cp1251', b'', '\r\n')
+        assert b"".join(file.iter_bytes()) == cp1251
+        # Измененная страница записывается в кодировке и с переводами строк файла
+        file.store_page(1, "ТРИ\nчетыре\n", 0)
+        assert b"".join(file.iter_bytes()) == "раз\r\nдва\r\nТРИ\r\nчетыре\r\n".encode('cp1251')
+        # Символа нет в cp1251: сохранить можно только в другой кодировке, например UTF-8
+        file.store_page(1, "три 😀\nчетыре\n", 0)
+        with pytest.raises(UnicodeEncodeError):
+            b"".join(file.iter_bytes())
+        utf8 = b"".join(file.iter_bytes(('utf-8', b'', '\r\n')))
+        assert utf8 == "раз\r\nдва\r\nтри 😀\r\nчетыре\r\n".encode('utf-8')
+    finally:
+        file.close()
+    # Метка порядка байтов копируется вместе с неизмененными страницами
+    data = codecs.BOM_UTF8 + "раз\r\nдва\r\n".encode('utf-8')
+    file = open_paged(monkeypatch, tmp_path / "b.txt", data, bom_length=len(codecs.BOM_UTF8))
+    try:
+        assert b"".join(file.iter_bytes()) == data
+    finally:
+        file.close()
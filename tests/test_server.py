@@ -0,0 +1,143 @@
+"""HTTP-сервер очистки: ответы, пакеты и закрытие соединений"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from text_cleaner.core import analyze, clean
+from text_cleaner import server as server_module
+from text_cleaner.server import CleaningServer, analyze_batch
+
+TEXT = "Сlean  text​ with “quotes”\n"
+
+def run_server(check, prepare=None, **options):
+    """Запускаем сервер на свободном порту и выполняем check(порт); prepare(сервер) - до запуска"""
+    async def main():
+        server = CleaningServer(workers=1, **options)
+        if prepare is not None:
+            prepare(server)
+        listener = await server.start(port=0)
+        try:
+            await asyncio.wait_for(check(listener.sockets[0].getsockname()[1]), 60)
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            server.close()
+    asyncio.run(main())
+
+async def request(port, method, path, body=b"", close=True):
+    """Отправляем запрос и читаем ответ до конца соединения: (код, заголовки, тело)"""
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+    if close:
+        head += "Connection: close\r\n"
+    return await send_raw(port, head.encode('latin-1') + b"\r\n" + body)
+
+async def send_raw(port, data):
+    """Отправляем байты запроса как есть и разбираем ответ"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    # Без закрытия соединения сервером чтение не завершится
+    data = await asyncio.wait_for(reader.read(), 20)
+    writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    lines = head.decode('latin-1').split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding") == "chunked":
+        body = unchunk(body)
+    return int(lines[0].split()[1]), headers, body
+
+def unchunk(data):
+    parts = []
+    while True:
+        size, _, data = data.partition(b"\r\n")
+        size = int(size, 16)
+        if size == 0:
+            return b"".join(parts)
+        parts.append(data[:size])
+        data = data[size + 2:]
+
+def test_first_request_with_connection_close():
+    # Процессы пула не должны держать соединение первого клиента открытым
+    async def check(port):
+        status, headers, body = await request(port, "POST", "/clean", TEXT.encode('utf-8'))
+        text, counts = clean(TEXT, "all")
+        assert status == 200
+        assert body.decode('utf-8') == text
+        assert int(headers["x-replacements"]) == sum(counts.values())
+        assert (await request(port, "GET", "/health"))[2] == b"ok"
+    run_server(check)
+
+def test_large_body_streamed():
+    text = TEXT * 5000
+    
+    async def check(port):
+        status, headers, body = await request(port, "POST", "/clean", text.encode('utf-8'))
+        assert status == 200
+        assert headers["transfer-encoding"] == "chunked"
+        assert body.decode('utf-8') == clean(text, "all")[0]
+    run_server(check)
+
+def test_bad_body_fails_only_its_request():
+    good = [TEXT.encode('utf-8'), "ёжик ".encode('utf-8')]
+    bad = b"\xff\xfe bad"
+    
+    async def check(port):
+        responses = await asyncio.gather(
+            request(port, "POST", "/analyze", good[0]),
+            request(port, "POST", "/analyze", bad),
+            request(port, "POST", "/analyze", good[1]),
+        )
+        assert [status for status, _, _ in responses] == [200, 400, 200]
+        assert json.loads(responses[0][2]) == json.loads(json.dumps(analyze(TEXT)))
+    # Задержка пакета собирает три запроса в одну задачу пула
+    run_server(check, batch_delay=0.2)
+
+def test_analyze_batch_item_errors():
+    results = analyze_batch([b"abc", b"\xff", "ё".encode('utf-8')])
+    assert results[0][1] is None and results[2][1] is None
+    assert results[1][0] is None
+    assert isinstance(results[1][1], UnicodeDecodeError)
+
+def test_long_chunk_size_line(monkeypatch):
+    # Небольшой предел, чтобы запрос целиком пришел одним сегментом и был прочитан до закрытия
+    monkeypatch.setattr(server_module, "MAX_HEAD_SIZE", 1024)
+    head = b"POST /clean HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n\r\n"
+    
+    async def check(port):
+        status, _, _ = await send_raw(port, head + b"1" * 2048 + b"\r\n")
+        assert status == 400
+        # Сервер продолжает работать
+        assert (await request(port, "GET", "/health"))[0] == 200
+    run_server(check)
+
+def break_pool(server):
+    """Процесс пула завершается посреди задачи: пул становится BrokenProcessPool"""
+    server.executor.shutdown()
+    server.executor = server.batcher.executor = ProcessPoolExecutor(max_workers=1)
+    with pytest.raises(BrokenProcessPool):
+        server.executor.submit(os._exit, 1).result()
+
+CHUNKED_CLEAN = (b"POST /clean HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n\r\n"
+                 b"4\r\ntext\r\n0\r\n\r\n")
+
+@pytest.mark.parametrize("path, data", [
+    ("/clean", b"POST /clean HTTP/1.1\r\nContent-Length: 4\r\n\r\ntext"),
+    ("/analyze", b"POST /analyze HTTP/1.1\r\nContent-Length: 4\r\n\r\ntext"),
+    # Тело chunked обрабатывается потоком, а не пакетом
+    ("/clean", CHUNKED_CLEAN),
+], ids=["batch", "analyze", "stream"])
+def test_broken_pool_answers_500(path, data, capsys):
+    async def check(port):
+        status, _, _ = await send_raw(port, data)
+        assert status == 500
+        stats = json.loads((await request(port, "GET", "/stats"))[2])
+        assert stats[f"POST {path}"]["errors"] == 1
+    run_server(check, prepare=break_pool)
+    assert "BrokenProcessPool" in capsys.readouterr().err
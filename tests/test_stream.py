@@ -0,0 +1,121 @@
+"""Потоковая очистка: результат по частям совпадает с очисткой всего текста"""
+
+import os
+import random
+import stat
+from collections import Counter
+
+import pytest
+
+from text_cleaner import instrument
+from text_cleaner.core import COMBINING_SPLIT_LIMIT, PROFILES, analyze, clean
+from text_cleaner.homoglyphs import WORD_SPLIT_LIMIT
+from text_cleaner.stream import (
+    StreamCleaner, analyze_byte_stream, clean_file, clean_stream, count_stream, utf8_split,
+)
+
+# Латиница, кириллица, омоглифы, пробелы, невидимые символы, CRLF и знак ударения
+ALPHABET = ["a", "b", "о", "р", "к", "с", "x", " ", "  ", "\n", "\r\n", " ", "​", "—", "«", "́",
+            "\x01", "ﬁ", "Ａ", "①", "\t"]
+
+def random_text(rng, length):
+    return ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+def random_chunks(rng, text):
+    """Режем текст на части случайной длины, в том числе пустые и по одному символу"""
+    chunks = []
+    pos = 0
+    while pos < len(text):
+        size = rng.choice([0, 1, 2, 3, 7, 50])
+        chunks.append(text[pos:pos + size])
+        pos += size
+    return chunks
+
+@pytest.mark.parametrize("profile", sorted(PROFILES))
+def test_clean_stream_matches_clean(profile):
+    rng = random.Random(profile)
+    for _ in range(200):
+        text = random_text(rng, rng.randint(0, 60))
+        expected, expected_counts = clean(text, profile)
+        counts = Counter()
+        assert ''.join(clean_stream(random_chunks(rng, text), profile, counts)) == expected
+        assert counts == expected_counts
+
+# Профиль с многосимвольными ключами и исправлением омоглифов по контексту
+SEQUENCE_PROFILE = {"tables": ["similar", "line-endings", "stress-marks"]}
+
+@pytest.mark.parametrize("profile", sorted(PROFILES) + [SEQUENCE_PROFILE], ids=str)
+def test_count_stream_matches_clean(profile):
+    rng = random.Random(str(profile))
+    for _ in range(200):
+        text = random_text(rng, rng.randint(0, 60))
+        assert count_stream(random_chunks(rng, text), profile) == clean(text, profile)[1]
+
+def test_count_stream_sequence_after_homoglyph():
+    # Латинская a в кириллическом слове исправляется, и только потом совпадает ключ "а" + U+0301
+    text = "ёоa\u0301"
+    counts = clean(text, SEQUENCE_PROFILE)[1]
+    assert counts == {"а\u0301": 1, "a": 1}
+    assert count_stream([text[:2], text[2:]], SEQUENCE_PROFILE) == counts
+    assert count_stream([text], SEQUENCE_PROFILE) == counts
+
+def test_clean_file_in_place_keeps_mode(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("Пример текста​  с  пробелами\n", encoding='utf-8')
+    os.chmod(path, 0o644)
+    counts = clean_file(str(path), str(path))
+    assert path.read_text(encoding='utf-8') == clean("Пример текста​  с  пробелами\n")[0]
+    assert sum(counts.values()) == 2
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert os.listdir(tmp_path) == ["input.txt"]
+
+def test_clean_file_in_place_counts_bytes_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(instrument, "ENABLED", True)
+    monkeypatch.setattr(instrument, "COUNTERS", Counter())
+    path = tmp_path / "a.txt"
+    data = "один   два\u200b\n".encode('utf-8')
+    path.write_bytes(data)
+    clean_file(str(path), str(path))
+    assert os.path.getsize(path) < len(data)
+    assert instrument.COUNTERS["bytes.read"] == len(data)
+
+def test_clean_file_error_keeps_original(tmp_path):
+    src = tmp_path / "broken.txt"
+    src.write_bytes(b"ok\n\xff\xfe")
+    dst = tmp_path / "out.txt"
+    dst.write_text("old", encoding='utf-8')
+    with pytest.raises(UnicodeDecodeError):
+        clean_file(str(src), str(dst))
+    assert dst.read_text(encoding='utf-8') == "old"
+    assert sorted(os.listdir(tmp_path)) == ["broken.txt", "out.txt"]
+
+def test_analyze_byte_stream_matches_analyze():
+    rng = random.Random(3)
+    text = random_text(rng, 2000)
+    data = text.encode('utf-8')
+    chunks = []
+    tail = b''
+    for pos in range(0, len(data), 37):
+        chunk, tail = utf8_split(tail + data[pos:pos + 37])
+        chunks.append(chunk)
+    chunks.append(tail)
+    # В текстовом режиме '\r\n' читается как '\n'
+    assert analyze_byte_stream(chunks) == analyze(text.replace('\r\n', '\n'))
+
+@pytest.mark.parametrize("text", [
+    "漢字仮名交じり文" * 5000,
+    "QUJDRGVmZ2hpamtsbW5vcHFyc3R1dnd4eXo=" * 1000,
+    "e" + "́" * 40000,
+])
+@pytest.mark.parametrize("profile", ["all", "nfkc"])
+def test_pending_bounded_without_spaces(text, profile):
+    cleaner = StreamCleaner(profile)
+    pieces = []
+    for pos in range(0, len(text), 1000):
+        pieces.append(cleaner.feed(text[pos:pos + 1000]))
+        # Удерживается не больше двух пределов: для слова и для серии комбинируемых знаков
+        assert len(cleaner.pending) <= WORD_SPLIT_LIMIT + COMBINING_SPLIT_LIMIT + 1
+    pieces.append(cleaner.finish())
+    result = ''.join(pieces)
+    if profile == "all":
+        assert result == clean(text, profile)[0]
@@ -0,0 +1,51 @@
+"""Векторная классификация совпадает с чистым Python, в том числе на границах блоков"""
+
+import random
+
+import pytest
+
+from text_cleaner import core, vectorized
+from text_cleaner.charclass import CATEGORIES
+
+# Стандартные символы, пробелы и невидимые, управляющие, омоглифы, символы за пределами BMP
+# (эмодзи, математическая буква) и одиночные суррогаты
+ALPHABET = ["a", "б", " ", "\n", "\r\n", "\u00a0", "\u200b", "\x01", "\u2014", "с", "\U0001f600", "\U0001d400",
+            "\ud800", "\udfff", "\u2460"]
+
+def random_text(rng, length):
+    return ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Векторный путь с маленькими блоками или, с HAVE_NUMPY = False, чистый Python"""
+    if request.param:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(vectorized, "HAVE_NUMPY", request.param)
+    monkeypatch.setattr(vectorized, "MIN_VECTOR_SIZE", 0)
+    # Блок из нескольких символов: серии и строки часто пересекают границу блоков
+    monkeypatch.setattr(vectorized, "VECTOR_BLOCK_SIZE", 7)
+    return request.param
+
+def expected_line_counts(text):
+    lines = text.split('\n')
+    counts = {category: [] for category in CATEGORIES}
+    for line in lines:
+        report = core.analyze(line)
+        for category in CATEGORIES:
+            counts[category].append(sum(report[category].values()))
+    return counts
+
+def test_matches_core(backend):
+    rng = random.Random(1)
+    for _ in range(300):
+        text = random_text(rng, rng.randint(0, 40))
+        assert vectorized.find_runs(text) == list(core.find_runs(text))
+        assert vectorized.analyze(text) == core.analyze(text)
+        assert vectorized.count_nonstandard(text) == core.count_nonstandard(text)
+        assert vectorized.line_counts(text) == expected_line_counts(text)
+
+def test_run_across_block_boundary(backend):
+    text = "ab" + "\u00a0" * 20 + "c\U0001f600\U0001f600d"
+    runs = vectorized.find_runs(text)
+    assert runs == list(core.find_runs(text))
+    assert (runs[0][1], runs[0][2]) == (2, 22)
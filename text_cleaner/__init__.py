@@ -0,0 +1,13 @@
+"""Поиск и замена нестандартных символов в тексте
+
+Модуль не импортирует tkinter: графический редактор находится в text_cleaner.gui.
+"""
+
+from .core import (
+    CATEGORIES, CONTROL, DEFAULT_PROFILE, INVISIBLE, PROFILES, SIMILAR, SPACE, STANDARD_CHARS,
+    analyze, classify, classify_char, clean, find_runs, index_ranges,
+)
+from .engine import ReplacementEngine
+from .profiles import get_profile, load_profiles
+
+__version__ = "1.0"
@@ -0,0 +1,154 @@
+"""Фоновое выполнение сканирования, очистки и чтения файлов вне главного потока Tk"""
+
+import heapq
+import os
+import queue
+import threading
+
+from . import instrument
+from .core import edit_spans, index_ranges
+from .encoding import SAMPLE_SIZE, Decoder, detect_encoding, detect_newline, universal_newlines
+from .homoglyphs import homoglyph_runs
+from .parallel import PARALLEL_MIN_SIZE, default_workers, parallel_find_runs
+from .stream import StreamCleaner
+from .vectorized import find_runs
+
+# Размер блока, после которого задание сообщает о прогрессе и проверяет отмену
+BLOCK_SIZE = 1024 * 1024
+
+class BackgroundRunner:
+    """Выполняем задания в рабочем потоке; результаты забираются из очереди главным потоком"""
+    
+    def __init__(self):
+        self.messages = queue.Queue()
+        # Номер текущего задания: новое задание или отмена меняют его, сообщения прежних отбрасываются
+        self.generation = 0
+        self.cancel_event = None
+    
+    @property
+    def busy(self):
+        return self.cancel_event is not None
+    
+    def start(self, func, *args):
+        """Запускаем func(*args, progress, cancelled) в рабочем потоке, предыдущее задание отменяется"""
+        self.cancel()
+        generation = self.generation
+        cancel_event = threading.Event()
+        self.cancel_event = cancel_event
+        
+        def progress(fraction):
+            self.messages.put((generation, "progress", fraction))
+        
+        def run():
+            try:
+                result = func(*args, progress=progress, cancelled=cancel_event.is_set)
+            except Exception as e:
+                self.messages.put((generation, "error", e))
+                return
+            if not cancel_event.is_set():
+                self.messages.put((generation, "done", result))
+        
+        threading.Thread(target=run, daemon=True).start()
+    
+    def cancel(self):
+        """Отменяем текущее задание: его результат уже не будет применен"""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.cancel_event = None
+        self.generation += 1
+    
+    def poll(self):
+        """Забираем сообщения текущего задания: [(вид, данные)], устаревшие отбрасываем"""
+        result = []
+        while True:
+            try:
+                generation, kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                return result
+            if generation != self.generation:
+                continue
+            if kind != "progress":
+                self.cancel_event = None
+            result.append((kind, payload))
+
+def use_parallel(text):
+    """Большой документ на машине с несколькими ядрами анализируется в нескольких процессах
+
+    PARALLEL_MIN_SIZE - размер в байтах UTF-8: у кириллицы байтов вдвое больше, чем символов.
+    """
+    # Символ занимает от 1 до 4 байт: кодировать текст ради размера нужно, только если символов меньше порога
+    if default_workers() < 2 or len(text) * 4 < PARALLEL_MIN_SIZE:
+        return False
+    return len(text) >= PARALLEL_MIN_SIZE or len(text.encode('utf-8', 'surrogatepass')) >= PARALLEL_MIN_SIZE
+
+def scan_job(text, progress, cancelled):
+    """Ищем серии нестандартных символов по блокам: (число символов, индексы для тегов)"""
+    if use_parallel(text):
+        with instrument.phase("parallel_find_runs"):
+            result = parallel_find_runs(text, progress=progress, cancelled=cancelled)
+        if result is None:
+            return None
+        count, runs = result
+    else:
+        runs = []
+        for start in range(0, len(text), BLOCK_SIZE):
+            if cancelled():
+                return None
+            # Серия на границе блоков делится на две соседние, теги Tk все равно сливаются
+            block = text[start:start + BLOCK_SIZE]
+            with instrument.phase("find_runs"):
+                runs.extend((category, start + begin, start + end) for category, begin, end in find_runs(block))
+            progress(min(1.0, (start + BLOCK_SIZE) / len(text)))
+        count = sum(end - start for _, start, end in runs)
+    instrument.count("chars.scanned", len(text))
+    instrument.count("runs.found", len(runs))
+    # Омоглифы подсвечиваются, но в число нестандартных символов не входят
+    with instrument.phase("homoglyphs_index"):
+        runs = heapq.merge(runs, homoglyph_runs(text), key=lambda run: run[1])
+        return count, index_ranges(text, runs)
+
+def clean_job(text, profile, progress, cancelled):
+    """Очищаем текст по блокам (результат совпадает с core.clean): (правки core.edit_spans, число замен)"""
+    cleaner = StreamCleaner(profile)
+    pieces = []
+    for start in range(0, len(text), BLOCK_SIZE):
+        if cancelled():
+            return None
+        pieces.append(cleaner.feed(text[start:start + BLOCK_SIZE]))
+        progress(min(1.0, (start + BLOCK_SIZE) / len(text)))
+    pieces.append(cleaner.finish())
+    with instrument.phase("edit_spans"):
+        spans = edit_spans(text, ''.join(pieces))
+    return spans, cleaner.counts
+
+def read_job(path, progress, cancelled):
+    """Читаем файл по блокам с универсальными переводами строк, как open() в текстовом режиме
+
+    Кодировка определяется по первым SAMPLE_SIZE байтам; ошибочные байты заменяются на U+FFFD.
+    Результат: (текст, формат файла (кодировка, метка порядка байтов, перевод строки), серии замен
+    [(начало, конец)]); формат нужен, чтобы сохранить файл таким же.
+    """
+    size = os.path.getsize(path) or 1
+    with open(path, 'rb') as file:
+        block = file.read(SAMPLE_SIZE)
+        with instrument.phase("detect_encoding"):
+            encoding, bom_length = detect_encoding(block)
+        decoder = Decoder(encoding)
+        bom = block[:bom_length]
+        pieces = []
+        done = len(block)
+        # Первый блок - уже прочитанный фрагмент без метки порядка байтов
+        block = block[bom_length:]
+        while block:
+            if cancelled():
+                return None
+            pieces.append(decoder.decode(block))
+            progress(done / size)
+            block = file.read(BLOCK_SIZE)
+            done += len(block)
+    pieces.append(decoder.decode(b'', final=True))
+    instrument.count("bytes.read", done)
+    text = ''.join(pieces)
+    text_format = (encoding, bom, detect_newline(text))
+    text, runs = universal_newlines(text, decoder.runs)
+    return text, text_format, runs
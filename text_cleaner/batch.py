@@ -0,0 +1,152 @@
+"""Пакетная очистка дерева каталогов в нескольких процессах"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import sqlite3
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .cache import DEFAULT_CACHE_SIZE, MAX_ENTRY_SHARE, ResultCache, file_digest
+from .core import CATEGORIES, DEFAULT_PROFILE
+from .profiles import get_profile, profile_spec
+from .saving import atomic_write
+from .stream import DEFAULT_CHUNK_SIZE, StreamCleaner, iter_chunks
+from .vectorized import analyze
+
+# Сколько файлов отправляется в процесс за одну задачу
+FILES_PER_TASK = 16
+
+def iter_files(root, pattern="*.txt"):
+    """Перебираем файлы дерева каталогов, подходящие под шаблон"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if fnmatch.fnmatch(filename, pattern):
+                yield os.path.join(dirpath, filename)
+
+def clean_one(src, dst, profile=DEFAULT_PROFILE, chunk_size=DEFAULT_CHUNK_SIZE, cache=None):
+    """Очищаем один файл и считаем его нестандартные символы за одно чтение; с cache - через кэш результатов"""
+    if cache is None:
+        return clean_file_stats(src, dst, profile, chunk_size)
+    
+    digest = file_digest(src)
+    key = cache.key(digest, get_profile(profile)["key"])
+    entry = cache.get(key)
+    if entry is not None:
+        output, unchanged, stats = entry
+        # Файл, который очистка не меняет, при очистке на месте не перезаписываем
+        if not (unchanged and os.path.abspath(src) == os.path.abspath(dst)):
+            write_bytes(dst, output)
+        return {**stats, "cached": True}
+    
+    stats = clean_file_stats(src, dst, profile, chunk_size)
+    if os.path.getsize(dst) <= cache.max_size // MAX_ENTRY_SHARE:
+        with open(dst, 'rb') as file:
+            output = file.read()
+        cache.put(key, output, hashlib.sha256(output).hexdigest() == digest, stats)
+    return {**stats, "cached": False}
+
+def write_bytes(dst, data):
+    """Записываем результат из кэша через временный файл"""
+    os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+    atomic_write(dst, [data])
+
+def clean_file_stats(src, dst, profile, chunk_size):
+    """Очищаем файл потоком и собираем статистику по нестандартным символам и заменам"""
+    cleaner = StreamCleaner(profile)
+    stats = dict.fromkeys(("chars", "nonstandard") + CATEGORIES, 0)
+    
+    os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+    with open(src, 'r', encoding='utf-8') as source:
+        atomic_write(dst, cleaned_bytes(cleaner, iter_chunks(source, chunk_size), stats))
+    
+    stats["replacements"] = sum(cleaner.counts.values())
+    return stats
+
+def cleaned_bytes(cleaner, chunks, stats):
+    """Очищаем части текста и перебираем байты результата, попутно добавляя анализ частей в stats"""
+    for chunk in chunks:
+        report = analyze(chunk)
+        stats["chars"] += report["total"]
+        stats["nonstandard"] += report["nonstandard"]
+        for category in CATEGORIES:
+            stats[category] += sum(report[category].values())
+        yield cleaner.feed(chunk).encode('utf-8')
+    yield cleaner.finish().encode('utf-8')
+
+def open_cache(path, size):
+    """Открываем кэш результатов; если база недоступна, файлы очищаются без кэша (None)"""
+    try:
+        return ResultCache(path, size)
+    except sqlite3.Error:
+        return None
+
+def clean_task(jobs, profile, chunk_size, cache_path=None, cache_size=DEFAULT_CACHE_SIZE):
+    """Задача для процесса: очищаем группу файлов, ошибки возвращаем в результате"""
+    results = []
+    cache = open_cache(cache_path, cache_size) if cache_path is not None else None
+    try:
+        for src, dst, name in jobs:
+            try:
+                results.append({"file": name, **clean_one(src, dst, profile, chunk_size, cache)})
+            except (OSError, UnicodeDecodeError) as e:
+                results.append({"file": name, "error": str(e)})
+    finally:
+        if cache is not None:
+            cache.close()
+    return results
+
+def iter_tasks(src_root, dst_root, pattern):
+    """Группируем файлы в задачи: (исходный путь, путь результата, относительное имя)"""
+    task = []
+    for src in iter_files(src_root, pattern):
+        name = os.path.relpath(src, src_root)
+        dst = os.path.join(dst_root, name) if dst_root else src
+        task.append((src, dst, name))
+        if len(task) >= FILES_PER_TASK:
+            yield task
+            task = []
+    if task:
+        yield task
+
+def clean_tree(src_root, dst_root=None, profile=DEFAULT_PROFILE, pattern="*.txt",
+               workers=None, chunk_size=DEFAULT_CHUNK_SIZE, cache_path=None, cache_size=DEFAULT_CACHE_SIZE):
+    """Генератор: очищаем дерево в пуле процессов (без dst_root - на месте, с cache_path - через кэш результатов)"""
+    workers = workers or os.cpu_count() or 1
+    # Не больше двух задач на процесс в очереди: память не растет с размером дерева
+    max_pending = workers * 2
+    tasks = iter_tasks(src_root, dst_root, pattern)
+    # В процессы передается описание профиля, а не имя: профили из файла пользователя известны только здесь
+    profile = profile_spec(profile)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for task in tasks:
+            pending.add(executor.submit(clean_task, task, profile, chunk_size, cache_path, cache_size))
+            if len(pending) < max_pending:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+        for future in pending:
+            yield from future.result()
+
+def write_summary(results, file):
+    """Пишем сводку JSON по мере поступления результатов, возвращаем итоги"""
+    totals = Counter()
+    file.write('{\n  "files": [')
+    for i, result in enumerate(results):
+        file.write(',' if i else '')
+        file.write('\n    ' + json.dumps(result, ensure_ascii=False))
+        
+        totals["files"] += 1
+        if "error" in result:
+            totals["errors"] += 1
+            continue
+        for key, value in result.items():
+            if key != "file":
+                totals[key] += value
+    file.write('\n  ],\n  "totals": ' + json.dumps(dict(totals)) + '\n}\n')
+    return totals
@@ -0,0 +1,140 @@
+"""Постоянный кэш результатов очистки: ключ - хэш содержимого файла и версии правил профиля"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from .charclass import cache_dir
+
+# Размер кэша по умолчанию (сумма размеров сохраненных результатов)
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+
+# Доля кэша, которую может занять один результат; большие файлы не кэшируются
+MAX_ENTRY_SHARE = 16
+
+# Сколько секунд ждать блокировку базы, которую держит другой процесс
+LOCK_TIMEOUT = 60
+
+def default_cache_path():
+    return os.path.join(cache_dir(), "results.sqlite")
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """SHA-256 содержимого файла"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ResultCache:
+    """Результаты очистки в SQLite; при превышении размера вытесняются давно не использованные
+
+    Ошибка базы (например, "database is locked" при нескольких процессах) не прерывает очистку:
+    чтение считается промахом, а результат просто не сохраняется.
+    """
+    
+    def __init__(self, path=None, max_size=DEFAULT_CACHE_SIZE):
+        self.path = path or default_cache_path()
+        self.max_size = max_size
+        # Попадания и промахи этого экземпляра; общие счетчики хранятся в базе
+        self.hits = 0
+        self.misses = 0
+        
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Несколько процессов пакетной очистки пишут в одну базу: ждем блокировку, журнал WAL
+        self.db = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                output BLOB NOT NULL,
+                unchanged INTEGER NOT NULL,
+                stats TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS results_used ON results (used);
+            CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        """)
+    
+    @staticmethod
+    def key(digest, rules_key):
+        """Ключ записи: хэш входа вместе с хэшем правил профиля"""
+        return hashlib.sha256(f"{rules_key}:{digest}".encode('ascii')).hexdigest()
+    
+    def get(self, key):
+        """Результат по ключу: (байты результата, результат совпадает со входом, статистика) или None"""
+        try:
+            with self.db:
+                row = self.db.execute("SELECT output, unchanged, stats FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self._count("misses")
+                else:
+                    self._count("hits")
+                    self.db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        output, unchanged, stats = row
+        return output, bool(unchanged), json.loads(stats)
+    
+    def put(self, key, output, unchanged, stats):
+        """Сохраняем результат; слишком большой результат не сохраняется (возвращаем False)"""
+        if len(output) > self.max_size // MAX_ENTRY_SHARE:
+            return False
+        try:
+            with self.db:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, output, int(unchanged), json.dumps(stats), len(output), time.time()),
+                )
+                self._evict()
+        except sqlite3.Error:
+            return False
+        return True
+    
+    def _evict(self):
+        """Удаляем давно не использованные записи, пока кэш больше допустимого"""
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_size:
+            return
+        for key, size in self.db.execute("SELECT key, size FROM results ORDER BY used").fetchall():
+            self.db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._count("evictions")
+            total -= size
+            if total <= self.max_size:
+                break
+    
+    def _count(self, name):
+        self.db.execute("INSERT OR IGNORE INTO counters VALUES (?, 0)", (name,))
+        self.db.execute("UPDATE counters SET value = value + 1 WHERE name = ?", (name,))
+    
+    def stats(self):
+        """Сводка кэша: число записей, размер и накопленные счетчики"""
+        entries, size = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        counters = dict(self.db.execute("SELECT name, value FROM counters"))
+        return {
+            "entries": entries, "size": size, "max_size": self.max_size,
+            "hits": counters.get("hits", 0), "misses": counters.get("misses", 0),
+            "evictions": counters.get("evictions", 0),
+        }
+    
+    def clear(self):
+        with self.db:
+            self.db.execute("DELETE FROM results")
+            self.db.execute("DELETE FROM counters")
+        self.db.execute("VACUUM")
+    
+    def close(self):
+        self.db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
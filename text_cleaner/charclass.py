@@ -0,0 +1,144 @@
+"""Таблица классов символов: категория по коду символа за O(1)"""
+
+import hashlib
+import os
+import tempfile
+import unicodedata
+
+from .tables import (
+    SPACE_CHARS, STANDARD_CONTROL_CHARS, ADDITIONAL_CYRILLIC, STANDARD_PUNCTUATION, STANDARD_DIGITS_MATH,
+    KNOWN_INVISIBLE_CHARS, CYRILLIC_HOMOGLYPHS,
+)
+
+# Категории нестандартных символов (совпадают с именами тегов подсветки)
+INVISIBLE = "invisible"
+SPACE = "space"
+SIMILAR = "similar"
+CONTROL = "control"
+CATEGORIES = (INVISIBLE, SPACE, SIMILAR, CONTROL)
+
+# Коды классов в таблице: 0 - стандартный символ, далее категории по порядку
+STANDARD_CODE = 0
+CLASS_NAMES = (None,) + CATEGORIES
+CLASS_CODES = {name: code for code, name in enumerate(CLASS_NAMES)}
+
+# Размер таблицы: весь BMP
+TABLE_SIZE = 0x10000
+
+# Версия формата файла таблицы; меняется при изменении правил классификации
+TABLE_FORMAT = 1
+
+def build_standard_chars():
+    """Определяем множество стандартных символов"""
+    standard_chars = set()
+    
+    # Обычные ASCII символы (32-126)
+    for i in range(32, 127):
+        standard_chars.add(chr(i))
+    
+    # Стандартные управляющие символы
+    standard_chars.update(STANDARD_CONTROL_CHARS)
+    
+    # Кириллические символы
+    for i in range(0x0400, 0x04FF + 1):
+        char = chr(i)
+        if unicodedata.category(char) in ['Lu', 'Ll', 'Lo']:  # Буквы
+            standard_chars.add(char)
+    
+    standard_chars.update(ADDITIONAL_CYRILLIC)
+    standard_chars.update(STANDARD_PUNCTUATION)
+    standard_chars.update(STANDARD_DIGITS_MATH)
+    return frozenset(standard_chars)
+
+STANDARD_CHARS = build_standard_chars()
+SPECIAL_SPACES = frozenset(SPACE_CHARS)
+
+def is_invisible_char(char):
+    """Проверяем, является ли символ невидимым"""
+    return char in KNOWN_INVISIBLE_CHARS or unicodedata.category(char) in ['Cf', 'Mn']
+
+def is_special_space(char):
+    """Проверяем, является ли символ специальным пробелом"""
+    return char in SPECIAL_SPACES
+
+def is_similar_char(char):
+    """Проверяем, является ли символ похожим на стандартный"""
+    return char in CYRILLIC_HOMOGLYPHS
+
+def compute_class(char):
+    """Определяем код класса символа по правилам (без таблицы)"""
+    if char in STANDARD_CHARS:
+        return STANDARD_CODE
+    if is_invisible_char(char):
+        return CLASS_CODES[INVISIBLE]
+    if is_special_space(char):
+        return CLASS_CODES[SPACE]
+    if is_similar_char(char):
+        return CLASS_CODES[SIMILAR]
+    return CLASS_CODES[CONTROL]
+
+def build_table():
+    """Строим таблицу классов для всего BMP"""
+    return bytearray(compute_class(chr(code)) for code in range(TABLE_SIZE))
+
+def table_key():
+    """Хэш правил классификации и версии Unicode: при их изменении кэш на диске не подходит"""
+    digest = hashlib.sha256()
+    parts = [
+        str(TABLE_FORMAT), unicodedata.unidata_version,
+        ''.join(sorted(STANDARD_CHARS)), ''.join(sorted(KNOWN_INVISIBLE_CHARS)),
+        ''.join(sorted(SPECIAL_SPACES)), ''.join(sorted(CYRILLIC_HOMOGLYPHS)),
+    ]
+    for part in parts:
+        digest.update(part.encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+def cache_dir():
+    """Каталог кэша: $TEXT_CLEANER_CACHE или ~/.cache/text_cleaner"""
+    if os.environ.get("TEXT_CLEANER_CACHE"):
+        return os.environ["TEXT_CLEANER_CACHE"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "text_cleaner")
+
+def load_table():
+    """Читаем таблицу из кэша на диске, при отсутствии строим и сохраняем"""
+    path = os.path.join(cache_dir(), f"charclass-{table_key()}.bin")
+    try:
+        with open(path, 'rb') as file:
+            table = bytearray(file.read())
+        if len(table) == TABLE_SIZE:
+            return table
+    except OSError:
+        pass
+    
+    table = build_table()
+    # Кэш - только ускорение: если записать не удалось, работаем без него
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with open(fd, 'wb') as file:
+            file.write(table)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+    return table
+
+# Классы символов BMP: строятся один раз и при следующих запусках читаются с диска
+CLASS_TABLE = load_table()
+
+# Классы символов за пределами BMP, заполняется по мере встречи
+ASTRAL_CLASSES = {}
+
+def char_class(char):
+    """Код класса символа из таблицы"""
+    code = ord(char)
+    if code < TABLE_SIZE:
+        return CLASS_TABLE[code]
+    if code not in ASTRAL_CLASSES:
+        ASTRAL_CLASSES[code] = compute_class(char)
+    return ASTRAL_CLASSES[code]
+
+def classify_char(char):
+    """Возвращаем категорию символа или None, если символ стандартный"""
+    return CLASS_NAMES[char_class(char)]
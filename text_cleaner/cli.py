@@ -0,0 +1,256 @@
+"""Командная строка: python -m text_cleaner clean/scan/batch/cache/serve"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+
+from . import instrument
+from .batch import clean_tree, write_summary
+from .cache import DEFAULT_CACHE_SIZE, ResultCache, default_cache_path
+from .core import CATEGORIES, DEFAULT_PROFILE, PROFILES
+from .parallel import PARALLEL_MIN_SIZE, analyze_file_parallel, default_workers
+from .profiles import load_profiles, load_user_profiles
+from .stream import (
+    DEFAULT_CHUNK_SIZE, analyze_byte_stream, clean_file, clean_stream, count_stream, iter_byte_chunks, iter_chunks,
+)
+
+def open_text(path):
+    """Открываем файл или стандартный ввод ('-') для чтения"""
+    if path == '-':
+        return open(sys.stdin.fileno(), 'r', encoding='utf-8', closefd=False)
+    return open(path, 'r', encoding='utf-8')
+
+def open_bytes(path):
+    """Открываем файл или стандартный ввод ('-') для чтения байтов"""
+    if path == '-':
+        return open(sys.stdin.fileno(), 'rb', closefd=False)
+    return open(path, 'rb')
+
+def cmd_clean(args):
+    """Исправляем файлы по выбранному профилю потоком, не загружая их целиком"""
+    if args.output and len(args.files) > 1:
+        print("Ошибка: --output можно указать только для одного входного файла", file=sys.stderr)
+        return 2
+    
+    status = 0
+    for path in args.files:
+        counts = Counter()
+        try:
+            if args.count_only:
+                with open_text(path) as source:
+                    counts = count_stream(iter_chunks(source, args.chunk_size), args.profile)
+            elif path != '-' and (args.in_place or args.output):
+                counts = clean_file(path, path if args.in_place else args.output, args.profile, args.chunk_size)
+            else:
+                with open_text(path) as source:
+                    for piece in clean_stream(iter_chunks(source, args.chunk_size), args.profile, counts):
+                        sys.stdout.buffer.write(piece.encode('utf-8'))
+                sys.stdout.buffer.flush()
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Не удалось обработать файл {path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        
+        if args.count_only:
+            print(f"{path}: будет исправлено символов: {sum(counts.values())}")
+        elif not args.quiet:
+            print(f"{path}: исправлено символов: {sum(counts.values())}", file=sys.stderr)
+    return status
+
+def cmd_scan(args):
+    """Считаем нестандартные символы в файлах; байты UTF-8 декодируются только в блоках не из одного ASCII"""
+    status = 0
+    reports = []
+    workers = args.jobs or default_workers()
+    for path in args.files:
+        try:
+            # Большой обычный файл делится на части, которые анализируются в нескольких процессах
+            if workers > 1 and path != '-' and os.path.isfile(path) and os.path.getsize(path) >= PARALLEL_MIN_SIZE:
+                report = analyze_file_parallel(path, workers)
+            else:
+                with open_bytes(path) as source:
+                    report = analyze_byte_stream(iter_byte_chunks(source, args.chunk_size))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Не удалось прочитать файл {path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        
+        if args.json:
+            reports.append({"file": path, **report})
+        else:
+            details = ", ".join(f"{category}: {sum(report[category].values())}" for category in CATEGORIES)
+            print(f"{path}: нестандартных символов: {report['nonstandard']} ({details})")
+    
+    if args.json:
+        json.dump(reports, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    return status
+
+def cmd_batch(args):
+    """Очищаем дерево каталогов в нескольких процессах и пишем сводку JSON"""
+    cache_path = None
+    if args.cache is not None:
+        cache_path = args.cache or default_cache_path()
+    results = clean_tree(args.source, args.output, args.profile, args.pattern, args.jobs, args.chunk_size,
+                         cache_path, args.cache_size * 1024 * 1024)
+    if args.summary == '-':
+        totals = write_summary(results, sys.stdout)
+    else:
+        with open(args.summary, 'w', encoding='utf-8') as file:
+            totals = write_summary(results, file)
+    
+    if not args.quiet:
+        cached = f", из кэша: {totals['cached']}" if cache_path is not None else ""
+        print(f"Файлов: {totals['files']}, исправлено символов: {totals['replacements']}, "
+              f"ошибок: {totals['errors']}{cached}", file=sys.stderr)
+    return 1 if totals["errors"] else 0
+
+def cmd_cache(args):
+    """Показываем или очищаем кэш результатов"""
+    with ResultCache(args.path or default_cache_path()) as cache:
+        if args.clear:
+            cache.clear()
+        stats = cache.stats()
+    if args.json:
+        json.dump({"path": cache.path, **stats}, sys.stdout, indent=2)
+        print()
+    else:
+        print(f"{cache.path}: записей: {stats['entries']}, размер: {stats['size']} байт, "
+              f"попаданий: {stats['hits']}, промахов: {stats['misses']}, вытеснено: {stats['evictions']}")
+    return 0
+
+def cmd_serve(args):
+    """Запускаем локальный сервис очистки"""
+    # Модуль сервиса импортируется только для этой команды
+    from .server import run_server
+    try:
+        run_server(args.host, args.port, args.unix, workers=args.jobs, max_concurrency=args.max_concurrency,
+                   max_queue=args.max_queue, batch_delay=args.batch_delay / 1000, batch_size=args.batch_size)
+    except (OSError, ValueError) as e:
+        print(f"Не удалось запустить сервис: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+def positive_int(value):
+    """Тип аргумента: целое число больше нуля"""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"ожидается положительное число: {value}")
+    return number
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="text_cleaner",
+        description="Поиск и замена нестандартных символов в тексте. Без команды запускается графический редактор.",
+    )
+    parser.add_argument("--profiles", metavar="FILE",
+                        help="файл профилей очистки JSON или TOML "
+                             "(по умолчанию $TEXT_CLEANER_PROFILES или ~/.config/text_cleaner/profiles.json)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="замерить время фаз и вывести сводку в stderr (или TEXT_CLEANER_INSTRUMENT=1)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="записать замеры в формате Chrome trace JSON (или TEXT_CLEANER_TRACE)")
+    parser.add_argument("--pstats", metavar="FILE",
+                        help="записать профиль cProfile для pstats (или TEXT_CLEANER_PSTATS)")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    subparsers.add_parser("gui", help="запустить графический редактор")
+    
+    clean_parser = subparsers.add_parser("clean", help="исправить подозрительные символы")
+    clean_parser.add_argument("files", nargs="*", default=["-"], help="входные файлы ('-' - стандартный ввод)")
+    clean_parser.add_argument("-p", "--profile", choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                              help=f"профиль очистки (по умолчанию {DEFAULT_PROFILE})")
+    target = clean_parser.add_mutually_exclusive_group()
+    target.add_argument("-o", "--output", help="выходной файл (по умолчанию стандартный вывод)")
+    target.add_argument("-i", "--in-place", action="store_true", help="перезаписать входные файлы")
+    target.add_argument("-n", "--count-only", action="store_true", help="только посчитать замены, не исправляя файлы")
+    clean_parser.add_argument("--chunk-size", type=positive_int, default=DEFAULT_CHUNK_SIZE,
+                              help=f"размер читаемой части в символах (по умолчанию {DEFAULT_CHUNK_SIZE})")
+    clean_parser.add_argument("-q", "--quiet", action="store_true", help="не выводить число замен")
+    clean_parser.set_defaults(func=cmd_clean)
+    
+    scan_parser = subparsers.add_parser("scan", help="найти нестандартные символы")
+    scan_parser.add_argument("files", nargs="*", default=["-"], help="входные файлы ('-' - стандартный ввод)")
+    scan_parser.add_argument("--chunk-size", type=positive_int, default=DEFAULT_CHUNK_SIZE,
+                             help=f"размер читаемой части в байтах (по умолчанию {DEFAULT_CHUNK_SIZE})")
+    scan_parser.add_argument("-j", "--jobs", type=positive_int,
+                             help="число процессов для файлов от 32 МБ (по умолчанию число ядер)")
+    scan_parser.add_argument("--json", action="store_true", help="вывести отчет в формате JSON")
+    scan_parser.set_defaults(func=cmd_scan)
+    
+    batch_parser = subparsers.add_parser("batch", help="исправить все файлы в дереве каталогов")
+    batch_parser.add_argument("source", help="корневой каталог с файлами")
+    target = batch_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("-o", "--output", help="каталог для зеркального дерева с результатом")
+    target.add_argument("-i", "--in-place", action="store_true", help="перезаписать файлы на месте")
+    batch_parser.add_argument("-p", "--profile", choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                              help=f"профиль очистки (по умолчанию {DEFAULT_PROFILE})")
+    batch_parser.add_argument("--pattern", default="*.txt", help="шаблон имен файлов (по умолчанию *.txt)")
+    batch_parser.add_argument("-j", "--jobs", type=positive_int, help="число процессов (по умолчанию число ядер)")
+    batch_parser.add_argument("--summary", default="-", help="файл сводки JSON (по умолчанию стандартный вывод)")
+    batch_parser.add_argument("--chunk-size", type=positive_int, default=DEFAULT_CHUNK_SIZE,
+                              help=f"размер читаемой части в символах (по умолчанию {DEFAULT_CHUNK_SIZE})")
+    batch_parser.add_argument("--cache", nargs="?", const="", metavar="PATH",
+                              help=f"брать неизмененные файлы из кэша результатов (по умолчанию {default_cache_path()})")
+    batch_parser.add_argument("--cache-size", type=positive_int, default=DEFAULT_CACHE_SIZE // (1024 * 1024),
+                              metavar="MB", help="предельный размер кэша в МБ (по умолчанию %(default)s)")
+    batch_parser.add_argument("-q", "--quiet", action="store_true", help="не выводить итоги")
+    batch_parser.set_defaults(func=cmd_batch)
+    
+    cache_parser = subparsers.add_parser("cache", help="показать или очистить кэш результатов")
+    cache_parser.add_argument("--path", help=f"файл кэша (по умолчанию {default_cache_path()})")
+    cache_parser.add_argument("--clear", action="store_true", help="удалить все записи и счетчики")
+    cache_parser.add_argument("--json", action="store_true", help="вывести сводку в формате JSON")
+    cache_parser.set_defaults(func=cmd_cache)
+    
+    serve_parser = subparsers.add_parser("serve", help="запустить локальный сервис очистки (HTTP)")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="адрес localhost (по умолчанию 127.0.0.1)")
+    serve_parser.add_argument("--port", type=positive_int, default=8765, help="порт (по умолчанию 8765)")
+    serve_parser.add_argument("--unix", metavar="PATH", help="слушать сокет Unix вместо TCP")
+    serve_parser.add_argument("-j", "--jobs", type=positive_int, help="число процессов (по умолчанию число ядер)")
+    serve_parser.add_argument("--max-concurrency", type=positive_int,
+                              help="одновременно обрабатываемых запросов (по умолчанию 4 на процесс)")
+    serve_parser.add_argument("--max-queue", type=positive_int, default=100,
+                              help="запросов в ожидании, сверх них - ответ 503 (по умолчанию %(default)s)")
+    serve_parser.add_argument("--batch-delay", type=float, default=0.0, metavar="MS",
+                              help="ожидание запросов для пакета в мс (по умолчанию - только запросы, "
+                                   "пришедшие одновременно)")
+    serve_parser.add_argument("--batch-size", type=positive_int, default=64,
+                              help="запросов в одном пакете (по умолчанию %(default)s)")
+    serve_parser.set_defaults(func=cmd_serve)
+    
+    return parser
+
+def main(argv=None):
+    # Профили из файла загружаются до разбора аргументов: их имена входят в варианты --profile
+    pre_parser = argparse.ArgumentParser(add_help=False)
+    pre_parser.add_argument("--profiles")
+    pre_parser.add_argument("--instrument", action="store_true")
+    pre_parser.add_argument("--trace")
+    pre_parser.add_argument("--pstats")
+    known, _ = pre_parser.parse_known_args(argv)
+    # Замеры включаются до загрузки профилей, чтобы попала и их компиляция
+    if known.instrument or known.trace or known.pstats:
+        instrument.enable(known.instrument, known.trace, known.pstats)
+    else:
+        instrument.enable_from_env()
+    try:
+        if known.profiles:
+            load_profiles(known.profiles)
+        else:
+            load_user_profiles()
+    except (OSError, ValueError) as e:
+        print(f"Не удалось загрузить профили: {e}", file=sys.stderr)
+        return 2
+    
+    args = build_parser().parse_args(argv)
+    
+    if args.command in (None, "gui"):
+        # tkinter импортируется только для графического режима
+        from .gui import main as gui_main
+        gui_main()
+        return 0
+    
+    return args.func(args)
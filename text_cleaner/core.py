@@ -0,0 +1,310 @@
+"""Классификация, очистка и анализ текста без графического интерфейса"""
+
+import heapq
+import re
+import unicodedata
+from collections import Counter
+from itertools import groupby
+
+from .charclass import CATEGORIES, CONTROL, INVISIBLE, SIMILAR, SPACE, STANDARD_CHARS, classify_char
+from . import instrument
+from .homoglyphs import fix_homoglyphs, homoglyph_runs
+from .profiles import DEFAULT_PROFILE, PROFILES, get_profile, table_counts
+
+# Серии подряд идущих нестандартных символов
+NONSTANDARD_RUN = re.compile('[^' + ''.join(re.escape(char) for char in sorted(STANDARD_CHARS)) + ']+')
+
+def find_runs(text):
+    """Перебираем серии подряд идущих нестандартных символов одной категории: (категория, начало, конец)"""
+    for match in NONSTANDARD_RUN.finditer(text):
+        run = match.group()
+        pos = match.start()
+        if len(run) == 1:
+            yield classify_char(run), pos, pos + 1
+            continue
+        for category, group in groupby(run, classify_char):
+            length = sum(1 for _ in group)
+            yield category, pos, pos + length
+            pos += length
+
+def highlight_runs(text):
+    """Серии для подсветки: нестандартные символы и омоглифы в словах другой письменности, по порядку"""
+    return heapq.merge(find_runs(text), homoglyph_runs(text), key=lambda run: run[1])
+
+def classify(text):
+    """Перебираем нестандартные символы текста: (позиция, символ, категория)"""
+    for category, start, end in find_runs(text):
+        for i in range(start, end):
+            yield i, text[i], category
+
+def count_nonstandard(text):
+    """Считаем нестандартные символы без определения их категорий"""
+    return sum(len(run) for run in NONSTANDARD_RUN.findall(text))
+
+# Серии байтов UTF-8, среди которых могут быть нестандартные символы: управляющие ASCII и все байты не-ASCII
+NONSTANDARD_BYTES = re.compile(
+    b'[' + b''.join(re.escape(bytes([code])) for code in range(128) if chr(code) not in STANDARD_CHARS)
+    + rb'\x80-\xff]+'
+)
+
+# Стандартные символы ASCII: если удалить их из байтов ASCII, останутся только нестандартные
+STANDARD_ASCII = bytes(code for code in range(128) if chr(code) in STANDARD_CHARS)
+
+# Размер блока байтов для быстрой проверки на чистый ASCII: редкие символы не-ASCII
+# заставляют декодировать только свой блок
+BYTE_BLOCK_SIZE = 4 * 1024
+
+def iter_byte_blocks(data):
+    """Делим байты UTF-8 на блоки, не разрывая многобайтовые символы: (блок, блок из одного ASCII)"""
+    start, size = 0, len(data)
+    while start < size:
+        end = min(start + BYTE_BLOCK_SIZE, size)
+        while end < size and data[end] & 0xC0 == 0x80:
+            end += 1
+        block = data[start:end]
+        start = end
+        yield block, block.isascii()
+
+def count_nonstandard_bytes(data, errors='strict'):
+    """Считаем нестандартные символы в байтах UTF-8, декодируя только блоки с байтами не-ASCII
+
+    Ошибочные байты, как и в analyze_bytes, вызывают UnicodeDecodeError; при errors='replace'
+    они заменяются на U+FFFD и считаются нестандартными символами.
+    """
+    count = 0
+    for block, is_ascii in iter_byte_blocks(data):
+        if is_ascii:
+            count += len(block.translate(None, STANDARD_ASCII))
+        else:
+            count += sum(count_nonstandard(run.decode('utf-8', errors)) for run in NONSTANDARD_BYTES.findall(block))
+    return count
+
+def index_ranges(text, runs, first_line=1):
+    """Переводим серии в индексы текстового виджета Tk: {категория: ["строка.столбец", ...]} парами"""
+    ranges = {category: [] for category in CATEGORIES}
+    line, line_start, pos = first_line, 0, 0
+    for category, start, end in runs:
+        # Серия не содержит '\n', поэтому строка определяется по ее началу
+        newlines = text.count('\n', pos, start)
+        if newlines:
+            line += newlines
+            line_start = text.rfind('\n', pos, start) + 1
+        pos = start
+        ranges[category].append(f"{line}.{start - line_start}")
+        ranges[category].append(f"{line}.{end - line_start}")
+    return ranges
+
+def offset_indexes(text, offsets, first_line=1, first_column=0):
+    """Переводим возрастающие позиции текста в индексы Tk "строка.столбец" за один проход"""
+    line, line_start, pos = first_line, -first_column, 0
+    for offset in offsets:
+        newlines = text.count('\n', pos, offset)
+        if newlines:
+            line += newlines
+            line_start = text.rfind('\n', pos, offset) + 1
+        pos = offset
+        yield f"{line}.{offset - line_start}"
+
+def common_prefix(a, b):
+    """Длина общего начала строк; сравнение срезами двоичным поиском, без цикла по символам"""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def common_suffix(a, b, limit):
+    """Длина общего конца строк, не больше limit"""
+    low, high = 0, min(len(a), len(b), limit)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:] == b[len(b) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def diff_span(old, new, offset=0):
+    """Одна правка, превращающая old в new без общего начала и конца: (начало, длина заменяемого, новый текст)"""
+    prefix = common_prefix(old, new)
+    suffix = common_suffix(old, new, min(len(old), len(new)) - prefix)
+    return offset + prefix, len(old) - prefix - suffix, new[prefix:len(new) - suffix]
+
+def edit_spans(old, new):
+    """Правки, превращающие old в new: [(начало, длина заменяемого, новый текст)] по возрастанию начала"""
+    if old == new:
+        return []
+    old_lines, new_lines = old.split('\n'), new.split('\n')
+    if len(old_lines) != len(new_lines):
+        # Замены изменили число строк: одна правка от первого до последнего отличия
+        return [diff_span(old, new)]
+    
+    # Очистка меняет строки по отдельности: правка на каждую измененную строку
+    spans = []
+    offset = 0
+    for old_line, new_line in zip(old_lines, new_lines):
+        if old_line != new_line:
+            spans.append(diff_span(old_line, new_line, offset))
+        offset += len(old_line) + 1
+    return spans
+
+def edit_indexes(text, spans, first_line=1, first_column=0):
+    """Переводим правки текста в индексы текстового виджета Tk: [(начало, конец, новый текст)]"""
+    offsets = (offset for start, length, _ in spans for offset in (start, start + length))
+    indexes = offset_indexes(text, offsets, first_line, first_column)
+    # Индексы идут парами: начало и конец каждой правки
+    return [(start, end, new_text) for (start, end), (_, _, new_text) in zip(zip(indexes, indexes), spans)]
+
+def empty_report():
+    """Отчет анализа без символов"""
+    report = {"total": 0, "nonstandard": 0}
+    for category in CATEGORIES:
+        report[category] = Counter()
+    return report
+
+def add_report(report, part):
+    """Добавляем к отчету анализ следующей части текста"""
+    report["total"] += part["total"]
+    report["nonstandard"] += part["nonstandard"]
+    for category in CATEGORIES:
+        report[category].update(part[category])
+    return report
+
+def analyze(text):
+    """Считаем нестандартные символы по категориям: {категория: {символ: количество}}"""
+    found = Counter(''.join(NONSTANDARD_RUN.findall(text)))
+    
+    report = empty_report()
+    report["total"] = len(text)
+    report["nonstandard"] = sum(found.values())
+    for char, count in found.items():
+        report[classify_char(char)][char] = count
+    return report
+
+def analyze_bytes(data, errors='strict'):
+    """Анализируем байты UTF-8 так же, как analyze(data.decode('utf-8', errors)), не декодируя блоки чистого ASCII"""
+    total = 0
+    found = []
+    for block, is_ascii in iter_byte_blocks(data):
+        if is_ascii:
+            # В ASCII нестандартны только управляющие символы: остаются после удаления стандартных байтов
+            total += len(block)
+            found.append(block.translate(None, STANDARD_ASCII).decode('ascii'))
+        else:
+            text = block.decode('utf-8', errors)
+            total += len(text)
+            found.extend(NONSTANDARD_RUN.findall(text))
+    report = analyze(''.join(found))
+    report["total"] = total
+    return report
+
+def joins_previous(char):
+    """Символ или его разложение начинается с комбинируемого знака (U+0301, ﾞ) и соединяется с предыдущим"""
+    return unicodedata.combining(char) or unicodedata.combining(unicodedata.normalize('NFKD', char)[0])
+
+def normalized_chars(text, start, end, form):
+    """Символы участка, которые меняет нормализация: сами по себе (Ａ, ﬁ) или соединяясь с предыдущим (e + U+0301)"""
+    for i in range(start, end):
+        char = text[i]
+        if unicodedata.normalize(form, char) != char:
+            yield char
+        elif i > 0 and unicodedata.combining(char) and len(unicodedata.normalize('NFC', text[i - 1] + char)) == 1:
+            yield char
+
+def normalize_runs(text, form):
+    """Нормализуем Unicode (NFC, NFKC) только серии нестандартных символов: (текст, {символ: число замен})
+
+    Стандартные символы уже нормализованы, поэтому участки из одного ASCII и кириллицы не проходят
+    через unicodedata.normalize. Если нормализованная серия начинается с комбинируемого знака,
+    он соединяется с символом перед серией (и + U+0306 → й); сам этот символ не меняется.
+    """
+    counts = Counter()
+    if text.isascii():
+        return text, counts
+    pieces = []
+    last = 0
+    for match in NONSTANDARD_RUN.finditer(text):
+        run = match.group()
+        start = match.start()
+        if unicodedata.is_normalized(form, run) and not unicodedata.combining(run[0]):
+            continue
+        normalized = unicodedata.normalize(form, run)
+        if start > last and normalized and unicodedata.combining(normalized[0]):
+            # NFC не применяет к стандартному символу совместимые разложения (№ остается №)
+            start -= 1
+            normalized = unicodedata.normalize('NFC', text[start] + normalized)
+        if normalized == text[start:match.end()]:
+            continue
+        pieces.append(text[last:start])
+        pieces.append(normalized)
+        counts.update(normalized_chars(text, match.start(), match.end(), form))
+        last = match.end()
+    if not pieces:
+        return text, counts
+    pieces.append(text[last:])
+    return ''.join(pieces), counts
+
+# Самая длинная серия комбинируемых знаков, которая удерживается до следующей части потока;
+# более длинная серия (zalgo-текст) режется, иначе она копилась бы до конца потока
+COMBINING_SPLIT_LIMIT = 256
+
+def normalize_split(text):
+    """Позиция, до которой нормализацию можно выполнить, не дожидаясь продолжения текста
+
+    Продолжение может начаться с комбинируемого знака, поэтому последний базовый символ
+    и знаки после него остаются до следующей части.
+    """
+    stop = max(0, len(text) - COMBINING_SPLIT_LIMIT)
+    split = len(text)
+    while split > stop and joins_previous(text[split - 1]):
+        split -= 1
+    if split == stop > 0 and joins_previous(text[split - 1]):
+        return len(text)
+    return max(split - 1, 0)
+
+# ' {2,}' дает тот же результат, что и ' +', но не трогает одиночные пробелы
+MULTIPLE_SPACES = re.compile(r' {2,}')
+
+def clean(text, profile=DEFAULT_PROFILE):
+    """Исправляем текст по профилю, возвращаем (текст, {символ: число замен})"""
+    rules = get_profile(profile)
+    instrument.count("chars.cleaned", len(text))
+    
+    # Нормализация идет первой: ее результат (é из e + U+0301, A из Ａ) проверяют таблицы замен
+    normalize_counts = Counter()
+    if rules["normalize"]:
+        with instrument.phase("normalize"):
+            text, normalize_counts = normalize_runs(text, rules["normalize"])
+    
+    # Омоглифы заменяются до движка: слово определяется по исходному тексту
+    homoglyph_counts = Counter()
+    if rules["homoglyphs"]:
+        with instrument.phase("homoglyphs"):
+            text, homoglyph_counts = fix_homoglyphs(text)
+    with instrument.phase("replace"):
+        text, counts = rules["engine"].apply(text)
+    count_replacements(rules, counts, homoglyph_counts, normalize_counts)
+    counts.update(homoglyph_counts)
+    counts.update(normalize_counts)
+    
+    with instrument.phase("whitespace"):
+        # Заменяем множественные пробелы на одинарные
+        if rules["collapse_spaces"]:
+            text = MULTIPLE_SPACES.sub(' ', text)
+        
+        # Убираем пробелы в начале и конце строк
+        if rules["strip_lines"]:
+            text = '\n'.join(line.strip() for line in text.split('\n'))
+    
+    return text, counts
+
+def count_replacements(rules, counts, homoglyph_counts, normalize_counts=()):
+    """Счетчики замеров: число замен по таблицам профиля, замен омоглифов и нормализации"""
+    if instrument.ENABLED:
+        instrument.count_all("replacements", table_counts(rules, counts))
+        instrument.count("replacements.homoglyphs", sum(homoglyph_counts.values()))
+        if normalize_counts:
+            instrument.count("replacements.normalize", sum(normalize_counts.values()))
@@ -0,0 +1,181 @@
+"""Определение кодировки файла по начальному фрагменту: BOM, проверка UTF-8, cp1251 или KOI8-R
+
+Проверяются только первые SAMPLE_SIZE байт; файл затем декодируется выбранным кодеком
+по блокам. Ошибочные байты не прерывают открытие: они заменяются на U+FFFD, а позиции
+замен сообщаются редактору для подсветки.
+"""
+
+import codecs
+import threading
+
+from .stream import utf8_split
+
+# Размер начального фрагмента для определения кодировки
+SAMPLE_SIZE = 256 * 1024
+
+# Метки порядка байтов: UTF-32 проверяется раньше UTF-16, ее метка LE начинается так же
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+# Кодировки, в которых байт b'\n' всегда означает перевод строки (их можно читать постранично)
+ASCII_COMPATIBLE = ('utf-8', 'cp1251', 'koi8-r')
+
+# Однобайтовые кодировки кириллицы, из которых выбирается одна по частоте букв
+CYRILLIC_ENCODINGS = ('cp1251', 'koi8-r')
+
+# Самые частые строчные буквы русского текста: в верной кодировке их среди букв больше всего
+FREQUENT_LETTERS = frozenset("оеаинтсрвлкмдпу")
+
+# Старшие байты символов UTF-16 латиницы, цифр и кириллицы; если ими занята больше чем половина
+# четных или нечетных позиций, текст без BOM считается UTF-16
+UTF16_HIGH_BYTES = bytes([0x00, 0x04])
+UTF16_SHARE = 0.5
+
+ASCII_BYTES = bytes(range(0x80))
+HIGH_BYTES = bytes(range(0x80, 0x100))
+
+# Обработчик ошибок декодирования: заменяет байты на U+FFFD, как 'replace', и запоминает позицию замены.
+# U+FFFD, уже записанные в файле, ошибками не считаются
+ERROR_HANDLER = 'text_cleaner.invalid'
+
+# Декодер, который выполняет decode в этом потоке (обработчик ошибок один на процесс)
+active = threading.local()
+
+def detect_bom(sample):
+    """Кодировка и длина метки порядка байтов в начале данных: (кодировка, длина) или (None, 0)"""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding, len(bom)
+    return None, 0
+
+def utf8_errors(sample):
+    """Число ошибочных последовательностей и символов не-ASCII во фрагменте UTF-8: (ошибки, символы)"""
+    # Фрагмент может обрываться посреди символа: неполный хвост не считается ошибкой
+    data, _ = utf8_split(sample)
+    text = data.decode('utf-8', 'replace')
+    errors = text.count('\ufffd') - data.count('\ufffd'.encode('utf-8'))
+    return errors, len(text) - len(data.translate(None, HIGH_BYTES)) - errors
+
+def cyrillic_score(sample, encoding):
+    """Число частых строчных букв русского текста во фрагменте, прочитанном в кодировке"""
+    # Байты ASCII одинаковы во всех кандидатах: сравниваются только старшие
+    high = sample.translate(None, ASCII_BYTES)
+    return sum(char in FREQUENT_LETTERS for char in high.decode(encoding, 'replace'))
+
+def detect_utf16(sample):
+    """UTF-16 без BOM по старшим байтам латиницы и кириллицы: 'utf-16-le', 'utf-16-be' или None"""
+    sample = sample[:len(sample) // 2 * 2]
+    if not sample:
+        return None
+    for encoding, high in (('utf-16-le', sample[1::2]), ('utf-16-be', sample[0::2])):
+        if len(high) - len(high.translate(None, UTF16_HIGH_BYTES)) > len(high) * UTF16_SHARE:
+            return encoding
+    return None
+
+def detect_encoding(sample):
+    """Определяем кодировку по начальному фрагменту файла: (кодировка, длина BOM)"""
+    encoding, bom_length = detect_bom(sample)
+    if encoding is not None:
+        return encoding, bom_length
+    # Латиница и кириллица в UTF-16 состоят из байтов меньше 0x80: проверка до проверки на ASCII
+    encoding = detect_utf16(sample)
+    if encoding is not None:
+        return encoding, 0
+    if sample.isascii():
+        return 'utf-8', 0
+    
+    # В тексте cp1251 или KOI8-R старшие байты почти никогда не складываются в верные
+    # последовательности UTF-8; в смешанной выгрузке UTF-8 ошибок меньше, чем верных символов
+    errors, decoded = utf8_errors(sample)
+    if errors == 0 or decoded > errors:
+        return 'utf-8', 0
+    return max(CYRILLIC_ENCODINGS, key=lambda name: cyrillic_score(sample, name)), 0
+
+class Decoder:
+    """Декодирование по частям с заменой ошибочных байтов на U+FFFD и записью позиций замен
+
+    runs - серии замен [(начало, конец)] в символах всего декодированного текста.
+    """
+    
+    def __init__(self, encoding):
+        self.encoding = encoding
+        self.decoder = codecs.getincrementaldecoder(encoding)(ERROR_HANDLER)
+        self.runs = []
+        # Символов выдано предыдущими вызовами decode
+        self.length = 0
+        # Данные текущего вызова, конец последней ошибки в них (байты) и символов до него
+        self.data = None
+        self.byte = 0
+        self.chars = 0
+    
+    def decode(self, data, final=False):
+        """Декодируем часть данных; неполный символ в конце ждет следующей части, если final ложно"""
+        self.data = None
+        active.decoder = self
+        try:
+            text = self.decoder.decode(data, final)
+        finally:
+            active.decoder = None
+        self.length += len(text)
+        return text
+    
+    def error(self, error):
+        """Запоминаем позицию ошибки: ошибки одного вызова приходят по порядку"""
+        if error.object is not self.data:
+            # Инкрементальный декодер передает кодеку хвост прошлой части вместе с новой
+            self.data, self.byte, self.chars = error.object, 0, 0
+        # Между ошибками байты декодируются без ошибок
+        pos = self.chars + len(error.object[self.byte:error.start].decode(self.encoding))
+        start = self.length + pos
+        if self.runs and self.runs[-1][1] == start:
+            self.runs[-1] = (self.runs[-1][0], start + 1)
+        else:
+            self.runs.append((start, start + 1))
+        self.byte, self.chars = error.end, pos + 1
+
+def replace_invalid(error):
+    """Обработчик ERROR_HANDLER: U+FFFD вместо ошибочных байтов, позиция - активному декодеру"""
+    if not isinstance(error, UnicodeDecodeError):
+        raise error
+    decoder = getattr(active, 'decoder', None)
+    if decoder is not None:
+        decoder.error(error)
+    return '\ufffd', error.end
+
+codecs.register_error(ERROR_HANDLER, replace_invalid)
+
+def universal_newlines(text, runs):
+    """Переводы строк '\r\n' и '\r' заменяем на '\n', как open() в текстовом режиме, и сдвигаем серии"""
+    shifted = []
+    removed = 0
+    last = 0
+    for start, end in runs:
+        # Серия состоит из U+FFFD, поэтому пара '\r\n' не пересекает ее границы
+        removed += text.count('\r\n', last, start)
+        shifted.append((start - removed, end - removed))
+        last = end
+    return text.replace('\r\n', '\n').replace('\r', '\n'), shifted
+
+def detect_newline(sample):
+    """Перевод строки файла по первому переводу в sample: '\r\n', '\r' или '\n' (и для текста без них)
+
+    sample - текст или байты кодировки, совместимой с ASCII.
+    """
+    if isinstance(sample, bytes):
+        sample = sample.decode('latin-1')
+    lf = sample.find('\n')
+    cr = sample.find('\r')
+    if cr < 0 or 0 <= lf < cr:
+        return '\n'
+    return '\r\n' if sample.startswith('\n', cr + 1) else '\r'
+
+def decode_text(data, encoding):
+    """Декодируем байты целиком с универсальными переводами строк: (текст, серии замен ошибочных байтов)"""
+    decoder = Decoder(encoding)
+    text = decoder.decode(data, final=True)
+    return universal_newlines(text, decoder.runs)
@@ -0,0 +1,84 @@
+"""Движок однопроходной замены символов"""
+
+import re
+from collections import Counter
+
+from .matcher import TrieMatcher
+
+class ReplacementEngine:
+    """Однопроходная замена символов по набору таблиц замен"""
+    
+    def __init__(self, tables):
+        self.replacements = {}
+        for table in tables:
+            for key, value in table.items():
+                # При повторе ключа срабатывает первая замена, как и при цепочке replace
+                if key not in self.replacements and key != value:
+                    self.replacements[key] = value
+        
+        # Одиночные символы - в таблицу для str.translate, многосимвольные ключи - в префиксное дерево
+        single = {k: v for k, v in self.replacements.items() if len(k) == 1}
+        multi = {k: v for k, v in self.replacements.items() if len(k) > 1}
+        
+        self.translate_table = str.maketrans(single)
+        self.single_pattern = re.compile('[' + ''.join(re.escape(k) for k in single) + ']') if single else None
+        self.multi = TrieMatcher(multi) if multi else None
+        
+        # В тексте из одного ASCII могут совпасть только ключи из ASCII
+        ascii_keys = sorted((k for k in self.replacements if k.isascii()), key=len, reverse=True)
+        self.ascii_pattern = re.compile('|'.join(re.escape(k) for k in ascii_keys)) if ascii_keys else None
+    
+    def apply(self, text, count=True):
+        """Возвращает (исправленный текст, {символ: число замен})"""
+        counts = Counter()
+        # str.isascii() не просматривает строку: текст без ключей ASCII возвращаем без проходов замены
+        if text.isascii() and (self.ascii_pattern is None or not self.ascii_pattern.search(text)):
+            return text, counts
+        if self.multi is not None:
+            text = self.multi.apply(text, counts if count else None)
+        if count and self.single_pattern is not None:
+            counts.update(self.single_pattern.findall(text))
+        return text.translate(self.translate_table), counts
+    
+    def count(self, text):
+        """Число замен {символ: число}, как у apply, но без построения исправленного текста"""
+        counts = Counter()
+        if text.isascii() and (self.ascii_pattern is None or not self.ascii_pattern.search(text)):
+            return counts
+        if self.single_pattern is not None:
+            counts.update(self.single_pattern.findall(text))
+        if self.multi is not None:
+            # Символы внутри многосимвольных ключей заменяются вместе с ключом, а не по одному;
+            # одиночные ключи в тексте замены apply тоже заменяет
+            for key, number in self.multi.count(text).items():
+                counts[key] += number
+                for char in key:
+                    if ord(char) in self.translate_table:
+                        counts[char] -= number
+                for char in self.replacements[key]:
+                    if ord(char) in self.translate_table:
+                        counts[char] += number
+            counts = +counts
+        return counts
+    
+    def safe_split(self, text):
+        """Позиция, до которой текст можно исправить, не дожидаясь его продолжения"""
+        if self.multi is None:
+            return len(text)
+        
+        # Совпадение, начавшееся до limit, целиком видно в тексте и уже не изменится
+        limit = len(text) - (self.multi.max_key_length - 1)
+        if limit <= 0:
+            return 0
+        
+        # Ищем назад позицию, которую не пересекает ни одно совпадение, и продолжаем поиск с нее
+        start = limit
+        while start > 0 and text[start - 1] in self.multi.key_chars:
+            start -= 1
+        
+        split = limit
+        for begin, end in self.multi.finditer(text, start):
+            if begin >= limit:
+                break
+            split = max(split, end)
+        return split
@@ -0,0 +1,1076 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, scrolledtext
+import os
+import unicodedata
+from itertools import islice
+
+from . import instrument
+from .background import BackgroundRunner, clean_job, read_job, scan_job
+from .core import (
+    CATEGORIES, DEFAULT_PROFILE, PROFILES, classify_char, clean, edit_indexes, edit_spans,
+    highlight_runs, index_ranges, offset_indexes,
+)
+from .encoding import ASCII_COMPATIBLE, SAMPLE_SIZE, detect_encoding
+from .lineindex import LineIndex
+from .paged import PagedFile
+from .saving import DEFAULT_FORMAT, atomic_write, encode_document
+from .vectorized import analyze, line_counts
+
+# Сколько измененных строк подсвечивается сразу; больше - поиск в рабочем потоке
+BACKGROUND_LINES = 2000
+
+# Анализ выделения читает из виджета только строки с нестандартными символами; если их больше,
+# выделение читается одним вызовом get
+SELECTION_GET_LINES = 10000
+
+# Документы длиннее этого числа строк подсвечиваются лениво: только видимая область с запасом
+LAZY_LINES = 20000
+# Запас строк выше и ниже видимой области при ленивой подсветке
+VIEWPORT_MARGIN = 200
+
+# Файлы больше этого размера открываются постранично через mmap
+PAGED_FILE_SIZE = 64 * 1024 * 1024
+
+# Как часто строка состояния показывает последние замеры (мс), если замеры включены
+TIMINGS_INTERVAL = 500
+
+class NonStandardCharHighlighter:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Блокнот с подсветкой нестандартных символов")
+        self.root.geometry("900x700")
+        
+        # Отложенная подсветка и строки, измененные с прошлой подсветки
+        self.highlight_job = None
+        self.dirty_lines = None
+        self.non_standard_count = 0
+        
+        # Число нестандартных символов по строкам и категориям, обновляется при каждой правке
+        self.line_index = LineIndex()
+        
+        # Ленивая подсветка: включена ли, какие строки сейчас подсвечены и отложенное обновление
+        self.lazy = False
+        self.tagged_lines = None
+        self.viewport_job = None
+        
+        # Файл, в который Ctrl+S сохраняет без диалога: открытый или последний сохраненный
+        self.current_file = None
+        # Кодировка, метка порядка байтов и перевод строки, в которых документ сохраняется
+        self.file_format = DEFAULT_FORMAT
+        
+        # Большой файл, открытый постранично, номер страницы в редакторе и страница,
+        # которая показывается, когда будет проиндексирована
+        self.paged = None
+        self.page = None
+        self.pending_page = 0
+        self.index_job = None
+        
+        # Задания в рабочем потоке: обработчик результата, текст ошибки и действие при правке текста
+        self.background = BackgroundRunner()
+        self.background_done = None
+        self.background_error = None
+        self.background_on_edit = None
+        self.poll_job = None
+        
+        # Настраиваем теги для подсветки
+        self.setup_highlight_tags()
+        
+        # Создаем меню
+        self.create_menu()
+        
+        # Создаем панель инструментов
+        self.create_toolbar()
+        
+        # Создаем основное окно с текстом
+        self.create_text_widget()
+        
+        # Создаем контекстное меню
+        self.create_context_menu()
+        
+        # Создаем панель информации
+        self.create_info_panel()
+        
+        # Привязываем события
+        self.bind_events()
+    
+    def setup_highlight_tags(self):
+        """Настраиваем теги для подсветки разных типов символов"""
+        # Будет переопределено после создания text_widget
+        pass
+    
+    def create_menu(self):
+        menubar = tk.Menu(self.root)
+        self.root.config(menu=menubar)
+        
+        # Меню "Файл"
+        file_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Файл", menu=file_menu)
+        file_menu.add_command(label="Новый", command=self.new_file, accelerator="Ctrl+N")
+        file_menu.add_command(label="Открыть", command=self.open_file, accelerator="Ctrl+O")
+        file_menu.add_command(label="Сохранить", command=self.save_file, accelerator="Ctrl+S")
+        file_menu.add_command(label="Сохранить как...", command=self.save_file_as, accelerator="Ctrl+Shift+S")
+        file_menu.add_separator()
+        file_menu.add_command(label="Предыдущая страница", command=self.prev_page, accelerator="Alt+PgUp")
+        file_menu.add_command(label="Следующая страница", command=self.next_page, accelerator="Alt+PgDn")
+        file_menu.add_separator()
+        file_menu.add_command(label="Выход", command=self.root.quit)
+        
+        # Меню "Правка"
+        edit_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Правка", menu=edit_menu)
+        edit_menu.add_command(label="Найти нестандартные символы", command=self.highlight_all)
+        edit_menu.add_command(label="Очистить подсветку", command=self.clear_highlights)
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Заменить нестандартные пробелы", command=self.replace_spaces)
+        edit_menu.add_command(label="Заменить ВСЕ подозрительные символы", command=self.replace_all_suspicious)
+        
+        # Меню "Справка"
+        help_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Справка", menu=help_menu)
+        help_menu.add_command(label="О программе", command=self.show_about)
+        if instrument.ENABLED:
+            help_menu.add_command(label="Замеры производительности", command=self.show_timings)
+    
+    def create_toolbar(self):
+        toolbar = ttk.Frame(self.root)
+        toolbar.pack(side=tk.TOP, fill=tk.X, padx=5, pady=2)
+        
+        ttk.Button(toolbar, text="Подсветить", command=self.highlight_all).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="Очистить", command=self.clear_highlights).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="Заменить пробелы", command=self.replace_spaces).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="Исправить ВСЕ", command=self.replace_all_suspicious).pack(side=tk.LEFT, padx=2)
+        
+        # Профиль очистки для "Исправить ВСЕ"
+        ttk.Label(toolbar, text="Профиль:").pack(side=tk.LEFT, padx=(10, 2))
+        self.profile_var = tk.StringVar(value=DEFAULT_PROFILE)
+        ttk.Combobox(toolbar, textvariable=self.profile_var, values=sorted(PROFILES),
+                     state="readonly", width=20).pack(side=tk.LEFT, padx=2)
+        
+        # Чекбокс для автоподсветки
+        self.auto_highlight = tk.BooleanVar(value=True)
+        ttk.Checkbutton(toolbar, text="Автоподсветка", variable=self.auto_highlight).pack(side=tk.LEFT, padx=10)
+    
+    def create_text_widget(self):
+        # Создаем фрейм для текста
+        text_frame = ttk.Frame(self.root)
+        text_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Текстовое поле с прокруткой
+        self.text_widget = scrolledtext.ScrolledText(
+            text_frame, 
+            wrap=tk.WORD, 
+            font=("Consolas", 12),
+            undo=True
+        )
+        self.text_widget.pack(fill=tk.BOTH, expand=True)
+        self.text_widget.configure(yscrollcommand=self.on_yscroll)
+        
+        # Настраиваем теги для подсветки после создания виджета
+        self.setup_highlight_tags_real()
+        
+        # Отслеживаем изменения текста по строкам
+        self.install_change_proxy()
+    
+    def install_change_proxy(self):
+        """Подменяем команду виджета, чтобы перехватывать вставку и удаление текста"""
+        widget = self.text_widget
+        self.widget_command = widget._w + "_orig"
+        widget.tk.call("rename", widget._w, self.widget_command)
+        widget.tk.createcommand(widget._w, self.widget_proxy)
+    
+    def widget_proxy(self, command, *args):
+        """Выполняем команду виджета и отмечаем строки, затронутые вставкой или удалением"""
+        # Ошибку Tcl из обработчика нельзя пробрасывать: tkinter прервет mainloop (как в idlelib.redirector)
+        try:
+            if command in ("insert", "delete", "replace"):
+                return self.tracked_edit(command, *args)
+            result = self.call_widget(command, *args)
+            if command == "edit" and args and args[0] in ("undo", "redo"):
+                # После отмены правки пересчитываем весь документ
+                self.line_index.reset(self.call_widget("get", "1.0", "end-1c"))
+                self.non_standard_count = self.line_index.total()
+                self.mark_dirty(1, self.line_of("end"), 0, self.line_of("end"))
+            return result
+        except tk.TclError:
+            return ""
+    
+    def tracked_edit(self, command, *args):
+        """Выполняем правку и пересчитываем нестандартные символы в затронутых строках"""
+        # Индексы вычисляются до правки: insert index text..., delete index1 ?index2?, replace index1 index2 text...
+        if command == "insert":
+            indexes = args[:1]
+        elif command == "replace":
+            indexes = args[:2]
+        elif len(args) % 2:
+            # delete с одним индексом удаляет символ после него, а это может быть перевод строки
+            indexes = args + (f"{args[-1]}+1c",)
+        else:
+            indexes = args
+        lines = [self.line_of(index) for index in indexes]
+        first, old_last = min(lines), max(lines)
+        lines_before = self.line_of("end")
+        
+        result = self.call_widget(command, *args)
+        
+        delta = self.line_of("end") - lines_before
+        new_last = max(first, old_last + delta)
+        # В индексе строки 1..end-1: индекс "end" указывает на строку после последней
+        index_last = min(old_last, lines_before - 1)
+        index_first = min(first, index_last)
+        text = self.call_widget("get", f"{index_first}.0", f"{index_last + delta}.end")
+        self.line_index.replace(index_first - 1, index_last, line_counts(text))
+        self.non_standard_count = self.line_index.total()
+        self.mark_dirty(first, old_last, delta, new_last)
+        return result
+    
+    def call_widget(self, *args):
+        """Вызываем исходную команду текстового виджета"""
+        return self.text_widget.tk.call(self.widget_command, *args)
+    
+    def line_of(self, index):
+        """Номер строки для индекса текстового виджета"""
+        return int(str(self.call_widget("index", index)).split('.')[0])
+    
+    def mark_dirty(self, first, old_last, delta, new_last):
+        """Добавляем измененные строки к ожидающим подсветки с учетом сдвига строк ниже правки"""
+        if self.dirty_lines is not None:
+            low, high = self.dirty_lines
+            if low > old_last:
+                low += delta
+            if high > old_last:
+                high += delta
+            first, new_last = min(first, low), max(new_last, high)
+        self.dirty_lines = (first, new_last)
+        
+        # Подсвеченная область ленивой подсветки сдвигается вместе со строками
+        if self.tagged_lines is not None:
+            low, high = self.tagged_lines
+            if old_last < low:
+                self.tagged_lines = (low + delta, high + delta)
+            elif low <= first and old_last <= high:
+                self.tagged_lines = (low, max(low, high + delta))
+            elif first <= high:
+                # Правка задела границу области: область подсвечивается заново при обновлении
+                self.tagged_lines = None
+        self.text_widget.event_generate("<<TextModified>>", when="tail")
+        
+        # Правка делает результат фоновой операции устаревшим
+        if self.background.busy and self.background_on_edit is not None:
+            on_edit = self.background_on_edit
+            self.cancel_background()
+            on_edit()
+    
+    def run_in_background(self, message, on_done, error_text, func, *args, on_edit=None):
+        """Запускаем задание в рабочем потоке, показываем прогресс и кнопку отмены"""
+        self.background.start(func, *args)
+        self.background_done = on_done
+        self.background_error = error_text
+        self.background_on_edit = on_edit
+        
+        self.status_var.set(message)
+        self.progress_var.set(0)
+        self.progress_bar.pack(side=tk.LEFT, padx=10)
+        self.cancel_button.pack(side=tk.LEFT)
+        if self.poll_job is None:
+            self.poll_job = self.root.after(50, self.poll_background)
+    
+    def poll_background(self):
+        """Забираем сообщения рабочего потока из очереди"""
+        self.poll_job = None
+        for kind, payload in self.background.poll():
+            if kind == "progress":
+                self.progress_var.set(payload)
+                continue
+            self.hide_progress()
+            if kind == "error":
+                messagebox.showerror("Ошибка", f"{self.background_error}:\n{payload}")
+            else:
+                self.background_done(payload)
+        if self.background.busy and self.poll_job is None:
+            self.poll_job = self.root.after(50, self.poll_background)
+    
+    def cancel_background(self):
+        """Отменяем фоновую операцию"""
+        self.background.cancel()
+        self.background_on_edit = None
+        self.hide_progress()
+        self.status_var.set("Операция отменена")
+    
+    def hide_progress(self):
+        self.progress_bar.pack_forget()
+        self.cancel_button.pack_forget()
+    
+    def setup_highlight_tags_real(self):
+        """Настраиваем теги для подсветки разных типов символов"""
+        # Невидимые символы - красный фон
+        self.text_widget.tag_config("invisible", background="#ffcccc", relief="raised")
+        
+        # Похожие символы - желтый фон
+        self.text_widget.tag_config("similar", background="#ffffcc", relief="raised")
+        
+        # Специальные пробелы - голубой фон
+        self.text_widget.tag_config("space", background="#ccffff", relief="raised")
+        
+        # Управляющие символы - розовый фон
+        self.text_widget.tag_config("control", background="#ffccff", relief="raised")
+        
+        # Недекодируемые байты файла (U+FFFD) - красный фон; тег настроен последним и перекрывает остальные
+        self.text_widget.tag_config("invalid", background="#ff8080", relief="raised")
+    
+    def create_context_menu(self):
+        """Создаем контекстное меню для правой кнопки мыши"""
+        self.context_menu = tk.Menu(self.root, tearoff=0)
+        
+        # Стандартные операции
+        self.context_menu.add_command(label="Вырезать", command=self.cut_text, accelerator="Ctrl+X")
+        self.context_menu.add_command(label="Копировать", command=self.copy_text, accelerator="Ctrl+C")
+        self.context_menu.add_command(label="Вставить", command=self.paste_text, accelerator="Ctrl+V")
+        self.context_menu.add_separator()
+        
+        # Операции с выделением
+        self.context_menu.add_command(label="Выделить все", command=self.select_all_text, accelerator="Ctrl+A")
+        self.context_menu.add_separator()
+        
+        # Специальные функции
+        self.context_menu.add_command(label="🔍 Подсветить нестандартные символы", command=self.highlight_all)
+        self.context_menu.add_command(label="🧹 Очистить подсветку", command=self.clear_highlights)
+        self.context_menu.add_separator()
+        
+        # Функции исправления
+        self.context_menu.add_command(label="🔧 Исправить ВСЕ подозрительные символы", command=self.replace_all_suspicious)
+        self.context_menu.add_command(label="📏 Заменить только пробелы", command=self.replace_spaces)
+        self.context_menu.add_separator()
+        
+        # Анализ выделенного текста
+        self.context_menu.add_command(label="📊 Анализ выделенного текста", command=self.analyze_selection)
+        self.context_menu.add_command(label="🔧 Исправить только выделенное", command=self.fix_selection)
+    
+    def create_info_panel(self):
+        info_frame = ttk.Frame(self.root)
+        info_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=5)
+        
+        # Статус бар
+        self.status_var = tk.StringVar(value="Готов")
+        self.status_label = ttk.Label(info_frame, textvariable=self.status_var)
+        self.status_label.pack(side=tk.LEFT)
+        
+        # Прогресс и отмена фоновой операции (показываются только во время работы)
+        self.progress_var = tk.DoubleVar(value=0)
+        self.progress_bar = ttk.Progressbar(info_frame, variable=self.progress_var, maximum=1.0, length=150)
+        self.cancel_button = ttk.Button(info_frame, text="Отмена", command=self.cancel_background)
+        
+        # Страница большого файла
+        self.page_var = tk.StringVar(value="")
+        ttk.Label(info_frame, textvariable=self.page_var).pack(side=tk.LEFT, padx=10)
+        
+        # Информация о символе под курсором
+        self.char_info_var = tk.StringVar(value="")
+        self.char_info_label = ttk.Label(info_frame, textvariable=self.char_info_var)
+        self.char_info_label.pack(side=tk.RIGHT)
+        
+        # Время последних фаз (только с включенными замерами)
+        self.timings_var = tk.StringVar(value="")
+        if instrument.ENABLED:
+            ttk.Label(info_frame, textvariable=self.timings_var).pack(side=tk.RIGHT, padx=10)
+            self.root.after(TIMINGS_INTERVAL, self.update_timings)
+    
+    def bind_events(self):
+        """Привязываем события"""
+        # Горячие клавиши
+        self.root.bind('<Control-n>', lambda e: self.new_file())
+        self.root.bind('<Control-o>', lambda e: self.open_file())
+        self.root.bind('<Control-s>', lambda e: self.save_file())
+        self.root.bind('<Control-S>', lambda e: self.save_file_as())
+        self.root.bind('<Alt-Prior>', lambda e: self.prev_page())
+        self.root.bind('<Alt-Next>', lambda e: self.next_page())
+        
+        # Событие изменения текста
+        self.text_widget.bind('<<TextModified>>', self.on_text_change)
+        self.text_widget.bind('<Button-1>', self.on_cursor_move)
+        self.text_widget.bind('<ButtonRelease-1>', self.on_cursor_move)
+        self.text_widget.bind('<Key>', self.on_cursor_move)
+        
+        # Контекстное меню
+        self.text_widget.bind('<Button-3>', self.show_context_menu)  # Правая кнопка мыши
+        
+        # Дополнительные горячие клавиши
+        self.root.bind('<Control-x>', lambda e: self.cut_text())
+        self.root.bind('<Control-c>', lambda e: self.copy_text())
+        self.root.bind('<Control-v>', lambda e: self.paste_text())
+        self.root.bind('<Control-a>', lambda e: self.select_all_text())
+    
+    def on_text_change(self, event=None):
+        """Обработчик изменения текста"""
+        if self.auto_highlight.get():
+            self.schedule_highlight()
+        self.update_char_info()
+    
+    def schedule_highlight(self, delay=100):
+        """Откладываем подсветку измененных строк; повторные вызовы сливаются в одно задание"""
+        if self.highlight_job is not None:
+            self.root.after_cancel(self.highlight_job)
+        self.highlight_job = self.root.after(delay, self.highlight_dirty)  # Задержка для производительности
+    
+    def on_cursor_move(self, event=None):
+        """Обработчик движения курсора"""
+        self.root.after(10, self.update_char_info)
+    
+    def update_char_info(self):
+        """Обновляем информацию о символе под курсором"""
+        try:
+            cursor_pos = self.text_widget.index(tk.INSERT)
+            char = self.text_widget.get(cursor_pos)
+            
+            if char:
+                char_info = self.get_char_info(char)
+                self.char_info_var.set(char_info)
+            else:
+                self.char_info_var.set("")
+        except:
+            self.char_info_var.set("")
+    
+    def get_char_info(self, char):
+        """Получаем информацию о символе"""
+        try:
+            unicode_point = ord(char)
+            unicode_name = unicodedata.name(char, f"U+{unicode_point:04X}")
+            category = unicodedata.category(char)
+            
+            info = f"'{char}' U+{unicode_point:04X} ({unicode_name}) [{category}]"
+            
+            if classify_char(char) is not None:
+                info += " [НЕСТАНДАРТНЫЙ]"
+            
+            return info
+        except:
+            return ""
+    
+    def highlight_all(self):
+        """Подсвечиваем все нестандартные символы (поиск выполняется в рабочем потоке)"""
+        self.dirty_lines = None
+        if self.line_of("end") > LAZY_LINES:
+            # Большой документ: теги только в видимой области, общее число берется из индекса строк
+            self.clear_highlights()
+            self.lazy = True
+            self.update_viewport()
+            self.show_count()
+            return
+        
+        self.lazy = False
+        with instrument.phase("widget_get"):
+            text = self.text_widget.get("1.0", "end-1c")
+        self.run_in_background("Поиск нестандартных символов...", self.apply_scan,
+                               "Не удалось найти нестандартные символы", scan_job, text,
+                               on_edit=self.restart_highlight)
+    
+    def apply_scan(self, result):
+        """Применяем результат поиска из рабочего потока"""
+        self.non_standard_count, ranges = result
+        self.clear_highlights()
+        self.apply_ranges(ranges)
+        self.show_count()
+    
+    def show_count(self):
+        """Показываем число нестандартных символов документа (у большого файла - всех страниц)"""
+        count = self.non_standard_count
+        if self.paged is not None and self.page is not None and self.page < len(self.paged.page_counts):
+            count += sum(self.paged.page_counts) - self.paged.page_counts[self.page]
+        self.status_var.set(f"Найдено нестандартных символов: {count}")
+    
+    def restart_highlight(self):
+        """Текст изменился во время поиска: повторяем подсветку всего документа"""
+        self.dirty_lines = (1, self.line_of("end"))
+        self.schedule_highlight()
+    
+    def highlight_dirty(self):
+        """Подсвечиваем заново только строки, измененные с прошлой подсветки"""
+        self.highlight_job = None
+        if self.dirty_lines is None:
+            return
+        first, last = self.dirty_lines
+        last = min(last, self.line_of("end") - 1)
+        
+        # Большие изменения (вставка, замена всего текста) и переход через порог ленивой подсветки
+        # обрабатываются полной подсветкой
+        if last - first > BACKGROUND_LINES or (self.line_of("end") > LAZY_LINES) != self.lazy:
+            self.highlight_all()
+            return
+        self.dirty_lines = None
+        
+        if self.lazy:
+            # Строки вне подсвеченной области будут подсвечены при прокрутке к ним
+            if self.tagged_lines is not None:
+                low, high = self.tagged_lines
+                first, last = max(first, low), min(last, high)
+            if self.tagged_lines is not None and first <= last:
+                self.retag_lines(first, last)
+            self.update_viewport()
+        else:
+            self.retag_lines(first, last)
+        
+        self.show_count()
+    
+    def retag_lines(self, first, last):
+        """Подсвечиваем строки first..last заново"""
+        start, end = f"{first}.0", f"{last}.end"
+        with instrument.phase("retag_lines", lines=last - first + 1):
+            for tag in CATEGORIES:
+                self.text_widget.tag_remove(tag, start, end)
+            text = self.text_widget.get(start, end)
+            instrument.count("chars.scanned", len(text))
+            self.apply_ranges(index_ranges(text, highlight_runs(text), first))
+    
+    def on_yscroll(self, first, last):
+        """Прокрутка текста: двигаем ползунок, при ленивой подсветке обновляем видимую область"""
+        self.text_widget.vbar.set(first, last)
+        if self.lazy and self.viewport_job is None:
+            self.viewport_job = self.root.after(20, self.update_viewport)
+    
+    def update_viewport(self):
+        """Подсвечиваем видимые строки с запасом и снимаем подсветку далеко за пределами экрана"""
+        self.viewport_job = None
+        if not self.lazy:
+            return
+        top = self.line_of("@0,0")
+        bottom = self.line_of(f"@0,{self.text_widget.winfo_height()}")
+        end_line = self.line_of("end") - 1
+        
+        old = self.tagged_lines
+        # Пока подсветка покрывает видимую область хотя бы с половиной запаса, ничего не делаем
+        if old is not None and old[0] <= max(1, top - VIEWPORT_MARGIN // 2) \
+                and old[1] >= min(end_line, bottom + VIEWPORT_MARGIN // 2):
+            return
+        low, high = max(1, top - VIEWPORT_MARGIN), min(end_line, bottom + VIEWPORT_MARGIN)
+        
+        for tag in CATEGORIES:
+            self.text_widget.tag_remove(tag, "1.0", f"{low}.0")
+            self.text_widget.tag_remove(tag, f"{high}.end", tk.END)
+        
+        # Подсвечиваем только строки, которых не было в прежней области
+        if old is None or old[1] < low or old[0] > high:
+            self.retag_lines(low, high)
+        else:
+            if low < old[0]:
+                self.retag_lines(low, old[0] - 1)
+            if high > old[1]:
+                self.retag_lines(old[1] + 1, high)
+        self.tagged_lines = (low, high)
+    
+    def apply_ranges(self, ranges):
+        """Один вызов tag_add на тип символа; тип совпадает с именем тега подсветки"""
+        with instrument.phase("tag_add"):
+            for category, indexes in ranges.items():
+                if indexes:
+                    self.text_widget.tag_add(category, *indexes)
+                    instrument.count(f"tags.{category}", len(indexes) // 2)
+    
+    def clear_highlights(self):
+        """Очищаем всю подсветку"""
+        self.lazy = False
+        self.tagged_lines = None
+        for tag in CATEGORIES:
+            self.text_widget.tag_remove(tag, "1.0", tk.END)
+        self.status_var.set("Подсветка очищена")
+    
+    def tag_invalid(self, text, runs):
+        """Подсвечиваем серии U+FFFD, заменившие недекодируемые байты; тег не снимается очисткой подсветки"""
+        self.text_widget.tag_remove("invalid", "1.0", tk.END)
+        if runs:
+            offsets = [offset for run in runs for offset in run]
+            self.text_widget.tag_add("invalid", *offset_indexes(text, offsets))
+    
+    def replace_spaces(self):
+        """Заменяем нестандартные пробелы на обычные"""
+        with instrument.phase("widget_get"):
+            text = self.text_widget.get("1.0", "end-1c")
+        
+        # Заменяем все виды нестандартных пробелов на обычный пробел
+        fixed_text, _ = clean(text, "spaces")
+        
+        if fixed_text != text:
+            self.apply_edits(text, edit_spans(text, fixed_text))
+            self.status_var.set("Нестандартные пробелы заменены на обычные")
+        else:
+            self.status_var.set("Нестандартные пробелы не найдены")
+    
+    def replace_all_suspicious(self):
+        """Заменяем ВСЕ подозрительные символы на нормальные аналоги"""
+        with instrument.phase("widget_get"):
+            text = self.text_widget.get("1.0", "end-1c")
+        
+        # Заменяем похожие символы, пробелы и невидимые символы, схлопываем пробелы и обрезаем строки
+        self.run_in_background("Исправление символов...", lambda result: self.apply_clean(text, result),
+                               "Не удалось исправить текст", clean_job, text, self.profile_var.get(),
+                               on_edit=lambda: self.status_var.set("Исправление прервано: текст изменен"))
+    
+    def apply_clean(self, original_text, result):
+        """Применяем результат очистки из рабочего потока"""
+        spans, counts = result
+        replacements_count = sum(counts.values())
+        
+        # Применяем изменения, если они есть
+        if spans:
+            self.apply_edits(original_text, spans)
+            self.status_var.set(f"Исправлено символов: {replacements_count}")
+        else:
+            self.status_var.set("Подозрительные символы не найдены")
+    
+    def apply_edits(self, text, spans, start="1.0"):
+        """Применяем правки к тексту виджета с конца, одной группой отмены; text начинается с индекса start"""
+        line, column = map(int, self.text_widget.index(start).split('.'))
+        edits = edit_indexes(text, spans, line, column)
+        
+        # Без автоматических разделителей Tk все правки отменяются одним Ctrl+Z
+        self.text_widget.config(autoseparators=False)
+        self.text_widget.edit_separator()
+        try:
+            with instrument.phase("widget_edits", edits=len(edits)):
+                # С конца: правка не сдвигает индексы правок перед ней
+                for first, last, new_text in reversed(edits):
+                    self.text_widget.replace(first, last, new_text)
+            instrument.count("edits.applied", len(edits))
+        finally:
+            self.text_widget.edit_separator()
+            self.text_widget.config(autoseparators=True)
+    
+    def update_timings(self):
+        """Показываем в строке состояния время фаз, завершенных с прошлого обновления"""
+        timings = instrument.recent()
+        if timings:
+            self.timings_var.set(timings)
+        self.root.after(TIMINGS_INTERVAL, self.update_timings)
+    
+    def show_timings(self):
+        """Показываем сводку замеров за все время работы"""
+        timings_window = tk.Toplevel(self.root)
+        timings_window.title("Замеры производительности")
+        timings_window.geometry("700x450")
+        
+        text_area = scrolledtext.ScrolledText(timings_window, wrap=tk.NONE, font=("Consolas", 10))
+        text_area.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        text_area.insert("1.0", instrument.summary())
+        text_area.config(state=tk.DISABLED)
+    
+    def show_about(self):
+        """Показываем информацию о программе"""
+        about_text = """Блокнот с подсветкой нестандартных символов
+        
+Версия: 1.0
+
+Программа предназначена для обнаружения и замены нестандартных символов в тексте, 
+которые часто появляются после копирования из ChatGPT и других источников.
+
+Возможности:
+• Подсветка невидимых и похожих символов
+• Автоматическая замена на стандартные аналоги
+• Анализ выделенного текста
+• Работа с файлами
+
+Автор: Литвинов Виталий
+Email: murkir@gmail.com
+
+© 2025 Все права защищены"""
+        
+        # Создаем окно "О программе"
+        about_window = tk.Toplevel(self.root)
+        about_window.title("О программе")
+        about_window.geometry("450x350")
+        about_window.resizable(False, False)
+        
+        # Центрируем окно относительно главного окна
+        about_window.transient(self.root)
+        about_window.grab_set()
+        
+        # Основной фрейм
+        main_frame = ttk.Frame(about_window, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Заголовок
+        title_label = ttk.Label(
+            main_frame, 
+            text="Блокнот с подсветкой нестандартных символов",
+            font=("Arial", 14, "bold")
+        )
+        title_label.pack(pady=(0, 10))
+        
+        # Текст информации
+        info_text = tk.Text(
+            main_frame,
+            wrap=tk.WORD,
+            font=("Arial", 10),
+            height=12,
+            width=50,
+            relief="flat",
+            bg=about_window.cget("bg"),
+            state=tk.DISABLED
+        )
+        info_text.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+        
+        # Вставляем текст
+        info_text.config(state=tk.NORMAL)
+        info_text.insert("1.0", about_text)
+        info_text.config(state=tk.DISABLED)
+        
+        # Кнопка закрытия
+        close_button = ttk.Button(
+            main_frame,
+            text="Закрыть",
+            command=about_window.destroy
+        )
+        close_button.pack()
+        
+        # Фокус на кнопку
+        close_button.focus()
+    
+    def show_context_menu(self, event):
+        """Показываем контекстное меню"""
+        try:
+            self.context_menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            self.context_menu.grab_release()
+    
+    def cut_text(self):
+        """Вырезаем выделенный текст"""
+        try:
+            if self.text_widget.selection_get():
+                self.text_widget.event_generate('<<Cut>>')
+        except tk.TclError:
+            pass  # Нет выделенного текста
+    
+    def copy_text(self):
+        """Копируем выделенный текст"""
+        try:
+            if self.text_widget.selection_get():
+                self.text_widget.event_generate('<<Copy>>')
+        except tk.TclError:
+            pass  # Нет выделенного текста
+    
+    def paste_text(self):
+        """Вставляем текст из буфера обмена"""
+        try:
+            self.text_widget.event_generate('<<Paste>>')
+        except tk.TclError:
+            pass
+    
+    def select_all_text(self):
+        """Выделяем весь текст"""
+        self.text_widget.tag_add(tk.SEL, "1.0", tk.END)
+        self.text_widget.mark_set(tk.INSERT, "1.0")
+        self.text_widget.see(tk.INSERT)
+    
+    def analyze_selection(self):
+        """Анализируем выделенный текст"""
+        try:
+            sel_start = self.text_widget.index(tk.SEL_FIRST)
+            sel_end = self.text_widget.index(tk.SEL_LAST)
+            
+            # Анализируем символы (большое выделение - векторно, если установлен NumPy)
+            stats = self.selection_stats(sel_start, sel_end)
+            
+            # Формируем отчет
+            report = f"Анализ выделенного текста:\n\n"
+            report += f"Всего символов: {stats['total']}\n"
+            report += f"Нестандартных символов: {stats['nonstandard']}\n\n"
+            
+            sections = [
+                ("invisible", "Невидимые символы"),
+                ("space", "Специальные пробелы"),
+                ("similar", "Похожие символы"),
+            ]
+            for category, title in sections:
+                found = stats[category]
+                if not found:
+                    continue
+                report += f"{title} ({sum(found.values())}):\n"
+                for char, count in found.most_common(10):  # Показываем максимум 10
+                    report += f"  • '{char}' (U+{ord(char):04X}) × {count}\n"
+                if len(found) > 10:
+                    report += f"  ... и еще {len(found) - 10}\n"
+                report += "\n"
+            
+            if not stats['nonstandard']:
+                report += "✅ Все символы стандартные!"
+            
+            # Показываем в отдельном окне
+            analysis_window = tk.Toplevel(self.root)
+            analysis_window.title("Анализ выделенного текста")
+            analysis_window.geometry("500x400")
+            
+            text_area = scrolledtext.ScrolledText(analysis_window, wrap=tk.WORD, font=("Consolas", 10))
+            text_area.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            text_area.insert("1.0", report)
+            text_area.config(state=tk.DISABLED)
+            
+        except tk.TclError:
+            messagebox.showinfo("Анализ", "Текст не выделен")
+    
+    def selection_stats(self, start, end):
+        """Отчет analyze для текста между индексами; строки без нестандартных символов не читаются"""
+        first, last = self.line_of(start), self.line_of(end)
+        lines = list(islice(self.line_index.nonzero_lines(first - 1, last), SELECTION_GET_LINES + 1))
+        if len(lines) > SELECTION_GET_LINES:
+            return analyze(self.text_widget.get(start, end))
+        pieces = [
+            self.text_widget.get(start if line + 1 == first else f"{line + 1}.0",
+                                 end if line + 1 == last else f"{line + 1}.end")
+            for line in lines
+        ]
+        stats = analyze(''.join(pieces))
+        stats["total"] = int(self.call_widget("count", "-chars", start, end))
+        return stats
+    
+    def fix_selection(self):
+        """Исправляем только выделенный текст"""
+        try:
+            selected_text = self.text_widget.selection_get()
+            if not selected_text:
+                messagebox.showinfo("Исправление", "Текст не выделен")
+                return
+            
+            # Получаем позицию выделения
+            sel_start = self.text_widget.index(tk.SEL_FIRST)
+            sel_end = self.text_widget.index(tk.SEL_LAST)
+            
+            # Применяем исправления только к выделенному тексту; текст берем из виджета,
+            # чтобы позиции правок точно совпадали с его содержимым
+            selected_text = self.text_widget.get(sel_start, sel_end)
+            fixed_text = self.fix_text(selected_text)
+            
+            if fixed_text != selected_text:
+                # Заменяем в выделенном тексте только исправленные участки
+                self.apply_edits(selected_text, edit_spans(selected_text, fixed_text), sel_start)
+                
+                # Выделяем исправленный текст
+                new_end = f"{sel_start}+{len(fixed_text)}c"
+                self.text_widget.tag_add(tk.SEL, sel_start, new_end)
+                
+                self.status_var.set("Выделенный текст исправлен")
+            else:
+                self.status_var.set("В выделенном тексте нет подозрительных символов")
+                
+        except tk.TclError:
+            messagebox.showinfo("Исправление", "Текст не выделен")
+    
+    def fix_text(self, text):
+        """Вспомогательная функция для исправления текста"""
+        text, _ = clean(text, "basic")
+        return text
+    
+    def new_file(self):
+        """Создаем новый файл"""
+        if messagebox.askokcancel("Новый файл", "Очистить текущий документ?"):
+            self.close_paged()
+            self.current_file = None
+            self.file_format = DEFAULT_FORMAT
+            self.text_widget.delete("1.0", tk.END)
+            self.clear_highlights()
+            self.status_var.set("Новый документ")
+    
+    def open_file(self):
+        """Открываем файл"""
+        filename = filedialog.askopenfilename(
+            title="Открыть файл",
+            filetypes=[
+                ("Текстовые файлы", "*.txt"),
+                ("Все файлы", "*.*")
+            ]
+        )
+        
+        if filename:
+            try:
+                if os.path.getsize(filename) > PAGED_FILE_SIZE:
+                    with open(filename, 'rb') as file:
+                        encoding, bom_length = detect_encoding(file.read(SAMPLE_SIZE))
+                    # Постранично читаются только кодировки, в которых строки режутся по байту b'\n'
+                    if encoding in ASCII_COMPATIBLE:
+                        self.open_paged(filename, encoding, bom_length)
+                        return
+            except OSError as e:
+                messagebox.showerror("Ошибка", f"Не удалось открыть файл:\n{str(e)}")
+                return
+            self.run_in_background(f"Открытие файла: {filename}", lambda result: self.apply_open(filename, result),
+                                   "Не удалось открыть файл", read_job, filename)
+    
+    def apply_open(self, filename, result):
+        """Показываем файл, прочитанный в рабочем потоке"""
+        content, text_format, runs = result
+        self.close_paged()
+        with instrument.phase("widget_replace"):
+            self.text_widget.delete("1.0", tk.END)
+            self.text_widget.insert("1.0", content)
+        self.tag_invalid(content, runs)
+        self.current_file = filename
+        self.file_format = text_format
+        # Подсветка запускается обработчиком изменения текста, если включена автоподсветка
+        status = f"Файл открыт: {filename} ({text_format[0]})"
+        if runs:
+            status += f", ошибок декодирования: {sum(end - start for start, end in runs)}"
+        self.status_var.set(status)
+    
+    def save_file(self):
+        """Сохраняем файл туда, откуда он открыт; новый документ - через диалог"""
+        if self.current_file is None:
+            self.save_file_as()
+        else:
+            self.write_file(self.current_file)
+    
+    def save_file_as(self):
+        """Сохраняем файл под новым именем"""
+        filename = filedialog.asksaveasfilename(
+            title="Сохранить файл",
+            defaultextension=".txt",
+            filetypes=[
+                ("Текстовые файлы", "*.txt"),
+                ("Все файлы", "*.*")
+            ]
+        )
+        
+        if filename:
+            self.write_file(filename)
+    
+    def write_file(self, filename):
+        """Сохраняем документ в формате открытого файла; если текст в его кодировке не записать - спрашиваем"""
+        text_format = self.file_format
+        try:
+            try:
+                self.write_document(filename, text_format)
+            except UnicodeEncodeError as e:
+                # В однобайтовой кодировке нет вставленного символа или U+FFFD на месте ошибочных байтов
+                if not messagebox.askyesno(
+                        "Сохранение",
+                        f"Текст нельзя сохранить в кодировке {text_format[0]}:\n{str(e)}\n\n"
+                        "Сохранить файл в UTF-8?"):
+                    self.status_var.set("Сохранение отменено")
+                    return
+                text_format = ('utf-8', b'', text_format[2])
+                self.write_document(filename, text_format)
+            self.current_file = filename
+            self.file_format = text_format
+            self.status_var.set(f"Файл сохранен: {filename} ({text_format[0]})")
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить файл:\n{str(e)}")
+    
+    def write_document(self, filename, text_format):
+        """Записываем документ атомарно: через временный файл, fsync и переименование"""
+        with instrument.phase("save"):
+            if self.paged is not None:
+                self.save_paged(filename, text_format)
+            else:
+                # "end-1c": Tk добавляет в конец текста перевод строки, которого в документе нет
+                content = self.text_widget.get("1.0", "end-1c")
+                atomic_write(filename, encode_document(content, text_format))
+    
+    def open_paged(self, filename, encoding='utf-8', bom_length=0, page=0):
+        """Открываем большой файл постранично: страница page появляется до окончания индексации"""
+        try:
+            paged = PagedFile(filename, encoding, bom_length)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Ошибка", f"Не удалось открыть файл:\n{str(e)}")
+            return
+        self.close_paged()
+        self.paged = paged
+        self.pending_page = page
+        self.current_file = filename
+        self.file_format = paged.text_format
+        self.status_var.set(f"Индексация файла: {filename}")
+        self.poll_index()
+    
+    def poll_index(self):
+        """Следим за индексацией большого файла"""
+        self.index_job = None
+        if self.paged is None:
+            return
+        if self.page is None and (self.paged.page_count > self.pending_page or self.paged.indexed.is_set()):
+            self.show_page(min(self.pending_page, max(0, self.paged.page_count - 1)))
+            self.status_var.set(f"Файл открыт: {self.paged.path} ({self.paged.encoding})")
+        self.update_page_info()
+        if self.paged.indexed.is_set():
+            self.show_count()
+        else:
+            self.index_job = self.root.after(100, self.poll_index)
+    
+    def update_page_info(self):
+        if self.paged is None or self.page is None:
+            self.page_var.set("")
+            return
+        info = f"Страница {self.page + 1} из {max(1, self.paged.page_count)}"
+        if not self.paged.indexed.is_set():
+            info += f" (индексация {self.paged.progress:.0%})"
+        self.page_var.set(info)
+    
+    def show_page(self, page):
+        """Загружаем страницу большого файла в редактор, сохранив изменения текущей"""
+        self.store_page()
+        self.page = page
+        text, runs = self.paged.decode_page(page)
+        self.text_widget.delete("1.0", tk.END)
+        self.text_widget.insert("1.0", text)
+        self.tag_invalid(text, runs)
+        self.text_widget.edit_reset()
+        self.text_widget.edit_modified(False)
+        self.text_widget.mark_set(tk.INSERT, "1.0")
+        self.text_widget.see("1.0")
+        self.update_page_info()
+    
+    def store_page(self):
+        """Запоминаем текст текущей страницы, если он изменен в редакторе"""
+        if self.paged is not None and self.page is not None and self.text_widget.edit_modified():
+            self.paged.store_page(self.page, self.text_widget.get("1.0", "end-1c"), self.non_standard_count)
+    
+    def next_page(self):
+        if self.paged is None or self.page is None:
+            return
+        if self.page + 1 < self.paged.page_count:
+            self.show_page(self.page + 1)
+        elif not self.paged.indexed.is_set():
+            self.status_var.set("Следующая страница еще индексируется")
+    
+    def prev_page(self):
+        if self.paged is not None and self.page:
+            self.show_page(self.page - 1)
+    
+    def close_paged(self):
+        """Закрываем большой файл; несохраненные изменения его страниц теряются"""
+        if self.paged is None:
+            return
+        if self.index_job is not None:
+            self.root.after_cancel(self.index_job)
+            self.index_job = None
+        self.paged.close()
+        self.paged = None
+        self.page = None
+        self.update_page_info()
+    
+    def save_paged(self, filename, text_format):
+        """Сохраняем большой файл по страницам: неизмененные страницы копируются из исходного файла
+
+        Исходный файл отображен в память и читается во время записи временного файла; перед заменой
+        отображение закрывается (файл, отображенный в память, не заменить на Windows, а на POSIX
+        редактор читал бы уже удаленный файл), после замены открывается записанный файл.
+        """
+        if not self.paged.indexed.is_set():
+            raise OSError("Файл еще индексируется, дождитесь окончания")
+        self.store_page()
+        source = self.paged
+        page = self.page or 0
+        try:
+            atomic_write(filename, source.iter_bytes(text_format), before_replace=self.close_paged)
+        except BaseException:
+            if self.paged is None:
+                # Замена не удалась после закрытия: открываем прежний файл с несохраненными правками
+                self.open_paged(source.path, source.encoding, len(source.bom), page)
+                if self.paged is not None:
+                    self.paged.modified = source.modified
+                    if self.page is not None:
+                        self.show_page(self.page)
+            raise
+        self.open_paged(filename, text_format[0], len(text_format[1]), page)
+
+def main():
+    instrument.enable_from_env()
+    root = tk.Tk()
+    app = NonStandardCharHighlighter(root)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""Похожие символы (омоглифы) в словах, где смешаны латиница и кириллица"""
+
+import heapq
+import re
+import unicodedata
+from collections import Counter
+
+from .charclass import SIMILAR
+from .tables import CYRILLIC_HOMOGLYPHS
+
+# Замены омоглифов: кириллица в латинском слове и латиница в кириллическом
+TO_LATIN = dict(CYRILLIC_HOMOGLYPHS)
+TO_CYRILLIC = {latin: cyrillic for cyrillic, latin in CYRILLIC_HOMOGLYPHS.items()}
+
+# Буквы латиницы (с диакритикой) и кириллицы
+LATIN = 'A-Za-zÀ-ÖØ-öø-ɏ'
+CYRILLIC = 'Ѐ-ӿ'
+
+def script_letters(first, last, homoglyphs):
+    """Буквы диапазона, которые не похожи на буквы другой письменности: по ним определяется письменность слова"""
+    return frozenset(
+        chr(code) for code in range(first, last + 1)
+        if unicodedata.category(chr(code)).startswith('L') and chr(code) not in homoglyphs
+    )
+
+LATIN_EVIDENCE = script_letters(0x0041, 0x024F, TO_CYRILLIC)
+CYRILLIC_EVIDENCE = script_letters(0x0400, 0x04FF, TO_LATIN)
+
+# Стыки латинской и кириллической букв: в слове без такого стыка письменности не смешаны.
+# Два выражения без альтернативы просматривают текст быстрее одного с альтернативой
+LATIN_CYRILLIC = re.compile(f'[{LATIN}][{CYRILLIC}]')
+CYRILLIC_LATIN = re.compile(f'[{CYRILLIC}][{LATIN}]')
+WORD = re.compile(r'[^\W\d_]+')
+
+# Дальше этого разрез части потока не отодвигается к началу слова: иначе текст без пробелов
+# (CJK, base64, минифицированные данные) копился бы до конца потока. Слово длиннее этого
+# режется, и омоглифы в нем исправляются без учета его другой части
+WORD_SPLIT_LIMIT = 256
+
+def mixed_words(text):
+    """Перебираем слова, в которых есть стык латиницы и кириллицы: (начало, конец)"""
+    boundaries = heapq.merge(
+        (match.start() for match in LATIN_CYRILLIC.finditer(text)),
+        (match.start() for match in CYRILLIC_LATIN.finditer(text)),
+    )
+    end = 0
+    for boundary in boundaries:
+        if boundary < end:
+            continue
+        start = boundary
+        while start > 0 and text[start - 1].isalpha():
+            start -= 1
+        end = WORD.match(text, boundary).end()
+        yield start, end
+
+def find_homoglyphs(text):
+    """Перебираем омоглифы в словах, написанных другой письменностью: (позиция, символ, замена)"""
+    for start, end in mixed_words(text):
+        word = text[start:end]
+        chars = set(word)
+        latin = not chars.isdisjoint(LATIN_EVIDENCE)
+        cyrillic = not chars.isdisjoint(CYRILLIC_EVIDENCE)
+        # Письменность слова неясна (одни омоглифы или признаки обеих): слово не трогаем
+        if latin == cyrillic:
+            continue
+        table = TO_LATIN if latin else TO_CYRILLIC
+        for i, char in enumerate(word):
+            if char in table:
+                yield start + i, char, table[char]
+
+def homoglyph_runs(text):
+    """Серии омоглифов для подсветки: (SIMILAR, начало, конец)"""
+    run_start = run_end = None
+    for pos, _, _ in find_homoglyphs(text):
+        if pos == run_end:
+            run_end += 1
+            continue
+        if run_start is not None:
+            yield SIMILAR, run_start, run_end
+        run_start, run_end = pos, pos + 1
+    if run_start is not None:
+        yield SIMILAR, run_start, run_end
+
+def fix_homoglyphs(text):
+    """Заменяем омоглифы в словах другой письменности, возвращаем (текст, {символ: число замен})"""
+    counts = Counter()
+    if text.isascii():
+        return text, counts
+    pieces = []
+    last = 0
+    for pos, char, replacement in find_homoglyphs(text):
+        pieces.append(text[last:pos])
+        pieces.append(replacement)
+        counts[char] += 1
+        last = pos + 1
+    if not counts:
+        return text, counts
+    pieces.append(text[last:])
+    return ''.join(pieces), counts
+
+def word_char(text, pos):
+    """Символ может продолжать слово: буква или цифра (WORD их подмножество) или комбинируемый знак (e + U+0301)
+
+    Проверяется один символ: WORD.match просматривал бы слово до конца на каждом шаге назад.
+    """
+    char = text[pos]
+    return char.isalnum() or unicodedata.combining(char)
+
+def word_split(text, split, limit=WORD_SPLIT_LIMIT):
+    """Отодвигаем разрез к началу слова, чтобы слово целиком попало в одну часть текста
+
+    Если слово длиннее limit символов, разрез остается на месте.
+    """
+    stop = max(0, split - limit)
+    pos = split
+    while pos > stop and word_char(text, pos - 1):
+        pos -= 1
+    if pos == stop > 0 and word_char(text, pos - 1):
+        return split
+    return pos
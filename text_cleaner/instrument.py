@@ -0,0 +1,159 @@
+"""Замеры времени и счетчики горячих путей; включаются переменной окружения или ключом командной строки
+
+TEXT_CLEANER_INSTRUMENT=1       - сводка по фазам и счетчикам в stderr при выходе (и в строке состояния редактора)
+TEXT_CLEANER_TRACE=trace.json   - события фаз в формате Chrome trace (chrome://tracing, Perfetto)
+TEXT_CLEANER_PSTATS=run.pstats  - профиль cProfile главного потока для pstats или snakeviz
+
+Выключенные замеры стоят одной проверки флага на вызов phase() и count().
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Замеры включены (меняется только через enable)
+ENABLED = False
+
+# Фаза: [число вызовов, суммарное время, наибольшее время] в секундах
+TIMINGS = {}
+COUNTERS = Counter()
+# Фазы, завершенные после последнего вызова recent(): для строки состояния редактора
+RECENT = []
+# События для Chrome trace; собираются, только если задан файл трассировки
+EVENTS = []
+
+TRACE_PATH = None
+PSTATS_PATH = None
+PROFILER = None
+
+# Фазы завершаются и в рабочих потоках редактора
+LOCK = threading.Lock()
+# Начало отсчета времени событий трассировки
+ORIGIN = time.perf_counter()
+
+NULL_PHASE = contextlib.nullcontext()
+
+class Phase:
+    """Замер одной фазы: время попадает в TIMINGS, RECENT и, при трассировке, в EVENTS"""
+    
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        elapsed = end - self.start
+        with LOCK:
+            timing = TIMINGS.setdefault(self.name, [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += elapsed
+            timing[2] = max(timing[2], elapsed)
+            RECENT.append((self.name, elapsed))
+            if TRACE_PATH is not None:
+                EVENTS.append({
+                    "name": self.name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                    "ts": (self.start - ORIGIN) * 1e6, "dur": elapsed * 1e6, "args": self.args,
+                })
+        return False
+
+def phase(name, **args):
+    """Контекст замера фазы; args попадают в событие трассировки"""
+    if not ENABLED:
+        return NULL_PHASE
+    return Phase(name, args)
+
+def count(name, value=1):
+    """Увеличиваем счетчик (символы, теги, замены, байты)"""
+    if ENABLED:
+        with LOCK:
+            COUNTERS[name] += value
+
+def count_all(prefix, counts):
+    """Увеличиваем группу счетчиков {имя: значение} с общим префиксом"""
+    if ENABLED:
+        with LOCK:
+            for name, value in counts.items():
+                COUNTERS[f"{prefix}.{name}"] += value
+
+def enable(summary=True, trace=None, pstats=None):
+    """Включаем замеры; сводка и файлы записываются при выходе из программы"""
+    global ENABLED, TRACE_PATH, PSTATS_PATH, PROFILER
+    if trace is not None:
+        TRACE_PATH = trace
+    if pstats is not None and PROFILER is None:
+        import cProfile
+        PSTATS_PATH = pstats
+        # cProfile видит только поток, в котором включен: здесь это главный поток
+        PROFILER = cProfile.Profile()
+        PROFILER.enable()
+    if not ENABLED:
+        ENABLED = True
+        atexit.register(report, summary)
+
+def enable_from_env():
+    """Включаем замеры по переменным окружения; возвращаем True, если они включены"""
+    trace = os.environ.get("TEXT_CLEANER_TRACE") or None
+    pstats = os.environ.get("TEXT_CLEANER_PSTATS") or None
+    summary = os.environ.get("TEXT_CLEANER_INSTRUMENT", "") not in ("", "0")
+    if summary or trace or pstats:
+        enable(summary, trace, pstats)
+    return ENABLED
+
+def reset():
+    """Сбрасываем накопленные замеры"""
+    with LOCK:
+        TIMINGS.clear()
+        COUNTERS.clear()
+        RECENT.clear()
+        EVENTS.clear()
+
+def recent():
+    """Фазы, завершенные после прошлого вызова, одной строкой: "widget_get 12 мс, find_runs 340 мс" """
+    with LOCK:
+        phases = {}
+        for name, elapsed in RECENT:
+            phases[name] = phases.get(name, 0.0) + elapsed
+        RECENT.clear()
+    return ", ".join(f"{name} {elapsed * 1000:.0f} мс" for name, elapsed in phases.items())
+
+def summary():
+    """Сводка по фазам и счетчикам в виде текста"""
+    with LOCK:
+        timings = sorted(TIMINGS.items(), key=lambda item: -item[1][1])
+        counters = sorted(COUNTERS.items())
+    lines = [f"{'фаза':<24} {'вызовов':>8} {'всего, мс':>11} {'среднее, мс':>12} {'макс., мс':>10}"]
+    for name, (calls, total, longest) in timings:
+        lines.append(f"{name:<24} {calls:>8} {total * 1000:>11.1f} {total / calls * 1000:>12.2f} {longest * 1000:>10.1f}")
+    if counters:
+        lines.append("")
+        lines.extend(f"{name:<36} {value:>14,}" for name, value in counters)
+    return "\n".join(lines)
+
+def write_trace(path):
+    """Записываем события фаз в формате Chrome trace"""
+    with LOCK:
+        data = {"traceEvents": EVENTS[:], "displayTimeUnit": "ms", "otherData": {"counters": dict(COUNTERS)}}
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False)
+
+def report(show_summary=True):
+    """Выводим сводку в stderr и записываем файлы трассировки и профиля"""
+    try:
+        if PROFILER is not None:
+            PROFILER.disable()
+            PROFILER.dump_stats(PSTATS_PATH)
+        if TRACE_PATH is not None:
+            write_trace(TRACE_PATH)
+    except OSError as e:
+        print(f"Не удалось записать файл замеров: {e}", file=sys.stderr)
+    if show_summary and TIMINGS:
+        print("Замеры text_cleaner:\n" + summary(), file=sys.stderr)
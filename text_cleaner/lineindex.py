@@ -0,0 +1,182 @@
+"""Индекс нестандартных символов по строкам: суммы по категориям для любого диапазона строк за O(log n)
+
+Число символов каждой категории хранится для каждой строки в блоках по BLOCK_LINES строк.
+Деревья Фенвика над блоками дают суммы по блокам и блок по номеру строки, поэтому правка
+меняет затронутые блоки и несколько узлов деревьев, а не сдвигает счетчики всех строк ниже нее.
+Деревья строятся заново, только когда правка меняет число блоков (вставка больших фрагментов).
+"""
+
+from itertools import chain
+
+from .charclass import CATEGORIES
+from .vectorized import line_counts
+
+# Строк в блоке индекса; блок, выросший вдвое, делится при следующей правке
+BLOCK_LINES = 512
+
+class FenwickTree:
+    """Дерево Фенвика: изменение значения и сумма первых i значений за O(log n)"""
+    
+    def __init__(self, values=()):
+        # Построение за O(n): каждый узел добавляет свою сумму к родителю
+        self.tree = [0]
+        self.tree.extend(values)
+        for i in range(1, len(self.tree)):
+            parent = i + (i & -i)
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[i]
+    
+    def __len__(self):
+        return len(self.tree) - 1
+    
+    def add(self, i, delta):
+        """Прибавляем delta к значению с номером i (с нуля)"""
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+    
+    def prefix(self, i):
+        """Сумма значений с номерами 0..i-1"""
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i &= i - 1
+        return total
+    
+    def find(self, target):
+        """Наименьший номер i, для которого сумма значений 0..i больше target; len(self) - таких нет
+
+        Значения должны быть неотрицательными.
+        """
+        pos = 0
+        bit = 1 << (len(self.tree) - 1).bit_length()
+        while bit:
+            step = pos + bit
+            if step < len(self.tree) and self.tree[step] <= target:
+                pos = step
+                target -= self.tree[step]
+            bit >>= 1
+        return pos
+
+class LineIndex:
+    """Счетчики нестандартных символов по строкам документа (строки с нуля)"""
+    
+    def __init__(self, text=""):
+        self.reset(text)
+    
+    def reset(self, text):
+        """Строим индекс заново по всему тексту (большой текст считается векторно, если установлен NumPy)"""
+        counts = line_counts(text)
+        self.lines = len(counts[CATEGORIES[0]])
+        self.blocks = [
+            {category: counts[category][start:start + BLOCK_LINES] for category in CATEGORIES}
+            for start in range(0, self.lines, BLOCK_LINES)
+        ]
+        self.rebuild_trees()
+    
+    def rebuild_trees(self):
+        """Деревья над блоками: число строк и сумма каждой категории по блокам"""
+        self.sizes = FenwickTree(len(block[CATEGORIES[0]]) for block in self.blocks)
+        self.totals = {
+            category: FenwickTree(sum(block[category]) for block in self.blocks) for category in CATEGORIES
+        }
+    
+    def locate(self, line):
+        """Блок строки и ее номер в блоке; для line == self.lines - позиция после последней строки"""
+        block = self.sizes.find(line)
+        if block == len(self.blocks):
+            block -= 1
+        return block, line - self.sizes.prefix(block)
+    
+    def prefix(self, category, line):
+        """Число символов категории в строках 0..line-1"""
+        if line >= self.lines:
+            return self.totals[category].prefix(len(self.blocks))
+        block, offset = self.locate(line)
+        return self.totals[category].prefix(block) + sum(self.blocks[block][category][:offset])
+    
+    def counts(self, first=0, last=None):
+        """Число нестандартных символов по категориям в строках first..last-1"""
+        if last is None:
+            last = self.lines
+        return {category: self.prefix(category, last) - self.prefix(category, first) for category in CATEGORIES}
+    
+    def total(self, first=0, last=None):
+        """Число нестандартных символов в строках first..last-1"""
+        return sum(self.counts(first, last).values())
+    
+    def replace(self, first, last, counts):
+        """Заменяем счетчики строк first..last-1 счетчиками новых строк (результат line_counts)"""
+        new_lines = len(counts[CATEGORIES[0]])
+        first_block, first_offset = self.locate(first)
+        if last > first:
+            last_block, last_offset = self.locate(last - 1)
+            last_offset += 1
+        else:
+            last_block, last_offset = first_block, first_offset
+        self.lines += new_lines - (last - first)
+        
+        if first_block == last_block:
+            block = self.blocks[first_block]
+            size = len(block[CATEGORIES[0]]) - (last_offset - first_offset) + new_lines
+            # Обычная правка: меняется один блок и по одному пути в каждом дереве
+            if 0 < size <= 2 * BLOCK_LINES:
+                for category in CATEGORIES:
+                    old = block[category][first_offset:last_offset]
+                    block[category][first_offset:last_offset] = counts[category]
+                    self.totals[category].add(first_block, sum(counts[category]) - sum(old))
+                self.sizes.add(first_block, new_lines - (last_offset - first_offset))
+                return
+        
+        # Правка задела несколько блоков, переполнила или опустошила блок: эти блоки собираются заново
+        affected = self.blocks[first_block:last_block + 1]
+        end = sum(len(block[CATEGORIES[0]]) for block in affected[:-1]) + last_offset
+        merged = {}
+        for category in CATEGORIES:
+            values = list(chain.from_iterable(block[category] for block in affected))
+            values[first_offset:end] = counts[category]
+            merged[category] = values
+        length = len(merged[CATEGORIES[0]])
+        
+        if len(affected) <= length <= len(affected) * 2 * BLOCK_LINES:
+            # Строки делятся поровну между теми же блоками: число блоков не меняется,
+            # и в деревьях обновляются только узлы затронутых блоков
+            bounds = [length * i // len(affected) for i in range(len(affected) + 1)]
+            for i, block in enumerate(affected):
+                start, stop = bounds[i], bounds[i + 1]
+                self.sizes.add(first_block + i, (stop - start) - len(block[CATEGORIES[0]]))
+                for category in CATEGORIES:
+                    values = merged[category][start:stop]
+                    self.totals[category].add(first_block + i, sum(values) - sum(block[category]))
+                    block[category] = values
+            return
+        
+        # Число блоков меняется, только если вставлено больше 2 * BLOCK_LINES строк на затронутый блок
+        # или строк осталось меньше, чем блоков: тогда деревья строятся заново за O(число блоков)
+        self.blocks[first_block:last_block + 1] = [
+            {category: merged[category][start:start + BLOCK_LINES] for category in CATEGORIES}
+            for start in range(0, length, BLOCK_LINES)
+        ]
+        self.rebuild_trees()
+    
+    def nonzero_lines(self, first=0, last=None):
+        """Перебираем строки first..last-1, в которых есть нестандартные символы; блоки без них пропускаются"""
+        last = self.lines if last is None else min(last, self.lines)
+        if first >= last:
+            return
+        block, offset = self.locate(first)
+        line = first - offset
+        while line < last and block < len(self.blocks):
+            columns = [self.blocks[block][category] for category in CATEGORIES]
+            size = len(columns[0])
+            if any(map(any, columns)):
+                stop = min(size, last - line)
+                for i, found in enumerate(map(any, zip(*columns))):
+                    if i >= stop:
+                        break
+                    if found and i >= offset:
+                        yield line + i
+            line += size
+            block += 1
+            offset = 0
@@ -0,0 +1,74 @@
+"""Поиск последовательностей символов по префиксному дереву за один проход по тексту
+
+Ключи замен (CRLF, буква со знаком ударения U+0301, лигатуры из нескольких символов) собираются
+в префиксное дерево, а дерево - в одно регулярное выражение: общие начала ключей записаны
+один раз, и re проходит дерево в C. В отличие от альтернативы из всех ключей, на каждой
+позиции проверяются не тысячи ключей, а только ветви, начатые уже совпавшими символами.
+"""
+
+import re
+from collections import Counter
+
+# Признак конца ключа в узле дерева: пустая строка не совпадает ни с одним символом
+END = ""
+
+def build_trie(keys):
+    """Префиксное дерево ключей: {символ: узел}, в узле конца ключа END: ключ"""
+    root = {}
+    for key in keys:
+        node = root
+        for char in key:
+            node = node.setdefault(char, {})
+        node[END] = key
+    return root
+
+def trie_regex(node):
+    """Регулярное выражение для поддерева: самый длинный ключ, который начинается с текущей позиции"""
+    # Листья (символы, которыми ключи заканчиваются) собираются в один класс символов
+    leaves = [char for char, child in node.items() if char != END and len(child) == 1 and END in child]
+    branches = [re.escape(char) + trie_regex(child) for char, child in node.items()
+                if char != END and not (len(child) == 1 and END in child)]
+    if leaves:
+        branches.append(re.escape(leaves[0]) if len(leaves) == 1 else '[' + ''.join(map(re.escape, leaves)) + ']')
+    if not branches:
+        return ''
+    if END not in node:
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    # Ключ кончается в этом узле, но продолжение жадное: сначала пробуется более длинный ключ
+    return '(?:' + '|'.join(branches) + ')?'
+
+class TrieMatcher:
+    """Замена и подсчет непересекающихся ключей: слева направо, на каждой позиции самый длинный ключ"""
+    
+    def __init__(self, replacements):
+        self.replacements = {k: v for k, v in replacements.items() if k}
+        self.pattern = re.compile(trie_regex(build_trie(self.replacements))) if self.replacements else None
+        self.max_key_length = max(map(len, self.replacements), default=0)
+        # Символы ключей: разрез потока внутри их серии может разрезать совпадение
+        self.key_chars = frozenset(''.join(self.replacements))
+    
+    def finditer(self, text, start=0):
+        """Перебираем совпадения: (начало, конец)"""
+        if self.pattern is None:
+            return
+        for match in self.pattern.finditer(text, start):
+            yield match.span()
+    
+    def apply(self, text, counts=None):
+        """Заменяем ключи за один проход; число замен по ключам добавляется в counts"""
+        if self.pattern is None:
+            return text
+        if counts is None:
+            return self.pattern.sub(lambda match: self.replacements[match.group()], text)
+        
+        def replace(match):
+            key = match.group()
+            counts[key] += 1
+            return self.replacements[key]
+        return self.pattern.sub(replace, text)
+    
+    def count(self, text):
+        """Число совпадений по ключам без построения нового текста"""
+        if self.pattern is None:
+            return Counter()
+        return Counter(self.pattern.findall(text))
@@ -0,0 +1,139 @@
+"""Постраничное открытие больших файлов: mmap, индекс строк в фоне и декодирование страниц по запросу"""
+
+import mmap
+import os
+import threading
+
+from . import instrument
+from .core import count_nonstandard, count_nonstandard_bytes
+from .encoding import SAMPLE_SIZE, decode_text, detect_newline
+from .saving import encode_text
+
+# Строк на странице редактора
+PAGE_LINES = 5000
+# Размер части, которой неизмененные байты копируются из отображения файла при сохранении
+COPY_BLOCK = 4 * 1024 * 1024
+
+class PagedFile:
+    """Файл, отображенный в память и разбитый на страницы по PAGE_LINES строк
+
+    Кодировка должна быть совместима с ASCII (encoding.ASCII_COMPATIBLE): страницы режутся по байту b'\n'.
+    Метка порядка байтов длиной bom_length пропускается.
+    """
+    
+    def __init__(self, path, encoding='utf-8', bom_length=0):
+        self.path = path
+        self.encoding = encoding
+        self.size = os.path.getsize(path)
+        with open(path, 'rb') as file:
+            # Файл нулевой длины отобразить в память нельзя
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        # Метка порядка байтов и перевод строки записываются при сохранении обратно
+        self.bom = self.data[:bom_length]
+        self.newline = detect_newline(self.data[bom_length:bom_length + SAMPLE_SIZE])
+        
+        # Смещения начал страниц в байтах и число нестандартных символов каждой страницы;
+        # дописываются потоком индексации, страница k готова, когда известно смещение k + 1
+        self.page_offsets = [bom_length]
+        self.page_counts = []
+        # Измененные в редакторе страницы: {номер страницы: текст}
+        self.modified = {}
+        
+        self.indexed = threading.Event()
+        self.cancelled = False
+        self.thread = threading.Thread(target=self.build_index, daemon=True)
+        self.thread.start()
+    
+    @property
+    def page_count(self):
+        """Число проиндексированных страниц"""
+        return len(self.page_offsets) - 1
+    
+    @property
+    def text_format(self):
+        """Формат файла: (кодировка, метка порядка байтов, перевод строки), как saving.DEFAULT_FORMAT"""
+        return self.encoding, self.bom, self.newline
+    
+    @property
+    def progress(self):
+        """Доля проиндексированного файла"""
+        return self.page_offsets[-1] / self.size if self.size else 1.0
+    
+    def build_index(self):
+        """Находим начала страниц и считаем нестандартные символы (в UTF-8 - прямо в байтах)"""
+        start = self.page_offsets[0]
+        while start < self.size and not self.cancelled:
+            end = start
+            for _ in range(PAGE_LINES):
+                end = self.data.find(b'\n', end) + 1
+                if not end:
+                    end = self.size
+                    break
+            if self.encoding == 'utf-8':
+                count = count_nonstandard_bytes(self.data[start:end], errors='replace')
+            else:
+                count = count_nonstandard(self.data[start:end].decode(self.encoding, 'replace'))
+            self.page_counts.append(count)
+            self.page_offsets.append(end)
+            start = end
+        self.indexed.set()
+    
+    def page_text(self, page):
+        """Текст страницы с универсальными переводами строк, как open() в текстовом режиме"""
+        return self.decode_page(page)[0]
+    
+    def decode_page(self, page):
+        """Текст страницы и серии U+FFFD, заменивших ошибочные байты: (текст, [(начало, конец)])
+
+        В измененной странице U+FFFD - уже символы текста, а не ошибки декодирования.
+        """
+        if page in self.modified:
+            return self.modified[page], []
+        if page >= self.page_count:
+            return "", []
+        # Страница заканчивается после '\n', поэтому '\r\n' не разрывается между страницами
+        return decode_text(self.data[self.page_offsets[page]:self.page_offsets[page + 1]], self.encoding)
+    
+    def store_page(self, page, text, count):
+        """Запоминаем измененный текст страницы и число нестандартных символов в нем"""
+        self.modified[page] = text
+        if page < len(self.page_counts):
+            self.page_counts[page] = count
+    
+    def iter_bytes(self, text_format=None):
+        """Перебираем байты всех страниц с учетом изменений (после окончания индексации)
+
+        По умолчанию файл сохраняется в своем формате (text_format): подряд идущие неизмененные
+        страницы копируются из отображения файла одним диапазоном, без декодирования, а их ошибочные
+        байты сохраняются как есть. Измененные страницы и все страницы при смене формата кодируются
+        заново; символ, которого нет в кодировке, вызывает UnicodeEncodeError.
+        """
+        encoding, bom, newline = text_format or self.text_format
+        raw = (encoding, bom, newline) == self.text_format
+        if bom:
+            yield bom
+        start = None
+        for page in range(max(1, self.page_count)):
+            if raw and page not in self.modified and page < self.page_count:
+                if start is None:
+                    start = self.page_offsets[page]
+                continue
+            if start is not None:
+                yield from self.copy_range(start, self.page_offsets[page])
+                start = None
+            yield from encode_text(self.page_text(page), encoding, newline=newline)
+        if start is not None:
+            yield from self.copy_range(start, self.page_offsets[self.page_count])
+    
+    def copy_range(self, start, end):
+        """Байты файла из диапазона частями по COPY_BLOCK"""
+        instrument.count("bytes.copied", end - start)
+        for pos in range(start, end, COPY_BLOCK):
+            yield self.data[pos:min(pos + COPY_BLOCK, end)]
+    
+    def close(self):
+        """Останавливаем индексацию и закрываем отображение файла"""
+        self.cancelled = True
+        self.thread.join()
+        if self.size:
+            self.data.close()
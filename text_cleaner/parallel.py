@@ -0,0 +1,149 @@
+"""Параллельный анализ одного большого документа: части в процессах, вход в общей памяти без копирования
+
+Байты UTF-8 документа кладутся в multiprocessing.shared_memory один раз; процессы получают только
+имя блока памяти и границы своей части. Части режутся по границам символов UTF-8, а серии,
+разрезанные границей, и позиции символов сводятся в общий результат после подсчета.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+from .core import add_report, empty_report
+from .vectorized import analyze, find_runs
+
+# Документы меньше этого размера (в байтах UTF-8) анализируются в одном процессе
+PARALLEL_MIN_SIZE = 32 * 1024 * 1024
+# Размер части для одного процесса; частей больше, чем процессов, чтобы они заканчивали одновременно
+PARALLEL_CHUNK_SIZE = 8 * 1024 * 1024
+
+def default_workers():
+    return os.cpu_count() or 1
+
+def chunk_bounds(buffer, size, chunk_size=PARALLEL_CHUNK_SIZE):
+    """Границы частей [(начало, конец)] в байтах; часть не начинается с середины символа UTF-8"""
+    bounds = []
+    start = 0
+    while start < size:
+        end = min(start + chunk_size, size)
+        while end < size and buffer[end] & 0xC0 == 0x80:
+            end += 1
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+def scan_chunk(name, start, end, want_runs, errors):
+    """Задача для процесса: анализ части документа из общей памяти"""
+    # Исполнители запущены этим процессом и делят с ним resource_tracker: блок удаляет только создатель
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        text = bytes(memory.buf[start:end]).decode('utf-8', errors)
+    finally:
+        memory.close()
+    return {
+        "chars": len(text),
+        "report": analyze(text),
+        "runs": find_runs(text) if want_runs else None,
+        "crlf": text.count('\r\n'),
+    }
+
+def merge_runs(runs, part, offset):
+    """Добавляем серии части со сдвигом; серия, разрезанная границей частей, снова становится одной"""
+    for category, start, end in part:
+        start, end = start + offset, end + offset
+        if runs and runs[-1][2] == start and runs[-1][0] == category:
+            runs[-1] = (category, runs[-1][1], end)
+        else:
+            runs.append((category, start, end))
+
+def scan_shared(memory, size, workers=None, want_runs=False, errors='strict', progress=None, cancelled=None,
+                chunk_size=PARALLEL_CHUNK_SIZE):
+    """Анализируем байты UTF-8 в общей памяти по частям в процессах: (отчет, серии или None, число '\\r\\n')"""
+    bounds = chunk_bounds(memory.buf, size, chunk_size)
+    workers = min(workers or default_workers(), len(bounds)) or 1
+    results = [None] * len(bounds)
+    # spawn: редактор вызывает анализ из рабочего потока, а fork процесса с потоками Tk небезопасен
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {
+            executor.submit(scan_chunk, memory.name, start, end, want_runs, errors): i
+            for i, (start, end) in enumerate(bounds)
+        }
+        pending = set(futures)
+        done_bytes = 0
+        while pending:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            if cancelled is not None and cancelled():
+                executor.shutdown(wait=False, cancel_futures=True)
+                return None
+            for future in done:
+                i = futures[future]
+                results[i] = future.result()
+                done_bytes += bounds[i][1] - bounds[i][0]
+            if done and progress is not None:
+                progress(done_bytes / size)
+    
+    # Сводим части по порядку: позиции серий сдвигаются на число символов перед частью
+    report = empty_report()
+    runs = [] if want_runs else None
+    offset = 0
+    crlf = 0
+    for (start, end), result in zip(bounds, results):
+        add_report(report, result["report"])
+        if want_runs:
+            merge_runs(runs, result["runs"], offset)
+        offset += result["chars"]
+        crlf += result["crlf"]
+        # '\r\n' на границе частей не виден ни одной из них
+        if end < size and memory.buf[end - 1] == 0x0D and memory.buf[end] == 0x0A:
+            crlf += 1
+    return report, runs, crlf
+
+def share_bytes(data):
+    """Копируем байты в новый блок общей памяти"""
+    memory = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+    memory.buf[:len(data)] = data
+    return memory
+
+def parallel_find_runs(text, workers=None, progress=None, cancelled=None, chunk_size=PARALLEL_CHUNK_SIZE):
+    """Серии нестандартных символов большого текста в нескольких процессах: (число символов, серии)
+
+    Результат совпадает с (core.count_nonstandard(text), list(core.find_runs(text))); None - анализ отменен.
+    """
+    data = text.encode('utf-8', 'surrogatepass')
+    memory = share_bytes(data)
+    try:
+        result = scan_shared(memory, len(data), workers, True, 'surrogatepass', progress, cancelled, chunk_size)
+    finally:
+        memory.close()
+        memory.unlink()
+    if result is None:
+        return None
+    report, runs, _ = result
+    return report["nonstandard"], runs
+
+def analyze_file_parallel(path, workers=None, chunk_size=PARALLEL_CHUNK_SIZE):
+    """Анализируем файл UTF-8 в нескольких процессах; результат совпадает с stream.analyze_byte_stream"""
+    size = os.path.getsize(path)
+    memory = shared_memory.SharedMemory(create=True, size=max(1, size))
+    try:
+        # Файл читается сразу в общую память, без промежуточной копии
+        with open(path, 'rb') as file:
+            view = memory.buf[:size]
+            try:
+                read = 0
+                while read < size:
+                    count = file.readinto(view[read:])
+                    if not count:
+                        break
+                    read += count
+            finally:
+                view.release()
+        report, _, crlf = scan_shared(memory, read, workers, chunk_size=chunk_size)
+    finally:
+        memory.close()
+        memory.unlink()
+    # В текстовом режиме '\r\n' читается как один символ '\n'
+    report["total"] -= crlf
+    return report
@@ -0,0 +1,243 @@
+"""Профили очистки: описания в JSON/TOML, компилируемые один раз в кэшируемый набор правил"""
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from collections import Counter
+
+from . import instrument
+from .engine import ReplacementEngine
+from .homoglyphs import TO_LATIN
+from .tables import (
+    SIMILAR_REPLACEMENTS, SPACE_CHARS, INVISIBLE_CHARS, OTHER_PROBLEMATIC,
+    BASIC_REPLACEMENTS, BASIC_SPACE_CHARS, BASIC_INVISIBLE_CHARS, LINE_ENDINGS, STRESS_MARKS,
+)
+
+# Таблицы замен, на которые ссылаются профили по имени
+TABLES = {
+    "similar": SIMILAR_REPLACEMENTS,
+    "spaces": dict.fromkeys(SPACE_CHARS, ' '),
+    "invisible": dict.fromkeys(INVISIBLE_CHARS, ''),
+    "other": OTHER_PROBLEMATIC,
+    "basic": BASIC_REPLACEMENTS,
+    "basic-spaces": dict.fromkeys(BASIC_SPACE_CHARS, ' '),
+    "basic-invisible": dict.fromkeys(BASIC_INVISIBLE_CHARS, ''),
+    "line-endings": LINE_ENDINGS,
+    "stress-marks": STRESS_MARKS,
+}
+
+# Версия правил компиляции профилей; меняется при изменении смысла полей описания
+RULES_VERSION = 2
+
+# Поля описания профиля и значения по умолчанию
+PROFILE_FIELDS = {
+    "tables": [],
+    "replacements": {},
+    "keep": [],
+    "ascii_fold": False,
+    "normalize": None,
+    "context_homoglyphs": True,
+    "collapse_spaces": False,
+    "strip_lines": False,
+}
+
+# Встроенные профили; файл пользователя может добавить новые или переопределить эти
+PROFILES = {
+    # "Исправить ВСЕ": все таблицы, схлопывание пробелов и обрезка строк
+    "all": {"tables": ["similar", "spaces", "invisible", "other"], "collapse_spaces": True, "strip_lines": True},
+    # Только нестандартные пробелы
+    "spaces": {"tables": ["spaces"]},
+    # Сокращенная версия для выделенного текста
+    "basic": {"tables": ["basic", "basic-spaces", "basic-invisible"], "collapse_spaces": True},
+    # Только удаление невидимых символов
+    "strip-invisibles-only": {"tables": ["invisible"]},
+    # Все таблицы и сведение остальных букв с диакритикой к ASCII (é → e)
+    "ascii-fold": {
+        "tables": ["similar", "spaces", "invisible", "other"], "ascii_fold": True,
+        "collapse_spaces": True, "strip_lines": True,
+    },
+    # Все таблицы после нормализации NFKC: полноширинные буквы, лигатуры и цифры в кружках - к обычным
+    "nfkc": {
+        "tables": ["similar", "spaces", "invisible", "other"], "normalize": "NFKC",
+        "collapse_spaces": True, "strip_lines": True,
+    },
+    # Все таблицы, но кириллица остается без изменений
+    "keep-cyrillic": {
+        "tables": ["similar", "spaces", "invisible", "other"], "keep": ["U+0400..U+04FF"],
+        "collapse_spaces": True, "strip_lines": True,
+    },
+}
+DEFAULT_PROFILE = "all"
+
+# Формы нормализации Unicode для поля normalize (None - без нормализации)
+NORMALIZE_FORMS = (None, "NFC", "NFKC")
+
+# Диапазон "U+0400..U+04FF" или один код "U+00A0"
+CODE_RANGE = re.compile(r'U\+([0-9A-Fa-f]{4,6})(?:\.\.U\+([0-9A-Fa-f]{4,6}))?$')
+
+# Скомпилированные профили по хэшу содержимого: одинаковые описания компилируются один раз
+COMPILED = {}
+
+def tables_digest():
+    """Хэш таблиц замен: их изменение делает прежние скомпилированные профили устаревшими"""
+    digest = hashlib.sha256()
+    for name in sorted(TABLES):
+        digest.update(json.dumps([name, sorted(TABLES[name].items())], ensure_ascii=False).encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+TABLES_DIGEST = tables_digest()
+
+def validate_profile(name, spec):
+    """Проверяем описание профиля и дополняем его значениями по умолчанию"""
+    if not isinstance(spec, dict):
+        raise ValueError(f"Профиль {name}: описание должно быть объектом")
+    unknown = set(spec) - set(PROFILE_FIELDS)
+    if unknown:
+        raise ValueError(f"Профиль {name}: неизвестные поля {', '.join(sorted(unknown))}")
+    
+    result = {**PROFILE_FIELDS, **spec}
+    # Тип поля - как у значения по умолчанию: строку вместо списка пришлось бы перебирать по символам
+    for field, default in PROFILE_FIELDS.items():
+        if isinstance(default, bool) and not isinstance(result[field], bool):
+            raise ValueError(f"Профиль {name}: {field} должно быть true или false")
+        if isinstance(default, list) and not isinstance(result[field], (list, tuple)):
+            raise ValueError(f"Профиль {name}: {field} должно быть списком")
+        if isinstance(default, dict) and not isinstance(result[field], dict):
+            raise ValueError(f"Профиль {name}: {field} должно быть объектом")
+    for table in result["tables"]:
+        if not isinstance(table, str) or table not in TABLES:
+            raise ValueError(f"Профиль {name}: неизвестная таблица {table}")
+    if result["normalize"] not in NORMALIZE_FORMS:
+        raise ValueError(f"Профиль {name}: normalize может быть {', '.join(map(str, NORMALIZE_FORMS))}")
+    if not all(isinstance(k, str) and isinstance(v, str) and k for k, v in result["replacements"].items()):
+        raise ValueError(f"Профиль {name}: замены должны быть строками")
+    for item in result["keep"]:
+        if not isinstance(item, str) or not (len(item) == 1 or CODE_RANGE.match(item)):
+            raise ValueError(f"Профиль {name}: в keep ожидается символ или диапазон U+XXXX..U+YYYY, получено {item!r}")
+    return result
+
+def profile_key(spec):
+    """Хэш содержимого профиля вместе с версией правил и таблиц"""
+    content = json.dumps([RULES_VERSION, TABLES_DIGEST, spec], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8', 'surrogatepass')).hexdigest()[:16]
+
+def kept_char(keep):
+    """Функция проверки: символ из списка keep (символы и диапазоны кодов)"""
+    chars = set()
+    ranges = []
+    for item in keep:
+        match = CODE_RANGE.match(item)
+        if match is None:
+            chars.add(item)
+        else:
+            first = int(match.group(1), 16)
+            ranges.append((first, int(match.group(2) or match.group(1), 16)))
+    return lambda char: char in chars or any(first <= ord(char) <= last for first, last in ranges)
+
+def ascii_fold_table():
+    """Замены букв с диакритикой и совместимых форм на ASCII по разложению NFKD"""
+    table = {}
+    for code in range(0x80, 0x10000):
+        char = chr(code)
+        folded = ''.join(c for c in unicodedata.normalize('NFKD', char) if not unicodedata.combining(c))
+        if folded and folded != char and folded.isascii() and folded.isprintable():
+            table[char] = folded
+    return table
+
+def compile_profile(spec, name="без имени"):
+    """Компилируем профиль в правила очистки; результат кэшируется по хэшу содержимого"""
+    spec = validate_profile(name, spec)
+    key = profile_key(spec)
+    if key in COMPILED:
+        return COMPILED[key]
+    with instrument.phase("compile_profile", profile=name):
+        COMPILED[key] = build_rules(spec, key)
+    return COMPILED[key]
+
+def build_rules(spec, key):
+    """Собираем правила очистки из проверенного описания профиля"""
+    tables = [spec["replacements"]] + [TABLES[name] for name in spec["tables"]]
+    if spec["ascii_fold"]:
+        tables.append(ascii_fold_table())
+    if spec["keep"]:
+        is_kept = kept_char(spec["keep"])
+        tables = [{k: v for k, v in table.items() if not any(map(is_kept, k))} for table in tables]
+    
+    # Кириллические омоглифы заменяются только в латинских словах (и наоборот), а не везде
+    homoglyphs = spec["context_homoglyphs"] and any(char in table for table in tables for char in TO_LATIN)
+    if homoglyphs:
+        tables = [{k: v for k, v in table.items() if k not in TO_LATIN} for table in tables]
+    
+    return {
+        "engine": ReplacementEngine(tables),
+        "homoglyphs": homoglyphs,
+        "normalize": spec["normalize"],
+        "collapse_spaces": spec["collapse_spaces"],
+        "strip_lines": spec["strip_lines"],
+        "tables": spec["tables"],
+        "key": key,
+    }
+
+def table_counts(rules, counts):
+    """Распределяем замены {символ: число} по таблицам профиля (для замеров): {таблица: число}"""
+    result = Counter()
+    for key, number in counts.items():
+        # Ключ вне таблиц пришел из собственных замен профиля или из ascii_fold
+        table = next((name for name in rules["tables"] if key in TABLES[name]), "profile")
+        result[table] += number
+    return result
+
+def profile_spec(profile):
+    """Описание профиля по имени; описание (dict) возвращается как есть"""
+    if isinstance(profile, dict):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(f"Неизвестный профиль очистки: {profile}")
+    return PROFILES[profile]
+
+def get_profile(profile):
+    """Правила очистки профиля (по имени или описанию) из кэша скомпилированных профилей"""
+    name = profile if isinstance(profile, str) else "без имени"
+    return compile_profile(profile_spec(profile), name)
+
+def read_profiles(path):
+    """Читаем описания профилей из файла JSON или TOML: {имя: описание}"""
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("Для профилей в TOML нужен Python 3.11 или новее")
+        with open(path, 'rb') as file:
+            data = tomllib.load(file)
+    else:
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: ожидается объект с профилями")
+    return {name: validate_profile(name, spec) for name, spec in data.items()}
+
+def load_profiles(path):
+    """Добавляем профили из файла к доступным, возвращаем их имена"""
+    profiles = read_profiles(path)
+    PROFILES.update(profiles)
+    return list(profiles)
+
+def user_profiles_path():
+    """Файл профилей пользователя: $TEXT_CLEANER_PROFILES или ~/.config/text_cleaner/profiles.json (.toml)"""
+    if os.environ.get("TEXT_CLEANER_PROFILES"):
+        return os.environ["TEXT_CLEANER_PROFILES"]
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    for name in ("profiles.json", "profiles.toml"):
+        path = os.path.join(base, "text_cleaner", name)
+        if os.path.exists(path):
+            return path
+    return None
+
+def load_user_profiles():
+    """Загружаем файл профилей пользователя, если он есть"""
+    path = user_profiles_path()
+    if path is None:
+        return []
+    return load_profiles(path)
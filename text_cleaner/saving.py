@@ -0,0 +1,91 @@
+"""Атомарное сохранение: запись во временный файл большими блоками, fsync и переименование
+
+На диске всегда лежит либо прежний файл, либо новый целиком: сбой посреди записи оставляет
+только временный файл рядом с целевым, а при ошибке временный файл удаляется.
+"""
+
+import os
+import stat
+import tempfile
+
+from . import instrument
+
+# Буфер записи: мелкие части (страницы, блоки текста) уходят в систему крупными вызовами write
+WRITE_BUFFER = 4 * 1024 * 1024
+# Текст кодируется частями этой длины, чтобы не держать в памяти вторую копию документа целиком
+ENCODE_BLOCK = 1024 * 1024
+
+def read_umask():
+    """Текущая маска прав процесса; os.umask умеет только заменять ее, поэтому читается один раз при импорте"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+# Маска прав для новых файлов: переключать ее при каждом сохранении нельзя - она общая для всех потоков
+UMASK = read_umask()
+
+# Формат файла: (кодировка, метка порядка байтов, перевод строки); новые документы - UTF-8 без метки с '\n'
+DEFAULT_FORMAT = ('utf-8', b'', '\n')
+
+def encode_text(text, encoding='utf-8', size=ENCODE_BLOCK, newline='\n'):
+    """Перебираем байты текста частями по size символов, заменяя '\n' на newline"""
+    for start in range(0, len(text), size):
+        block = text[start:start + size]
+        if newline != '\n':
+            block = block.replace('\n', newline)
+        yield block.encode(encoding)
+
+def encode_document(text, text_format=DEFAULT_FORMAT, size=ENCODE_BLOCK):
+    """Перебираем байты текста в формате файла: метка порядка байтов, затем текст в его кодировке
+
+    Символ, которого нет в кодировке, вызывает UnicodeEncodeError.
+    """
+    encoding, bom, newline = text_format
+    if bom:
+        yield bom
+    yield from encode_text(text, encoding, size, newline)
+
+def file_mode(path):
+    """Права для нового файла: как у заменяемого файла, для нового - по umask, как у open()"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~UMASK
+
+def sync_directory(directory):
+    """Сбрасываем на диск запись каталога о переименовании (только POSIX)"""
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def atomic_write(path, blocks, before_replace=None):
+    """Записываем байты из blocks во временный файл и заменяем им path; возвращаем число байт
+
+    before_replace() вызывается после записи временного файла, перед заменой: например, чтобы
+    закрыть отображение заменяемого файла в память.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".text_cleaner-", suffix=".tmp")
+    written = 0
+    try:
+        with open(fd, 'wb', buffering=WRITE_BUFFER) as file:
+            for block in blocks:
+                file.write(block)
+                written += len(block)
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp создает файл с правами 0600
+        os.chmod(tmp_path, file_mode(path))
+        if before_replace is not None:
+            before_replace()
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    sync_directory(directory)
+    instrument.count("bytes.written", written)
+    return written
@@ -0,0 +1,501 @@
+"""Локальный сервис очистки: HTTP на asyncio поверх TCP (только localhost) или сокета Unix
+
+POST /clean?profile=all   - текст UTF-8 в теле, в ответе исправленный текст (X-Replacements - число замен)
+POST /analyze             - текст UTF-8 в теле, в ответе отчет JSON, как у scan --json
+GET  /stats               - число запросов, ошибок и задержки p50/p99 по конечным точкам
+GET  /health              - проверка, что сервис работает
+
+Небольшие тела запросов собираются в пакеты и обрабатываются в пуле процессов одной задачей.
+Большие тела и тела с Transfer-Encoding: chunked обрабатываются потоком: ответ отдается частями
+по мере чтения запроса, следующая часть читается только после отправки предыдущей.
+"""
+
+import asyncio
+import codecs
+import ipaddress
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from .core import DEFAULT_PROFILE, add_report, analyze_bytes, clean, empty_report
+from .profiles import get_profile, profile_spec
+from .stream import StreamCleaner, replace_piece, utf8_split
+
+DEFAULT_PORT = 8765
+
+# Тела не больше этого размера собираются в пакеты, большие обрабатываются потоком
+BATCH_BODY_SIZE = 64 * 1024
+# Сколько ждать других запросов для пакета (с) и сколько запросов собирать в один пакет;
+# при нуле в пакет попадают запросы, прочитанные за одну итерацию цикла событий
+DEFAULT_BATCH_DELAY = 0
+DEFAULT_BATCH_SIZE = 64
+# Размер части тела, читаемой из сокета при потоковой обработке
+STREAM_CHUNK_SIZE = 256 * 1024
+# Предельный размер строки запроса с заголовками
+MAX_HEAD_SIZE = 64 * 1024
+# Сколько последних задержек хранится для расчета перцентилей
+LATENCY_WINDOW = 10000
+
+class HttpError(Exception):
+    """Ошибка запроса: ответ с кодом status и текстом сообщения"""
+    
+    def __init__(self, status, message=""):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+class StreamAborted(Exception):
+    """Ошибка после начала потокового ответа"""
+
+def item_result(func, *args):
+    """Результат одного входа пакета: (результат, None) или (None, ошибка)
+
+    Ошибка одного входа (тело не в UTF-8) не должна становиться ошибкой остальных запросов пакета.
+    """
+    try:
+        return func(*args), None
+    except Exception as e:
+        return None, e
+
+def clean_batch(texts, spec):
+    """Задача для процесса: очищаем пакет текстов по профилю, [((текст, число замен), ошибка)]"""
+    return [item_result(clean, text, spec) for text in texts]
+
+def analyze_batch(blocks, spec=None):
+    """Задача для процесса: анализируем пакет тел запросов в байтах UTF-8, [(отчет, ошибка)]"""
+    return [item_result(analyze_bytes, data) for data in blocks]
+
+def replace_task(piece, spec):
+    """Задача для процесса: замены в части потока (пробелы и строки обрабатываются в сервере)"""
+    return replace_piece(get_profile(spec), piece)
+
+def percentile(values, fraction):
+    """Перцентиль по ближайшему рангу"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class Batcher:
+    """Собираем небольшие запросы в пакеты: одна задача пула процессов на пакет"""
+    
+    def __init__(self, executor, delay=DEFAULT_BATCH_DELAY, size=DEFAULT_BATCH_SIZE):
+        self.executor = executor
+        self.delay = delay
+        self.size = size
+        # (функция, ключ профиля) -> (описание профиля, [(вход, future)])
+        self.pending = {}
+    
+    async def submit(self, func, spec, item):
+        """Добавляем вход в пакет и ждем его результат"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (func, get_profile(spec)["key"] if spec is not None else None)
+        if key not in self.pending:
+            self.pending[key] = (spec, [])
+            loop.call_later(self.delay, self.flush, key)
+        batch = self.pending[key][1]
+        batch.append((item, future))
+        if len(batch) >= self.size:
+            self.flush(key)
+        return await future
+    
+    def flush(self, key):
+        """Отправляем накопленный пакет в пул процессов"""
+        if key not in self.pending:
+            return
+        spec, batch = self.pending.pop(key)
+        func = key[0]
+        try:
+            task = asyncio.get_running_loop().run_in_executor(self.executor, func, [item for item, _ in batch], spec)
+        except Exception as e:
+            # Пул не принимает задачи (BrokenProcessPool, остановлен): иначе запросы пакета ждали бы вечно
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        task.add_done_callback(lambda task: self.resolve(task, batch))
+    
+    @staticmethod
+    def resolve(task, batch):
+        """Раздаем результаты пакета ожидающим запросам; ошибка входа достается только его запросу"""
+        error = asyncio.CancelledError() if task.cancelled() else task.exception()
+        if error is not None:
+            # Задача пакета не выполнилась целиком (например, процесс пула завершился)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), (result, item_error) in zip(batch, task.result()):
+            if future.done():
+                continue
+            if item_error is not None:
+                future.set_exception(item_error)
+            else:
+                future.set_result(result)
+
+class CleaningServer:
+    """HTTP/1.1 сервер очистки с пулом процессов, пакетами и ограничением числа одновременных запросов"""
+    
+    def __init__(self, workers=None, max_concurrency=None, max_queue=100,
+                 batch_delay=DEFAULT_BATCH_DELAY, batch_size=DEFAULT_BATCH_SIZE):
+        workers = workers or os.cpu_count() or 1
+        # spawn: при fork процессы пула, создаваемые при первом запросе, наследовали бы сокет слушателя
+        # и соединение первого клиента, и клиент с Connection: close не получал бы конец ответа
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.batcher = Batcher(self.executor, batch_delay, batch_size)
+        # Одновременно обрабатывается не больше max_concurrency запросов, ждут не больше max_queue
+        self.max_concurrency = max_concurrency or workers * 4
+        self.max_queue = max_queue
+        self.semaphore = None
+        self.waiting = 0
+        # Конечная точка -> последние задержки (с), число запросов и ошибок
+        self.latencies = {}
+        self.requests = {}
+        self.errors = {}
+    
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+        """Запускаем сервер на localhost или на сокете Unix"""
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, unix_path, limit=MAX_HEAD_SIZE)
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEAD_SIZE)
+    
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def handle_connection(self, reader, writer):
+        """Обрабатываем запросы соединения по очереди (keep-alive), пока клиент его не закроет"""
+        try:
+            while True:
+                try:
+                    request = await read_head(reader)
+                except HttpError as e:
+                    await send_response(writer, e.status, str(e).encode('utf-8'), close=True)
+                    break
+                if request is None:
+                    break
+                method, path, query, headers = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if not await self.handle_request(reader, writer, method, path, query, headers, keep_alive):
+                    break
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def handle_request(self, reader, writer, method, path, query, headers, keep_alive):
+        """Выполняем запрос и записываем задержку; возвращаем False, если соединение нужно закрыть"""
+        endpoint = f"{method} {path}"
+        routes = {
+            "POST /clean": self.handle_clean,
+            "POST /analyze": self.handle_analyze,
+            "GET /stats": self.handle_stats,
+            "GET /health": self.handle_health,
+        }
+        if endpoint not in routes:
+            status = HTTPStatus.NOT_FOUND if path not in {route.split()[1] for route in routes} \
+                else HTTPStatus.METHOD_NOT_ALLOWED
+            await send_response(writer, status, status.phrase.encode('utf-8'), close=True)
+            return False
+        
+        start = time.perf_counter()
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        try:
+            if method == "POST":
+                # Очередь ограничена: при перегрузке отвечаем сразу, не читая тело
+                if self.waiting >= self.max_queue and self.semaphore.locked():
+                    raise HttpError(HTTPStatus.SERVICE_UNAVAILABLE, "Сервер перегружен, повторите запрос позже")
+                self.waiting += 1
+                try:
+                    await self.semaphore.acquire()
+                finally:
+                    self.waiting -= 1
+                try:
+                    if headers.get("expect", "").lower() == "100-continue":
+                        writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                    await routes[endpoint](reader, writer, query, headers, keep_alive)
+                finally:
+                    self.semaphore.release()
+            else:
+                await routes[endpoint](reader, writer, query, headers, keep_alive)
+        except HttpError as e:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+            # Тело запроса могло остаться непрочитанным: соединение закрываем
+            await send_response(writer, e.status, str(e).encode('utf-8'), close=True)
+            return False
+        except StreamAborted as e:
+            # Ответ уже начат: об ошибке можно сообщить только разрывом соединения
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+            if not isinstance(e.__cause__, (HttpError, UnicodeDecodeError, ConnectionError)):
+                log_error(endpoint, e.__cause__)
+            return False
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # Клиент закрыл соединение: отвечать некому
+            raise
+        except Exception as e:
+            # Сбой сервера или пула процессов (например, BrokenProcessPool): клиент получает 500, а не разрыв
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+            log_error(endpoint, e)
+            await send_response(writer, HTTPStatus.INTERNAL_SERVER_ERROR,
+                                HTTPStatus.INTERNAL_SERVER_ERROR.phrase.encode('utf-8'), close=True)
+            return False
+        finally:
+            self.latencies.setdefault(endpoint, deque(maxlen=LATENCY_WINDOW)).append(time.perf_counter() - start)
+        return True
+    
+    async def run(self, func, *args):
+        """Выполняем функцию в пуле процессов"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+    
+    async def handle_clean(self, reader, writer, query, headers, keep_alive):
+        """Очищаем тело запроса: небольшое - в пакете с другими, большое - потоком"""
+        try:
+            spec = profile_spec(query.get("profile", [DEFAULT_PROFILE])[0])
+            get_profile(spec)
+        except ValueError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, str(e))
+        
+        if not is_small(headers):
+            await self.stream_clean(reader, writer, headers, spec)
+            return
+        body = await read_body(reader, headers)
+        try:
+            text = body.decode('utf-8')
+        except UnicodeDecodeError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Тело запроса не в UTF-8: {e}")
+        text, counts = await self.batcher.submit(clean_batch, spec, text)
+        await send_response(writer, HTTPStatus.OK, text.encode('utf-8'),
+                            headers={"X-Replacements": sum(counts.values())}, close=not keep_alive)
+    
+    async def stream_clean(self, reader, writer, headers, spec):
+        """Очищаем тело потоком: замены в пуле процессов, пробелы и строки - с состоянием потока здесь"""
+        cleaner = StreamCleaner(spec)
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        started = False
+        
+        async def send(piece, final=False):
+            nonlocal started
+            if piece:
+                piece, counts = await self.run(replace_task, piece, spec)
+                cleaner.counts.update(counts)
+            piece = cleaner.whitespace(piece, final)
+            # Заголовок ответа уходит с первой непустой частью: до нее об ошибке можно ответить кодом
+            if not started and (piece or final):
+                writer.write(response_head(HTTPStatus.OK, {
+                    "Content-Type": "text/plain; charset=utf-8", "Transfer-Encoding": "chunked",
+                    "Trailer": "X-Replacements",
+                }))
+                started = True
+            if piece:
+                data = piece.encode('utf-8')
+                writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            # Пока клиент не прочитал ответ, следующая часть запроса не читается
+            await writer.drain()
+        
+        try:
+            async for block in iter_body(reader, headers):
+                await send(cleaner.split(decoder.decode(block)))
+            await send(cleaner.split(decoder.decode(b'', final=True)))
+            await send(cleaner.rest(), final=True)
+        except (UnicodeDecodeError, HttpError) as e:
+            if started:
+                raise StreamAborted() from e
+            if isinstance(e, HttpError):
+                raise
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Тело запроса не в UTF-8: {e}")
+        except Exception as e:
+            if started:
+                raise StreamAborted() from e
+            raise
+        writer.write(b"0\r\nX-Replacements: %d\r\n\r\n" % sum(cleaner.counts.values()))
+        await writer.drain()
+    
+    async def handle_analyze(self, reader, writer, query, headers, keep_alive):
+        """Анализируем тело запроса: небольшое - в пакете с другими, большое - по частям"""
+        try:
+            if is_small(headers):
+                report = await self.batcher.submit(analyze_batch, None, await read_body(reader, headers))
+            else:
+                report = empty_report()
+                tail = b''
+                async for block in iter_body(reader, headers):
+                    block, tail = utf8_split(tail + block)
+                    if block:
+                        add_report(report, await self.run(analyze_bytes, block))
+                if tail:
+                    add_report(report, await self.run(analyze_bytes, tail))
+        except UnicodeDecodeError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Тело запроса не в UTF-8: {e}")
+        body = json.dumps(report, ensure_ascii=False).encode('utf-8')
+        await send_response(writer, HTTPStatus.OK, body, "application/json; charset=utf-8", close=not keep_alive)
+    
+    async def handle_stats(self, reader, writer, query, headers, keep_alive):
+        body = json.dumps(self.stats(), ensure_ascii=False, indent=2).encode('utf-8')
+        await send_response(writer, HTTPStatus.OK, body, "application/json; charset=utf-8", close=not keep_alive)
+    
+    async def handle_health(self, reader, writer, query, headers, keep_alive):
+        await send_response(writer, HTTPStatus.OK, b"ok", close=not keep_alive)
+    
+    def stats(self):
+        """Число запросов, ошибок и задержки p50/p99 (мс) по конечным точкам"""
+        result = {}
+        for endpoint, latencies in sorted(self.latencies.items()):
+            result[endpoint] = {
+                "requests": self.requests.get(endpoint, 0),
+                "errors": self.errors.get(endpoint, 0),
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+                "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            }
+        return result
+
+def is_small(headers):
+    """Тело известной длины, достаточно небольшое для пакета"""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        return False
+    return parse_length(headers) <= BATCH_BODY_SIZE
+
+def parse_length(headers):
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Неверный Content-Length")
+    if length < 0:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Неверный Content-Length")
+    return length
+
+async def read_head(reader):
+    """Читаем строку запроса и заголовки: (метод, путь, параметры, заголовки) или None, если клиент закрыл соединение"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise HttpError(HTTPStatus.BAD_REQUEST)
+    except asyncio.LimitOverrunError:
+        raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+    
+    lines = head.decode('latin-1').split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST)
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    url = urlsplit(target)
+    return method, url.path, parse_qs(url.query), headers
+
+async def read_line(reader):
+    """Строка тела chunked (размер части, заголовок после тела); строка длиннее MAX_HEAD_SIZE - ошибка запроса"""
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Слишком длинная строка в теле запроса")
+
+async def iter_body(reader, headers):
+    """Читаем тело запроса частями: по Content-Length или Transfer-Encoding: chunked"""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            line = await read_line(reader)
+            try:
+                size = int(line.split(b";")[0], 16)
+            except ValueError:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Неверный размер части тела")
+            if size == 0:
+                # Заголовки после тела не используются
+                while (await read_line(reader)) not in (b"\r\n", b""):
+                    pass
+                return
+            while size > 0:
+                data = await reader.read(min(size, STREAM_CHUNK_SIZE))
+                if not data:
+                    raise asyncio.IncompleteReadError(b"", size)
+                size -= len(data)
+                yield data
+            await reader.readexactly(2)
+        return
+    
+    remaining = parse_length(headers)
+    while remaining > 0:
+        data = await reader.read(min(remaining, STREAM_CHUNK_SIZE))
+        if not data:
+            raise asyncio.IncompleteReadError(b"", remaining)
+        remaining -= len(data)
+        yield data
+
+async def read_body(reader, headers):
+    """Читаем тело запроса целиком"""
+    return b"".join([data async for data in iter_body(reader, headers)])
+
+def response_head(status, headers):
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+async def send_response(writer, status, body=b"", content_type="text/plain; charset=utf-8", headers=None, close=False):
+    """Отправляем ответ с телом известной длины"""
+    head = {"Content-Type": content_type, "Content-Length": len(body), **(headers or {})}
+    if close:
+        head["Connection"] = "close"
+    writer.write(response_head(status, head) + body)
+    await writer.drain()
+
+def log_error(endpoint, error):
+    """Пишем в stderr непредвиденную ошибку запроса с трассировкой"""
+    print(f"{endpoint}: ошибка сервера: {error!r}", file=sys.stderr)
+    traceback.print_exception(error, file=sys.stderr)
+
+def check_local(host):
+    """Сервис работает только на localhost: другие адреса не принимаются"""
+    if host == "localhost":
+        return
+    try:
+        loopback = ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        loopback = False
+    if not loopback:
+        raise ValueError(f"Сервис слушает только localhost, а не {host}")
+
+async def serve(server, host, port, unix_path):
+    """Принимаем соединения до SIGINT или SIGTERM"""
+    listener = await server.start(host, port, unix_path)
+    address = unix_path or f"http://{host}:{port}"
+    print(f"Сервис очистки: {address} (остановка - Ctrl+C)", file=sys.stderr)
+    
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows: остановка по Ctrl+C через KeyboardInterrupt
+            pass
+    async with listener:
+        await stop.wait()
+
+def run_server(host="127.0.0.1", port=DEFAULT_PORT, unix_path=None, **options):
+    """Запускаем сервис до Ctrl+C и выводим задержки по конечным точкам"""
+    if unix_path is None:
+        check_local(host)
+    server = CleaningServer(**options)
+    try:
+        asyncio.run(serve(server, host, port, unix_path))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        if unix_path is not None and os.path.exists(unix_path):
+            os.unlink(unix_path)
+    for endpoint, stats in server.stats().items():
+        print(f"{endpoint}: запросов: {stats['requests']}, ошибок: {stats['errors']}, "
+              f"p50: {stats['p50_ms']} мс, p99: {stats['p99_ms']} мс", file=sys.stderr)
@@ -0,0 +1,225 @@
+"""Потоковая очистка и анализ больших файлов с постоянным расходом памяти"""
+
+import os
+from collections import Counter
+
+from . import instrument
+from .core import (
+    DEFAULT_PROFILE, MULTIPLE_SPACES, add_report, analyze_bytes, count_replacements, empty_report,
+    normalize_runs, normalize_split,
+)
+from .homoglyphs import fix_homoglyphs, word_split
+from .profiles import get_profile
+from .saving import atomic_write
+
+# Размер части текста, читаемой за один раз (в символах)
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+class StreamCleaner:
+    """Очистка текста по частям; результат совпадает с core.clean для всего текста"""
+    
+    def __init__(self, profile=DEFAULT_PROFILE):
+        self.rules = get_profile(profile)
+        self.engine = self.rules["engine"]
+        self.counts = Counter()
+        
+        # Хвост входа, который может оказаться началом многосимвольной замены
+        self.pending = ""
+        # Последний выданный символ был пробелом (для схлопывания пробелов на стыке)
+        self.last_space = False
+        # Позиция в начале строки и отложенные пробелы в конце незавершенной строки
+        self.at_line_start = True
+        self.held_whitespace = ""
+    
+    def feed(self, chunk):
+        """Принимаем очередную часть текста, возвращаем готовую часть результата"""
+        return self._process(self.split(chunk))
+    
+    def finish(self):
+        """Обрабатываем остаток текста в конце потока"""
+        return self._process(self.rest(), final=True)
+    
+    def split(self, chunk):
+        """Добавляем часть текста, возвращаем начало, которое уже не изменит продолжение потока"""
+        self.pending += chunk
+        text = self.pending
+        if self.rules["normalize"]:
+            # Последний символ может получить комбинируемый знак из следующей части
+            text = text[:normalize_split(text)]
+        split = self.engine.safe_split(text)
+        if self.rules["homoglyphs"]:
+            split = word_split(self.pending, split)
+        piece, self.pending = self.pending[:split], self.pending[split:]
+        return piece
+    
+    def rest(self):
+        """Забираем остаток текста в конце потока"""
+        piece, self.pending = self.pending, ""
+        return piece
+    
+    def _process(self, piece, final=False):
+        """Исправляем часть текста, которую уже не затронет продолжение потока"""
+        if piece:
+            piece, counts = replace_piece(self.rules, piece)
+            self.counts.update(counts)
+        return self.whitespace(piece, final)
+    
+    def whitespace(self, piece, final=False):
+        """Схлопываем пробелы и обрезаем строки части, уже прошедшей замены (final - последняя часть)"""
+        if piece:
+            with instrument.phase("whitespace"):
+                if self.rules["collapse_spaces"]:
+                    piece = self._collapse_spaces(piece)
+                if self.rules["strip_lines"]:
+                    piece = self._strip_lines(piece)
+        if final:
+            # Конец текста завершает последнюю строку: отложенные пробелы отбрасываются
+            self.held_whitespace = ""
+        return piece
+    
+    def _collapse_spaces(self, piece):
+        """Заменяем множественные пробелы на одинарные с учетом стыка частей"""
+        if self.last_space:
+            piece = piece.lstrip(' ')
+        if piece:
+            self.last_space = piece.endswith(' ')
+        return MULTIPLE_SPACES.sub(' ', piece)
+    
+    def _strip_lines(self, piece):
+        """Убираем пробелы в начале и конце строк с учетом стыка частей"""
+        lines = piece.split('\n')
+        result = [self._continue_line(lines[0])]
+        if len(lines) > 1:
+            # Строка завершилась: отложенные пробелы в ее конце отбрасываются
+            self.held_whitespace = ""
+            result.extend(line.strip() for line in lines[1:-1])
+            self.at_line_start = True
+            result.append(self._continue_line(lines[-1]))
+        return '\n'.join(result)
+    
+    def _continue_line(self, segment):
+        """Продолжаем текущую строку; пробелы в ее конце откладываем до следующей части"""
+        if self.at_line_start:
+            segment = segment.lstrip()
+            if not segment:
+                return ""
+            self.at_line_start = False
+        
+        stripped = segment.rstrip()
+        if not stripped:
+            self.held_whitespace += segment
+            return ""
+        result = self.held_whitespace + stripped
+        self.held_whitespace = segment[len(stripped):]
+        return result
+
+def replace_piece(rules, piece):
+    """Замены омоглифов и таблиц профиля в части текста; не зависят от состояния потока: (текст, число замен)"""
+    instrument.count("chars.cleaned", len(piece))
+    normalize_counts = {}
+    if rules["normalize"]:
+        with instrument.phase("normalize"):
+            piece, normalize_counts = normalize_runs(piece, rules["normalize"])
+    homoglyph_counts = {}
+    if rules["homoglyphs"]:
+        with instrument.phase("homoglyphs"):
+            piece, homoglyph_counts = fix_homoglyphs(piece)
+    with instrument.phase("replace"):
+        piece, counts = rules["engine"].apply(piece)
+    count_replacements(rules, counts, homoglyph_counts, normalize_counts)
+    counts.update(homoglyph_counts)
+    counts.update(normalize_counts)
+    return piece, counts
+
+def count_piece(rules, piece):
+    """Число замен в части текста, как у replace_piece, без построения исправленного текста"""
+    normalize_counts = {}
+    if rules["normalize"]:
+        # Таблицы замен проверяют уже нормализованный текст; меняются только серии нестандартных символов
+        piece, normalize_counts = normalize_runs(piece, rules["normalize"])
+    homoglyph_counts = {}
+    if rules["homoglyphs"]:
+        # Таблицы замен, как в replace_piece, проверяют текст с уже исправленными омоглифами:
+        # исправление меняет символы, с которых начинаются многосимвольные замены
+        piece, homoglyph_counts = fix_homoglyphs(piece)
+    counts = rules["engine"].count(piece)
+    counts.update(homoglyph_counts)
+    counts.update(normalize_counts)
+    return counts
+
+def iter_chunks(file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Читаем открытый текстовый файл частями"""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+def iter_byte_chunks(file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Читаем двоичный файл частями, не разрывая многобайтовые символы UTF-8"""
+    tail = b''
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        chunk, tail = utf8_split(tail + chunk)
+        if chunk:
+            yield chunk
+    if tail:
+        yield tail
+
+def utf8_split(data):
+    """Делим байты на полные символы UTF-8 и последний символ, который может быть неполным: (начало, хвост)"""
+    cut = len(data)
+    if data and data[-1] >= 0x80:
+        cut -= 1
+        while cut > 0 and len(data) - cut < 4 and data[cut] & 0xC0 == 0x80:
+            cut -= 1
+    return data[:cut], data[cut:]
+
+def clean_stream(chunks, profile=DEFAULT_PROFILE, counts=None):
+    """Генератор: очищаем последовательность частей текста, число замен добавляется в counts"""
+    cleaner = StreamCleaner(profile)
+    for chunk in chunks:
+        piece = cleaner.feed(chunk)
+        if piece:
+            yield piece
+    piece = cleaner.finish()
+    if piece:
+        yield piece
+    if counts is not None:
+        counts.update(cleaner.counts)
+
+def count_stream(chunks, profile=DEFAULT_PROFILE):
+    """Считаем замены в последовательности частей текста, не исправляя его: {символ: число}"""
+    cleaner = StreamCleaner(profile)
+    counts = Counter()
+    for chunk in chunks:
+        counts.update(count_piece(cleaner.rules, cleaner.split(chunk)))
+    counts.update(count_piece(cleaner.rules, cleaner.rest()))
+    return counts
+
+def analyze_byte_stream(chunks):
+    """Анализируем байты UTF-8 по частям; результат совпадает с core.analyze для файла в текстовом режиме"""
+    report = empty_report()
+    last = b''
+    for chunk in chunks:
+        with instrument.phase("analyze_bytes"):
+            part = analyze_bytes(chunk)
+        instrument.count("bytes.scanned", len(chunk))
+        # В текстовом режиме '\r\n' читается как один символ '\n'
+        part["total"] -= chunk.count(b'\r\n') + (last.endswith(b'\r') and chunk.startswith(b'\n'))
+        last = chunk
+        add_report(report, part)
+    return report
+
+def clean_file(src, dst, profile=DEFAULT_PROFILE, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Очищаем файл потоком; dst может совпадать с src. Возвращаем число замен по символам"""
+    counts = Counter()
+    with open(src, 'r', encoding='utf-8') as source:
+        # Размер берется до записи: при dst == src файл заменяется очищенным
+        size = os.fstat(source.fileno()).st_size
+        pieces = clean_stream(iter_chunks(source, chunk_size), profile, counts)
+        atomic_write(dst, (piece.encode('utf-8') for piece in pieces))
+    instrument.count("bytes.read", size)
+    return counts
@@ -0,0 +1,218 @@
+"""Таблицы символов и замен"""
+
+# Таблицы замен для "Исправить ВСЕ". Порядок таблиц и ключей важен:
+# движок замен применяет их так же, как последовательные str.replace.
+
+# Словарь замен для похожих символов
+SIMILAR_REPLACEMENTS = {
+    # Кириллические буквы, похожие на латинские
+    'а': 'a', 'е': 'e', 'о': 'o', 'р': 'p', 'с': 'c', 'у': 'y', 'х': 'x',
+    'А': 'A', 'В': 'B', 'Е': 'E', 'К': 'K', 'М': 'M', 'Н': 'H', 'О': 'O', 
+    'Р': 'P', 'С': 'C', 'Т': 'T', 'У': 'Y', 'Х': 'X',
+    
+    # Специальные кавычки и тире
+    '"': '"', '"': '"', ''': "'", ''': "'", '‚': ',', '„': '"',
+    '‹': '<', '›': '>', '«': '"', '»': '"',
+    '—': '-', '–': '-', '−': '-', '‒': '-', '―': '-',
+    
+    # Специальные символы
+    '…': '...', '№': 'No.', '§': 'S', '¶': 'P',
+    '©': '(c)', '®': '(r)', '™': '(tm)', '℠': '(sm)',
+    '°': 'deg', '±': '+/-', '×': 'x', '÷': '/', '·': '*',
+    '‰': '%', '‱': '%', '℃': 'C', '℉': 'F',
+    
+    # Дроби
+    '½': '1/2', '⅓': '1/3', '¼': '1/4', '¾': '3/4', '⅕': '1/5',
+    '⅖': '2/5', '⅗': '3/5', '⅘': '4/5', '⅙': '1/6', '⅚': '5/6',
+    '⅛': '1/8', '⅜': '3/8', '⅝': '5/8', '⅞': '7/8', '⅐': '1/7',
+    '⅑': '1/9', '⅒': '1/10',
+    
+    # Надстрочные и подстрочные цифры
+    '⁰': '0', '¹': '1', '²': '2', '³': '3', '⁴': '4', '⁵': '5',
+    '⁶': '6', '⁷': '7', '⁸': '8', '⁹': '9',
+    '₀': '0', '₁': '1', '₂': '2', '₃': '3', '₄': '4', '₅': '5',
+    '₆': '6', '₇': '7', '₈': '8', '₉': '9',
+    
+    # Стрелки
+    '→': '->', '←': '<-', '↑': '^', '↓': 'v', '↕': '<->',
+    '⇒': '=>', '⇐': '<=', '↔': '<->', '⇔': '<=>', 
+    '⟵': '<-', '⟶': '->', '⟷': '<->', '⟸': '<=', '⟹': '=>',
+    '↗': '^>', '↘': 'v>', '↙': '<v', '↖': '<^',
+    '➡': '->', '⬅': '<-', '⬆': '^', '⬇': 'v',
+    
+    # Математические символы
+    '≤': '<=', '≥': '>=', '≠': '!=', '≈': '~=', '≡': '===',
+    '∞': 'inf', '√': 'sqrt', '∑': 'sum', '∏': 'prod',
+    '∫': 'integral', '∂': 'd', '∆': 'delta', '∇': 'nabla',
+    '∈': 'in', '∉': 'not in', '∋': 'contains', '⊂': 'subset',
+    '⊃': 'superset', '⊆': 'subseteq', '⊇': 'superseteq',
+    '∪': 'union', '∩': 'intersect', '∅': 'empty',
+    '⊕': 'xor', '⊗': 'tensor', '⊙': 'dot',
+    '∧': 'and', '∨': 'or', '¬': 'not', '∀': 'forall', '∃': 'exists',
+    
+    # Греческие буквы
+    'α': 'alpha', 'β': 'beta', 'γ': 'gamma', 'δ': 'delta', 'ε': 'epsilon',
+    'ζ': 'zeta', 'η': 'eta', 'θ': 'theta', 'ι': 'iota', 'κ': 'kappa',
+    'λ': 'lambda', 'μ': 'mu', 'ν': 'nu', 'ξ': 'xi', 'ο': 'omicron',
+    'π': 'pi', 'ρ': 'rho', 'σ': 'sigma', 'τ': 'tau', 'υ': 'upsilon',
+    'φ': 'phi', 'χ': 'chi', 'ψ': 'psi', 'ω': 'omega',
+    'Α': 'Alpha', 'Β': 'Beta', 'Γ': 'Gamma', 'Δ': 'Delta', 'Ε': 'Epsilon',
+    'Ζ': 'Zeta', 'Η': 'Eta', 'Θ': 'Theta', 'Ι': 'Iota', 'Κ': 'Kappa',
+    'Λ': 'Lambda', 'Μ': 'Mu', 'Ν': 'Nu', 'Ξ': 'Xi', 'Ο': 'Omicron',
+    'Π': 'Pi', 'Ρ': 'Rho', 'Σ': 'Sigma', 'Τ': 'Tau', 'Υ': 'Upsilon',
+    'Φ': 'Phi', 'Χ': 'Chi', 'Ψ': 'Psi', 'Ω': 'Omega',
+    
+    # Символы валют
+    '€': 'EUR', '£': 'GBP', '¥': 'JPY', '¢': 'cent', '₽': 'RUB',
+    '₴': 'UAH', '₨': 'Rs', '₹': 'Rs', '₩': 'Won', '₪': 'NIS',
+    
+    # Дополнительные символы
+    '☑': '[x]', '☐': '[ ]', '✓': 'v', '✗': 'x', '✘': 'x',
+    '★': '*', '☆': '*', '♦': 'diamond', '♠': 'spade',
+    '♣': 'club', '♥': 'heart', '♪': 'note', '♫': 'notes',
+    '†': '+', '‡': '++', '•': '*', '◦': 'o', '‣': '>',
+    '▪': '*', '▫': 'o', '▲': '^', '▼': 'v', '◄': '<', '►': '>',
+    '∙': '*', '∘': 'o', '⋅': '*', '⋆': '*', '⋄': 'diamond',
+    
+    # Римские цифры
+    'Ⅰ': 'I', 'Ⅱ': 'II', 'Ⅲ': 'III', 'Ⅳ': 'IV', 'Ⅴ': 'V',
+    'Ⅵ': 'VI', 'Ⅶ': 'VII', 'Ⅷ': 'VIII', 'Ⅸ': 'IX', 'Ⅹ': 'X',
+    'ⅰ': 'i', 'ⅱ': 'ii', 'ⅲ': 'iii', 'ⅳ': 'iv', 'ⅴ': 'v',
+    'ⅵ': 'vi', 'ⅶ': 'vii', 'ⅷ': 'viii', 'ⅸ': 'ix', 'ⅹ': 'x',
+}
+
+# Заменяем все виды нестандартных пробелов на обычный пробел
+SPACE_CHARS = [
+    '\u00a0',  # Non-breaking space
+    '\u2000',  # En quad
+    '\u2001',  # Em quad
+    '\u2002',  # En space
+    '\u2003',  # Em space
+    '\u2004',  # Three-per-em space
+    '\u2005',  # Four-per-em space
+    '\u2006',  # Six-per-em space
+    '\u2007',  # Figure space
+    '\u2008',  # Punctuation space
+    '\u2009',  # Thin space
+    '\u200a',  # Hair space
+    '\u202f',  # Narrow no-break space
+    '\u205f',  # Medium mathematical space
+    '\u3000',  # Ideographic space
+]
+
+# Удаляем невидимые символы
+INVISIBLE_CHARS = [
+    '\u200b',  # Zero width space
+    '\u200c',  # Zero width non-joiner
+    '\u200d',  # Zero width joiner
+    '\u2060',  # Word joiner
+    '\ufeff',  # Byte order mark
+    '\u00ad',  # Soft hyphen
+    '\u034f',  # Combining grapheme joiner
+    '\u061c',  # Arabic letter mark
+    '\u115f',  # Hangul choseong filler
+    '\u1160',  # Hangul jungseong filler
+    '\u17b4',  # Khmer vowel inherent AQ
+    '\u17b5',  # Khmer vowel inherent AA
+    '\u180e',  # Mongolian vowel separator
+    '\u2028',  # Line separator
+    '\u2029',  # Paragraph separator
+    '\u202a',  # Left-to-right embedding
+    '\u202b',  # Right-to-left embedding
+    '\u202c',  # Pop directional formatting
+    '\u202d',  # Left-to-right override
+    '\u202e',  # Right-to-left override
+    '\u2061',  # Function application
+    '\u2062',  # Invisible times
+    '\u2063',  # Invisible separator
+    '\u2064',  # Invisible plus
+    '\u206a',  # Inhibit symmetric swapping
+    '\u206b',  # Activate symmetric swapping
+    '\u206c',  # Inhibit arabic form shaping
+    '\u206d',  # Activate arabic form shaping
+    '\u206e',  # National digit shapes
+    '\u206f',  # Nominal digit shapes
+    '\uffa0',  # Halfwidth hangul filler
+]
+
+# Удаляем или заменяем другие проблемные символы
+OTHER_PROBLEMATIC = {
+    '\u00a1': '!',     # Inverted exclamation mark
+    '\u00bf': '?',     # Inverted question mark
+    '\u00b0': 'deg',   # Degree symbol
+    '\u00b1': '+/-',   # Plus-minus sign
+    '\u00b2': '2',     # Superscript two
+    '\u00b3': '3',     # Superscript three
+    '\u00b5': 'u',     # Micro sign
+    '\u00b6': 'P',     # Pilcrow sign
+    '\u00b7': '*',     # Middle dot
+    '\u00b8': ',',     # Cedilla
+    '\u00b9': '1',     # Superscript one
+    '\u00ba': 'o',     # Masculine ordinal indicator
+    '\u00bb': '>>',    # Right-pointing double angle quotation mark
+    '\u00bc': '1/4',   # Vulgar fraction one quarter
+    '\u00bd': '1/2',   # Vulgar fraction one half
+    '\u00be': '3/4',   # Vulgar fraction three quarters
+}
+
+# Последовательности символов: заменяются целиком, самая длинная из совпадающих
+# Концы строк Windows и старых Mac приводим к '\n'
+LINE_ENDINGS = {
+    '\r\n': '\n',
+    '\r': '\n',
+}
+
+# Знак ударения (combining acute accent) после гласной кириллицы удаляем; над латиницей он остается
+STRESS_MARKS = {vowel + '\u0301': vowel for vowel in "аеёиоуыэюяАЕЁИОУЫЭЮЯ"}
+
+
+# Стандартные управляющие символы
+STANDARD_CONTROL_CHARS = '\n\t\r'
+
+# Дополнительные символы кириллицы
+ADDITIONAL_CYRILLIC = "ёЁәғқңөұүһІі"
+
+# Стандартные знаки препинания и символы
+STANDARD_PUNCTUATION = ".,;:!?()[]{}\"'«»—–-+=*/#@$%^&|\\`~№"
+
+# Цифры и математические символы
+STANDARD_DIGITS_MATH = "0123456789<>≤≥≠±×÷√∞"
+
+# Известные невидимые символы (остальные определяются по категориям Cf и Mn)
+KNOWN_INVISIBLE_CHARS = {
+    '\u200b',  # Zero width space
+    '\u200c',  # Zero width non-joiner
+    '\u200d',  # Zero width joiner
+    '\u2060',  # Word joiner
+    '\ufeff',  # Byte order mark
+    '\u00ad',  # Soft hyphen
+}
+
+# Символы, похожие на латинские буквы
+CYRILLIC_HOMOGLYPHS = {
+    'а': 'a', 'е': 'e', 'о': 'o', 'р': 'p', 'с': 'c', 'у': 'y', 'х': 'x',
+    'А': 'A', 'В': 'B', 'Е': 'E', 'К': 'K', 'М': 'M', 'Н': 'H', 'О': 'O', 
+    'Р': 'P', 'С': 'C', 'Т': 'T', 'У': 'Y', 'Х': 'X'
+}
+
+# Словарь замен (сокращенная версия)
+BASIC_REPLACEMENTS = {
+    'а': 'a', 'е': 'e', 'о': 'o', 'р': 'p', 'с': 'c', 'у': 'y', 'х': 'x',
+    'А': 'A', 'В': 'B', 'Е': 'E', 'К': 'K', 'М': 'M', 'Н': 'H', 'О': 'O', 
+    'Р': 'P', 'С': 'C', 'Т': 'T', 'У': 'Y', 'Х': 'X',
+    '"': '"', '"': '"', ''': "'", ''': "'",
+    '—': '-', '–': '-', '−': '-',
+    '…': '...', '№': 'No.', '§': 'S',
+    '©': '(c)', '®': '(r)', '™': '(tm)',
+    '°': 'deg', '±': '+/-', '×': 'x', '÷': '/',
+    '½': '1/2', '⅓': '1/3', '¼': '1/4', '¾': '3/4',
+    '→': '->', '←': '<-', '↑': '^', '↓': 'v',
+    '≤': '<=', '≥': '>=', '≠': '!=', '≈': '~=',
+    'α': 'alpha', 'β': 'beta', 'γ': 'gamma', 'π': 'pi',
+    '€': 'EUR', '£': 'GBP', '¥': 'JPY', '¢': 'cent',
+    '★': '*', '☆': '*', '•': '*', '▪': '*', '∙': '*',
+}
+
+# Нестандартные пробелы и невидимые символы для сокращенной версии
+BASIC_SPACE_CHARS = ['\u00a0', '\u2009', '\u202f', '\u2000', '\u2001', '\u2002', '\u2003']
+BASIC_INVISIBLE_CHARS = ['\u200b', '\u200c', '\u200d', '\ufeff', '\u00ad']
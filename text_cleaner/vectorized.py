@@ -0,0 +1,127 @@
+"""Векторная классификация больших текстов на NumPy; без NumPy - те же результаты на чистом Python
+
+Текст переводится в массив кодов UCS-4 (np.frombuffer над UTF-32), коды символов - в коды классов
+через таблицу charclass.CLASS_TABLE одной операцией выборки. Маски категорий, счетчики и границы
+серий получаются операциями над массивом, без цикла Python по символам.
+"""
+
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from . import core
+from .charclass import CATEGORIES, CLASS_CODES, CLASS_NAMES, CLASS_TABLE, STANDARD_CODE, TABLE_SIZE, char_class
+
+HAVE_NUMPY = np is not None
+
+# Тексты короче этого обрабатываются на чистом Python: накладные расходы NumPy не окупаются
+MIN_VECTOR_SIZE = 16 * 1024
+# Размер блока в символах: память на массивы не зависит от длины текста
+VECTOR_BLOCK_SIZE = 1024 * 1024
+
+# Таблица классов BMP как массив NumPy (общая память с CLASS_TABLE)
+CLASS_ARRAY = np.frombuffer(CLASS_TABLE, dtype=np.uint8) if HAVE_NUMPY else None
+
+def use_numpy(text):
+    return HAVE_NUMPY and len(text) >= MIN_VECTOR_SIZE
+
+def iter_blocks(text):
+    """Делим текст на блоки: (начало блока, блок)"""
+    for start in range(0, len(text), VECTOR_BLOCK_SIZE):
+        yield start, text[start:start + VECTOR_BLOCK_SIZE]
+
+def code_points(text):
+    """Коды символов текста как массив uint32 (одиночные суррогаты сохраняются)"""
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+
+def point_classes(points):
+    """Коды классов для массива кодов символов"""
+    classes = CLASS_ARRAY.take(points, mode='clip')
+    astral = np.flatnonzero(points >= TABLE_SIZE)
+    if astral.size:
+        # Символы за пределами BMP редки: их классы определяются по одному на каждый различный символ
+        values, inverse = np.unique(points[astral], return_inverse=True)
+        lookup = np.array([char_class(chr(value)) for value in values.tolist()], dtype=np.uint8)
+        classes[astral] = lookup[inverse]
+    return classes
+
+def class_codes(text):
+    """Коды классов символов текста (0 - стандартный символ): массив uint8"""
+    return point_classes(code_points(text))
+
+def line_counts(text):
+    """Число нестандартных символов каждой категории в каждой строке текста: {категория: [по строкам]}"""
+    lines = text.count('\n') + 1
+    if not use_numpy(text):
+        counts = {category: [0] * lines for category in CATEGORIES}
+        # Перевод строки - стандартный символ, поэтому серия всегда лежит в одной строке
+        line, pos = 0, 0
+        for category, start, end in core.find_runs(text):
+            line += text.count('\n', pos, start)
+            pos = start
+            counts[category][line] += end - start
+        return counts
+    totals = {category: np.zeros(lines, dtype=np.int64) for category in CATEGORIES}
+    line = 0
+    for _, block in iter_blocks(text):
+        points = code_points(block)
+        classes = point_classes(points)
+        # Номер строки символа в блоке - число переводов строки перед ним
+        newlines = points == 0x0A
+        char_lines = np.cumsum(newlines) - newlines
+        for category in CATEGORIES:
+            part = np.bincount(char_lines[classes == CLASS_CODES[category]])
+            totals[category][line:line + len(part)] += part
+        line += int(np.count_nonzero(newlines))
+    return {category: totals[category].tolist() for category in CATEGORIES}
+
+def count_nonstandard(text):
+    """Число нестандартных символов, как core.count_nonstandard"""
+    if not use_numpy(text):
+        return core.count_nonstandard(text)
+    return sum(int(np.count_nonzero(class_codes(block))) for _, block in iter_blocks(text))
+
+def block_runs(block, offset):
+    """Серии одного класса в блоке: (коды классов, начала, концы) с учетом смещения блока"""
+    codes = class_codes(block)
+    # Граница серии - место, где меняется класс символа
+    change = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+    starts = np.concatenate(([0], change))
+    ends = np.concatenate((change, [len(codes)]))
+    nonstandard = codes[starts] != STANDARD_CODE
+    starts, ends = starts[nonstandard], ends[nonstandard]
+    return codes[starts].tolist(), (starts + offset).tolist(), (ends + offset).tolist()
+
+def find_runs(text):
+    """Серии нестандартных символов одной категории: [(категория, начало, конец)], как core.find_runs"""
+    if not use_numpy(text):
+        return list(core.find_runs(text))
+    runs = []
+    for offset, block in iter_blocks(text):
+        classes, starts, ends = block_runs(block, offset)
+        if runs and classes and runs[-1][2] == starts[0] and runs[-1][0] == CLASS_NAMES[classes[0]]:
+            # Серия продолжается через границу блоков
+            runs[-1] = (runs[-1][0], runs[-1][1], ends[0])
+            classes, starts, ends = classes[1:], starts[1:], ends[1:]
+        runs.extend(zip([CLASS_NAMES[code] for code in classes], starts, ends))
+    return runs
+
+def analyze(text):
+    """Отчет по категориям и символам, как core.analyze"""
+    if not use_numpy(text):
+        return core.analyze(text)
+    found = Counter()
+    for _, block in iter_blocks(text):
+        points = code_points(block)
+        values, counts = np.unique(points[point_classes(points) != STANDARD_CODE], return_counts=True)
+        found.update(dict(zip(values.tolist(), counts.tolist())))
+    report = core.empty_report()
+    report["total"] = len(text)
+    report["nonstandard"] = sum(found.values())
+    for value, count in found.items():
+        char = chr(value)
+        report[CLASS_NAMES[char_class(char)]][char] = count
+    return report